@@ -1,19 +1,232 @@
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from resume_analyzer import ResumeAnalyzer
+from streaming import read_resume_stream, stream_format, to_ndjson, TopScores
+from job_queue import FINISHED_JOB_TTL, MAX_FINISHED_JOBS, JobManager
+from candidate_index import CandidateIndex
+from candidate_pool import CandidatePool
+from metrics import METRICS, REQUEST_BYTES, REQUEST_CANDIDATES
+from serialization import gzip_chunks, iter_json
+import itertools
 import json
+import os
+import shutil
+import tempfile
+import threading
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize the analyzer
-analyzer = ResumeAnalyzer()
+# The analyzer loads the spaCy model on the first request that needs it, so the
+# server starts answering /health immediately (set RESUME_FEATURE_STORE to cache
+# candidate features on disk, RESUME_LEAN_MODEL=1 to skip the parser and NER,
+# RESUME_SKILL_VOCABULARY to a saved skill vocabulary, which also turns on the
+# cache of recent results unless RESUME_RESULT_CACHE_SIZE=0)
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def get_analyzer():
+    """Return the shared analyzer, creating it on first use"""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = ResumeAnalyzer(
+                    feature_store_path=os.environ.get('RESUME_FEATURE_STORE'),
+                    lean=os.environ.get('RESUME_LEAN_MODEL') == '1',
+                    skill_vocabulary_path=os.environ.get('RESUME_SKILL_VOCABULARY'),
+                    skill_aliases_path=os.environ.get('RESUME_SKILL_ALIASES'),
+                    skill_overlap_weight=float(os.environ.get('RESUME_SKILL_OVERLAP_WEIGHT', '0')),
+                    profile_vectors_path=os.environ.get('RESUME_PROFILE_VECTORS'),
+                    result_cache_size=int(os.environ.get('RESUME_RESULT_CACHE_SIZE', '10000')),
+                    result_cache_ttl=float(os.environ.get('RESUME_RESULT_CACHE_TTL', '3600'))
+                )
+    return _analyzer
+
+# Two-stage search over a prebuilt candidate index (set RESUME_CANDIDATE_INDEX
+# to a directory written by `python candidate_index.py DIR build`)
+_index = None
+
+def get_index():
+    """Return the candidate index, opening it on first use, or None if none is configured"""
+    global _index
+    path = os.environ.get('RESUME_CANDIDATE_INDEX')
+    if _index is None and path:
+        with _analyzer_lock:
+            if _index is None:
+                _index = CandidateIndex(path)
+    return _index
+
+# Server-side candidate pool with standing requisitions (set RESUME_POOL_DB to a
+# SQLite file to enable the /pool and /requisitions endpoints)
+_pool = None
+
+def get_pool():
+    """Return the candidate pool, opening it on first use, or None if none is configured"""
+    global _pool
+    path = os.environ.get('RESUME_POOL_DB')
+    if _pool is None and path:
+        analyzer = get_analyzer()
+        with _analyzer_lock:
+            if _pool is None:
+                _pool = CandidatePool(analyzer, path)
+    return _pool
+
+POOL_NOT_CONFIGURED = "No candidate pool configured (set RESUME_POOL_DB)"
+
+# Background analysis jobs (set RESUME_JOB_DB to keep jobs across restarts and share
+# them between server processes; finished jobs are dropped after RESUME_JOB_TTL
+# seconds and at most RESUME_MAX_FINISHED_JOBS stay in memory). The manager and its
+# threads start on first use, so a master process that preloads the analyzer before
+# forking workers (serve.py) does not start threads the fork would lose
+_jobs = None
+_jobs_lock = threading.Lock()
+
+def get_jobs():
+    """Return the job manager, starting its worker threads on first use"""
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                _jobs = JobManager(
+                    get_analyzer,
+                    workers=int(os.environ.get('RESUME_JOB_WORKERS', 2)),
+                    db_path=os.environ.get('RESUME_JOB_DB'),
+                    finished_ttl=float(os.environ.get('RESUME_JOB_TTL', FINISHED_JOB_TTL)),
+                    max_finished=int(os.environ.get('RESUME_MAX_FINISHED_JOBS', MAX_FINISHED_JOBS))
+                )
+    return _jobs
+
+def after_fork():
+    """Reset per-process state in a worker forked from a master that preloaded the analyzer"""
+    global _analyzer_lock, _jobs_lock, _index, _pool, _jobs
+    _analyzer_lock = threading.Lock()
+    _jobs_lock = threading.Lock()
+    # SQLite connections and threads do not survive a fork; these reopen on first use
+    _index = _pool = _jobs = None
+    if _analyzer is not None:
+        _analyzer.after_fork()
+    # Workers publish their metrics to a directory serve.py shares, so /metrics on any worker sums them all
+    metrics_directory = os.environ.get('RESUME_METRICS_DIR')
+    if metrics_directory:
+        METRICS.share(metrics_directory)
+    # With a shared job table every worker takes jobs from it, whichever one accepted them
+    if os.environ.get('RESUME_JOB_DB'):
+        get_jobs()
+
+def validate_analysis_request(data):
+    """Check an analysis payload, returning (options, error message)"""
+    if not data:
+        return None, "No data provided"
+    
+    # Validate data structure
+    if 'resumes' not in data or not isinstance(data['resumes'], list):
+        return None, "Invalid data structure. Expected 'resumes' array."
+    
+    if len(data['resumes']) == 0:
+        return None, "No resumes provided for analysis"
+    
+    if 'job_description' not in data or not data['job_description']:
+        return None, "Job description is required"
+    
+    return parse_analysis_options(data, ('batch_size', 'workers', 'top_k', 'deadline_ms'))
+
+def validate_matrix_request(data):
+    """Check a matrix analysis payload, returning (options, error message)"""
+    if not data:
+        return None, "No data provided"
+    
+    if 'resumes' not in data or not isinstance(data['resumes'], list):
+        return None, "Invalid data structure. Expected 'resumes' array."
+    
+    if len(data['resumes']) == 0:
+        return None, "No resumes provided for analysis"
+    
+    job_descriptions = data.get('job_descriptions')
+    if not isinstance(job_descriptions, list) or len(job_descriptions) == 0:
+        return None, "Expected a non-empty 'job_descriptions' array"
+    
+    options, error = parse_analysis_options(data, ('batch_size', 'workers', 'top_k', 'best_fit'))
+    if error:
+        return None, error
+    # Shortlists always have a size; leave the default when none was asked for
+    if options['top_k'] is None:
+        del options['top_k']
+    if 'fields' not in data:
+        del options['fields']
+    return options, None
+
+def observe_request(endpoint, candidates=None):
+    """Record the body size and, when known, the candidate count of a request"""
+    if request.content_length:
+        REQUEST_BYTES.observe(request.content_length, endpoint=endpoint)
+    if candidates is not None:
+        REQUEST_CANDIDATES.observe(candidates, endpoint=endpoint)
+
+# Result responses are gzip-compressed for clients that accept it unless RESUME_GZIP_RESPONSES=0
+GZIP_RESPONSES = os.environ.get('RESUME_GZIP_RESPONSES', '1') != '0'
+
+def results_response(payload, results):
+    """Stream payload plus its results, encoded record by record (orjson when installed)"""
+    chunks = iter_json(payload, 'results', results)
+    response = Response(chunks, mimetype='application/json')
+    if GZIP_RESPONSES and 'gzip' in request.accept_encodings:
+        response.response = gzip_chunks(chunks)
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Most pool processes one request may ask for; each loads its own spaCy model
+# (RESUME_MAX_WORKERS, default the number of CPUs)
+MAX_WORKERS = int(os.environ.get('RESUME_MAX_WORKERS', os.cpu_count() or 1))
+
+def is_positive_integer(value):
+    """True for a JSON integer above zero; JSON true would otherwise pass as 1"""
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+def parse_analysis_options(data, names):
+    """Read the optional positive integer settings and the fields selector"""
+    options = {}
+    for name in names:
+        value = data.get(name)
+        if value is not None and not is_positive_integer(value):
+            return None, f"{name} must be a positive integer"
+        options[name] = value
+    
+    if (options.get('workers') or 0) > MAX_WORKERS:
+        return None, f"workers must be at most {MAX_WORKERS}"
+    
+    fields = data.get('fields')
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)):
+        return None, "fields must be a list of candidate attribute names"
+    options['fields'] = fields
+    
+    return options, None
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "message": "Resume Shortlisting API by Richa Kumari"})
+    analyzer = _analyzer
+    return jsonify({
+        "status": "healthy",
+        "message": "Resume Shortlisting API by Richa Kumari",
+        "model_loaded": analyzer is not None,
+        "job_cache": analyzer.job_cache.stats() if analyzer else None,
+        "feature_store": analyzer.feature_store.stats() if analyzer and analyzer.feature_store else None,
+        "result_cache": analyzer.result_cache.stats() if analyzer and analyzer.result_cache else None
+    })
+
+@app.after_request
+def publish_metrics(response):
+    """Publish this worker's metrics once the response, streamed or not, is finished"""
+    response.call_on_close(METRICS.publish)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage latencies, scoring throughput, fallbacks and request sizes in the Prometheus text format"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/analyze', methods=['POST'])
 def analyze_resumes():
@@ -22,32 +235,83 @@ def analyze_resumes():
         # Get JSON data from request
         data = request.get_json()
         
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+        options, error = validate_analysis_request(data)
+        if error:
+            return jsonify({"error": error}), 400
+        observe_request('analyze', len(data['resumes']))
         
-        # Validate data structure
-        if 'resumes' not in data or not isinstance(data['resumes'], list):
-            return jsonify({"error": "Invalid data structure. Expected 'resumes' array."}), 400
+        # Analyze candidates
+        results = get_analyzer().analyze_candidates(data, compact=True, **options)
         
-        if len(data['resumes']) == 0:
-            return jsonify({"error": "No resumes provided for analysis"}), 400
+        payload = {
+            "success": True,
+            "candidates_analyzed": len(data['resumes'])
+        }
+        if options.get('deadline_ms'):
+            # Candidates ranked without profile fit and reasoning because the budget ran out
+            payload["partial_candidates"] = results.partial_count()
+        return results_response(payload, results)
         
-        if 'job_description' not in data or not data['job_description']:
-            return jsonify({"error": "Job description is required"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
+
+@app.route('/analyze-matrix', methods=['POST'])
+def analyze_matrix():
+    """Score every resume against every job description in one pass"""
+    try:
+        data = request.get_json()
         
-        # Analyze candidates
-        results = analyzer.analyze_candidates(data)
+        options, error = validate_matrix_request(data)
+        if error:
+            return jsonify({"error": error}), 400
+        observe_request('analyze-matrix', len(data['resumes']))
+        
+        matrix = get_analyzer().analyze_matrix(data, **options)
         
         return jsonify({
             "success": True,
             "candidates_analyzed": len(data['resumes']),
-            "results": results
+            "job_descriptions_analyzed": len(data['job_descriptions']),
+            **matrix
         })
+    
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Matrix analysis failed: {str(e)}"}), 500
+
+@app.route('/search', methods=['POST'])
+def search_index():
+    """Shortlist from the candidate index: cheap retrieval, then full scoring of the best few"""
+    try:
+        data = request.get_json(silent=True)
+        if not data or not data.get('job_description'):
+            return jsonify({"error": "Job description is required"}), 400
         
+        options, error = parse_analysis_options(data, ('top_k', 'depth'))
+        if error:
+            return jsonify({"error": error}), 400
+        options = {name: value for name, value in options.items() if value is not None}
+        
+        index = get_index()
+        if index is None:
+            return jsonify({"error": "No candidate index configured (set RESUME_CANDIDATE_INDEX)"}), 404
+        
+        results = index.search(get_analyzer(), data['job_description'], dense=data.get('dense', True) is not False,
+                               **options)
+        
+        return jsonify({
+            "success": True,
+            "candidates_indexed": index.size,
+            "results": results
+        })
+    
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
+        return jsonify({"error": f"Search failed: {str(e)}"}), 500
 
 @app.route('/analyze-file', methods=['POST'])
 def analyze_from_file():
@@ -76,24 +340,286 @@ def analyze_from_file():
         
         if 'job_description' not in data:
             return jsonify({"error": "Job description is required"}), 400
+        observe_request('analyze-file', len(data['resumes']))
         
-        results = analyzer.analyze_candidates(data)
+        results = get_analyzer().analyze_candidates(data, compact=True)
         
-        return jsonify({
+        return results_response({
             "success": True,
-            "candidates_analyzed": len(data['resumes']),
-            "results": results
-        })
+            "candidates_analyzed": len(data['resumes'])
+        }, results)
         
     except Exception as e:
         return jsonify({"error": f"File analysis failed: {str(e)}"}), 500
 
+@app.route('/analyze-stream', methods=['POST'])
+def analyze_stream():
+    """Analyze an uploaded JSON/NDJSON file, streaming NDJSON results as they are scored"""
+    if 'file' not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return jsonify({"error": "No file selected"}), 400
+    
+    if not file.filename.endswith(('.json', '.ndjson', '.jsonl')):
+        return jsonify({"error": "File must be a JSON or NDJSON file"}), 400
+    
+    try:
+        batch_size = int(request.form.get('batch_size', 256))
+        top_k = int(request.form.get('top_k', 10))
+    except ValueError:
+        return jsonify({"error": "batch_size and top_k must be integers"}), 400
+    
+    if batch_size < 1:
+        return jsonify({"error": "batch_size must be a positive integer"}), 400
+    
+    if top_k < 1:
+        return jsonify({"error": "top_k must be a positive integer"}), 400
+    
+    # Flask closes the uploaded file when the view returns, before the response body
+    # reads past the first chunk, so the stream is read from a copy it owns. It is a
+    # real file: before Python 3.11 a SpooledTemporaryFile cannot be wrapped for text
+    upload = tempfile.TemporaryFile()
+    shutil.copyfileobj(file.stream, upload)
+    upload.seek(0)
+    
+    try:
+        job_description, resumes = read_resume_stream(upload, stream_format(file.filename))
+        job_description = request.form.get('job_description') or job_description
+        first = next(resumes, None)
+    except (ValueError, json.JSONDecodeError, OSError, AttributeError) as e:
+        upload.close()
+        return jsonify({"error": f"Invalid file: {str(e)}"}), 400
+    
+    if not job_description:
+        upload.close()
+        return jsonify({"error": "Job description is required"}), 400
+    
+    if first is None:
+        upload.close()
+        return jsonify({"error": "No resumes provided for analysis"}), 400
+    # The candidate count of a stream is only known once it has been read
+    observe_request('analyze-stream')
+    
+    def generate():
+        top = TopScores(top_k)
+        try:
+            for result in get_analyzer().analyze_stream(itertools.chain([first], resumes), job_description, batch_size):
+                top.push(result['score'], {
+                    'candidateId': result['candidateId'],
+                    'name': result['name'],
+                    'score': result['score']
+                })
+                yield to_ndjson(result)
+        except Exception as e:
+            yield to_ndjson({"error": f"Analysis failed: {str(e)}"})
+            return
+        finally:
+            upload.close()
+        
+        REQUEST_CANDIDATES.observe(top.count, endpoint='analyze-stream')
+        
+        # Final line: ranking over the scores only
+        yield to_ndjson({"summary": {"candidates_analyzed": top.count, "top": top.items()}})
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    # Also closes the copy when the client goes away before the body is read
+    response.call_on_close(upload.close)
+    return response
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue an analysis and return its job id immediately"""
+    data = request.get_json(silent=True)
+    
+    options, error = validate_analysis_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+    observe_request('jobs', len(data['resumes']))
+    
+    payload = {'resumes': data['resumes'], 'job_description': data['job_description']}
+    return jsonify(get_jobs().submit(payload, options)), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status and progress of a job"""
+    status = get_jobs().status(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """One page of a finished job's ranked results"""
+    try:
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('page_size', 50))
+    except ValueError:
+        return jsonify({"error": "page and page_size must be integers"}), 400
+    
+    if page < 1 or page_size < 1:
+        return jsonify({"error": "page and page_size must be positive"}), 400
+    
+    results = get_jobs().results(job_id, page, page_size)
+    if results is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(results)
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    status = get_jobs().cancel(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
+
+@app.route('/pool/candidates', methods=['POST'])
+def add_pool_candidates():
+    """Add or update candidates in the pool and re-rank them for every standing requisition"""
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('resumes'), list) or len(data['resumes']) == 0:
+        return jsonify({"error": "Invalid data structure. Expected a non-empty 'resumes' array."}), 400
+    
+    options, error = parse_analysis_options(data, ('batch_size', 'workers'))
+    if error:
+        return jsonify({"error": error}), 400
+    del options['fields']
+    observe_request('pool', len(data['resumes']))
+    
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    
+    try:
+        return jsonify(pool.add(data['resumes'], **options))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Pool update failed: {str(e)}"}), 500
+
+@app.route('/pool/candidates/<candidate_id>', methods=['PUT'])
+def update_pool_candidate(candidate_id):
+    """Replace one candidate's resume and splice its new scores into every ranking"""
+    candidate = request.get_json(silent=True)
+    if not isinstance(candidate, dict):
+        return jsonify({"error": "Expected a candidate object"}), 400
+    
+    if str(candidate.setdefault('candidateId', candidate_id)) != candidate_id:
+        return jsonify({"error": "candidateId does not match the URL"}), 400
+    
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    
+    try:
+        return jsonify(pool.add([candidate]))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Pool update failed: {str(e)}"}), 500
+
+@app.route('/pool/candidates/<candidate_id>', methods=['DELETE'])
+def delete_pool_candidate(candidate_id):
+    """Remove a candidate from the pool and every ranking"""
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    if not pool.remove(candidate_id):
+        return jsonify({"error": "Candidate not found"}), 404
+    return jsonify({"deleted": candidate_id})
+
+@app.route('/requisitions', methods=['POST'])
+def add_requisition():
+    """Save a standing job description and rank the pool against it"""
+    data = request.get_json(silent=True)
+    if not data or not data.get('job_description'):
+        return jsonify({"error": "Job description is required"}), 400
+    
+    top_k = data.get('top_k', 10)
+    if not is_positive_integer(top_k):
+        return jsonify({"error": "top_k must be a positive integer"}), 400
+    
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    
+    try:
+        return jsonify(pool.add_requisition(data['job_description'], data.get('id'), top_k)), 201
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Ranking failed: {str(e)}"}), 500
+
+@app.route('/requisitions', methods=['GET'])
+def list_requisitions():
+    """Every standing requisition"""
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    return jsonify({"requisitions": pool.requisitions()})
+
+@app.route('/requisitions/<requisition_id>/shortlist', methods=['GET'])
+def requisition_shortlist(requisition_id):
+    """The current ranked shortlist of a standing requisition"""
+    try:
+        top_k = int(request.args['top_k']) if 'top_k' in request.args else None
+    except ValueError:
+        return jsonify({"error": "top_k must be an integer"}), 400
+    
+    if top_k is not None and top_k < 1:
+        return jsonify({"error": "top_k must be a positive integer"}), 400
+    
+    fields = request.args.get('fields')
+    fields = [field for field in fields.split(',') if field] if fields is not None else None
+    
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    
+    try:
+        results = pool.shortlist(requisition_id, top_k, fields)
+    except ValueError as e:
+        # Ranked with a vocabulary the pool no longer uses
+        return jsonify({"error": str(e)}), 409
+    if results is None:
+        return jsonify({"error": "Requisition not found"}), 404
+    return jsonify({"requisition_id": requisition_id, "results": results})
+
+@app.route('/requisitions/<requisition_id>', methods=['DELETE'])
+def delete_requisition(requisition_id):
+    """Drop a standing requisition and its ranking"""
+    pool = get_pool()
+    if pool is None:
+        return jsonify({"error": POOL_NOT_CONFIGURED}), 404
+    if not pool.remove_requisition(requisition_id):
+        return jsonify({"error": "Requisition not found"}), 404
+    return jsonify({"deleted": requisition_id})
+
 if __name__ == '__main__':
     print("🚀 Resume Shortlisting API by Richa Kumari")
-    print("📡 Starting server on http://localhost:5000")
+    print(f"📡 Starting server on http://localhost:{os.environ.get('PORT', 5000)}")
     print("📋 Endpoints:")
     print("   GET  /health - Health check")
+    print("   GET  /metrics - Prometheus metrics")
     print("   POST /analyze - Analyze resumes from JSON data")
+    print("   POST /analyze-matrix - Score resumes against several job descriptions")
+    print("   POST /search - Two-stage search over the candidate index")
     print("   POST /analyze-file - Analyze resumes from uploaded file")
+    print("   POST /analyze-stream - Stream NDJSON results for a large uploaded file")
+    print("   POST /jobs - Queue an analysis job")
+    print("   GET  /jobs/<id> - Job status and progress")
+    print("   GET  /jobs/<id>/results - Paged job results")
+    print("   POST /jobs/<id>/cancel - Cancel a job")
+    print("   POST /pool/candidates - Add or update pool candidates")
+    print("   PUT  /pool/candidates/<id> - Update one pool candidate")
+    print("   DELETE /pool/candidates/<id> - Remove a pool candidate")
+    print("   POST /requisitions - Save a standing requisition")
+    print("   GET  /requisitions - List standing requisitions")
+    print("   GET  /requisitions/<id>/shortlist - Current shortlist of a requisition")
+    print("   DELETE /requisitions/<id> - Remove a standing requisition")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Queued jobs and those whose process died are picked up right away; serve.py runs the production server
+    get_jobs()
+    app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Compare per-candidate and columnar experience scoring
+Scores synthetic experience values three ways: the original per-candidate
+path (an uncompiled regex per field and the job description regex per
+candidate), the scalar parse_years helper, and the columnar experience_frame.
+All of them score with the analyzer's own experience_points. Checks the
+scalar and columnar scores agree and reports the speedups.
+"""
+
+import argparse
+import random
+import re
+import time
+
+import numpy as np
+
+from experience import experience_frame, experience_points, experience_points_array, parse_years, parse_years_column
+from job_profile import extract_required_experience
+
+VALUE_FORMATS = [
+    "{y} years", "{y} yrs", "{y}.5 years", "{y} year", "{y} years {m} months", "{y} yrs and {m} mos",
+    "{y}-{z} yrs", "{y} to {z} years", "{m} months", "{y}+ years of experience", "Fresher", "", None
+]
+
+
+def original_years(experience_text: str) -> float:
+    """extract_years_experience as it was before the columnar path"""
+    if not experience_text:
+        return 0
+    match = re.search(r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)', experience_text.lower())
+    return float(match.group(1)) if match else 0
+
+
+def best_time(function, repeat: int) -> float:
+    """Fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def synthetic_value(rng: random.Random):
+    """A free-text experience value in one of the formats seen in exports"""
+    value_format = rng.choice(VALUE_FORMATS)
+    if value_format is None:
+        return None
+    y = rng.randint(0, 15)
+    return value_format.format(y=y, z=y + rng.randint(1, 5), m=rng.randint(1, 11))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-candidate vs columnar experience scoring")
+    parser.add_argument('--rows', type=int, default=100000, help="candidates to score")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    candidates = [
+        {'candidateId': i, 'totalExperience': synthetic_value(rng), 'relevantExperience': synthetic_value(rng)}
+        for i in range(args.rows)
+    ]
+    job_description = "Senior developer with 4+ years of experience"
+    required = extract_required_experience(job_description)
+
+    def original():
+        return [
+            experience_points(original_years(candidate.get('totalExperience', '')),
+                              original_years(candidate.get('relevantExperience', '')),
+                              extract_required_experience(job_description))
+            for candidate in candidates
+        ]
+
+    def scalar():
+        return [
+            experience_points(parse_years(candidate.get('totalExperience', '')),
+                              parse_years(candidate.get('relevantExperience', '')), required)
+            for candidate in candidates
+        ]
+
+    def columnar():
+        return experience_frame(candidates, required)['experience_score'].to_numpy()
+
+    # The same work once the experience columns are loaded, e.g. from a columnar export
+    total_column = [candidate.get('totalExperience', '') for candidate in candidates]
+    relevant_column = [candidate.get('relevantExperience', '') for candidate in candidates]
+
+    def columns_loaded():
+        return experience_points_array(parse_years_column(total_column), parse_years_column(relevant_column), required)
+
+    # pandas is imported on first use; keep that one-off cost out of the timing
+    experience_frame(candidates[:10], required)
+
+    mismatches = int(np.sum(np.asarray(scalar(), dtype=np.float64) != columnar()))
+    timings = {
+        'Original per-candidate': best_time(original, args.repeat),
+        'Scalar parse_years': best_time(scalar, args.repeat),
+        'Columnar': best_time(columnar, args.repeat),
+        'Columnar, columns loaded': best_time(columns_loaded, args.repeat)
+    }
+    for name, elapsed in timings.items():
+        print(f"{name:<26} {elapsed:.3f}s ({args.rows / elapsed:>12,.0f} rows/sec, "
+              f"{timings['Original per-candidate'] / elapsed:.1f}x)")
+    print(f"Scalar vs columnar mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-candidate update latency in a large candidate pool
+The pool is seeded with synthetic features (no NLP) so 100k candidates take
+seconds; timed updates then go through the full path: NLP for the one
+resume, scoring against every standing requisition and splicing into the
+rankings.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from candidate_features import CandidateFeatures
+from candidate_pool import CandidatePool
+from resume_analyzer import ResumeAnalyzer
+
+SKILLS = ["React", "JavaScript", "TypeScript", "Node.js", "Python", "Django", "AWS", "Docker",
+          "Kubernetes", "SQL", "PostgreSQL", "Java", "Spring", "Flutter", "Go", "GraphQL"]
+ROLES = ["Full Stack Developer", "Backend Engineer", "Frontend Developer", "DevOps Engineer", "Mobile Developer"]
+
+
+def synthetic_candidate(i: int, rng: random.Random):
+    """A plausible resume record"""
+    role = rng.choice(ROLES)
+    return {
+        'candidateId': i,
+        'firstName': f"Candidate{i}",
+        'lastName': "Synthetic",
+        'skills': ", ".join(rng.sample(SKILLS, rng.randint(3, 7))),
+        'profile': f"{role} with experience building production systems",
+        'currentDesignation': role,
+        'interestedRole': rng.choice(ROLES),
+        'totalExperience': f"{rng.randint(0, 15)} years",
+        'relevantExperience': f"{rng.randint(0, 10)} years"
+    }
+
+
+def percentile(values, q):
+    """Percentile of durations in milliseconds"""
+    return float(np.percentile(values, q)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark candidate pool update latency")
+    parser.add_argument('--size', type=int, default=100000, help="candidates in the pool")
+    parser.add_argument('--requisitions', type=int, default=30, help="standing requisitions")
+    parser.add_argument('--updates', type=int, default=200, help="timed single-candidate updates")
+    parser.add_argument('--db', default=None, help="pool database (default: a temporary file)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vectors = np.random.default_rng(42)
+    path = args.db or os.path.join(tempfile.mkdtemp(), 'pool.db')
+    analyzer = ResumeAnalyzer()
+    pool = CandidatePool(analyzer, path)
+
+    # Features of a few real resumes give the skill vocabulary and vector width
+    templates = [synthetic_candidate(i, rng) for i in range(200)]
+    template_features, _ = analyzer.extract_candidate_features(templates, batch_size=200)
+    dimensions = len(template_features[0].profile_vector)
+
+    started = time.perf_counter()
+    for offset in range(0, args.size, 10000):
+        candidates = []
+        features = []
+        for i in range(offset, min(offset + 10000, args.size)):
+            template = template_features[i % len(template_features)]
+            candidates.append(synthetic_candidate(i, rng))
+            features.append(CandidateFeatures(
+                template.skill_lemmas,
+                vectors.uniform(-1, 1, dimensions).astype(np.float32),
+                float(rng.randint(0, 15)),
+                float(rng.randint(0, 10))
+            ))
+        pool.add_features(candidates, features)
+    print(f"Seeded {args.size} candidates in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    for j in range(args.requisitions):
+        skills = ", ".join(rng.sample(SKILLS, 4))
+        pool.add_requisition(f"{rng.choice(ROLES)} with {skills}. {rng.randint(1, 8)}+ years of experience.",
+                             f"req-{j}")
+    elapsed = time.perf_counter() - started
+    print(f"Ranked the pool for {args.requisitions} requisitions in {elapsed:.1f}s "
+          f"({elapsed / args.requisitions:.2f}s each)")
+
+    update_times = []
+    rescore_times = []
+    for _ in range(args.updates):
+        candidate = synthetic_candidate(rng.randrange(args.size), rng)
+
+        started = time.perf_counter()
+        pool.add([candidate])
+        update_times.append(time.perf_counter() - started)
+
+        # Same update without the NLP: storage and rescoring only
+        features, _ = analyzer.extract_candidate_features([candidate])
+        started = time.perf_counter()
+        pool.add_features([candidate], features)
+        rescore_times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    pool.shortlist('req-0')
+    shortlist_time = time.perf_counter() - started
+
+    print(f"Update latency with NLP (ms): p50 {percentile(update_times, 50):.1f}, "
+          f"p95 {percentile(update_times, 95):.1f}, max {max(update_times) * 1000:.1f}")
+    print(f"Rescore and splice only (ms): p50 {percentile(rescore_times, 50):.1f}, "
+          f"p95 {percentile(rescore_times, 95):.1f}, max {max(rescore_times) * 1000:.1f}")
+    print(f"Shortlist read: {shortlist_time * 1000:.1f}ms; database {pool.stats()['bytes_on_disk'] / 1e6:.1f} MB")
+
+    pool.close()
+    analyzer.close()
+
+
+if __name__ == "__main__":
+    main()
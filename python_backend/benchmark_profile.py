@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compare the profile similarity backends on latency and memory
+Each backend runs in a fresh interpreter: load the analyzer, compute the
+profile vectors of a synthetic batch and score it against a job description,
+then score a sample one candidate at a time. Without --vectors a random
+static table of --words words is generated, which measures the mechanics
+(memory-mapped gather and averaging) rather than the quality of the scores.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from profile_vectors import TOKEN_PATTERN, write_table
+
+JOB_DESCRIPTION = "Senior Full Stack Developer with React, Node.js and AWS. 4+ years of experience in JavaScript."
+ROLES = ["Full Stack Developer", "Backend Engineer", "Frontend Developer", "DevOps Engineer", "Mobile Developer",
+         "Data Scientist", "QA Engineer"]
+PHRASES = ["building production systems", "shipping web applications", "designing REST APIs", "leading a small team",
+           "migrating services to the cloud", "writing automated tests", "mobile apps in Flutter",
+           "data pipelines in Python"]
+
+# Runs inside the fresh interpreter and prints one JSON line
+_PROBE = """
+import json, resource, sys, time
+from candidate_features import CandidateFeatures
+from benchmark_profile import synthetic_profiles, JOB_DESCRIPTION
+started = time.perf_counter()
+from resume_analyzer import ResumeAnalyzer
+analyzer = ResumeAnalyzer(lean={lean}, profile_vectors_path={vectors!r})
+job = analyzer.compile_job_description(JOB_DESCRIPTION)
+load_seconds = time.perf_counter() - started
+
+texts = synthetic_profiles({profiles})
+started = time.perf_counter()
+vectors = analyzer.profile_backend.vectors(texts, {batch_size})
+scores = analyzer.profile_score_matrix([CandidateFeatures('', vector, 0, 0) for vector in vectors], [job])
+batch_seconds = time.perf_counter() - started
+
+sample = [{{'profile': text}} for text in texts[:{sample}]]
+started = time.perf_counter()
+for candidate in sample:
+    analyzer.profile_score(candidate, job)
+single_seconds = time.perf_counter() - started
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'load_seconds': load_seconds,
+    'batch_seconds': batch_seconds,
+    'per_candidate_ms': single_seconds / max(len(sample), 1) * 1000,
+    'peak_rss_mb': rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+}}))
+"""
+
+
+def synthetic_profiles(count: int, seed: int = 11):
+    """Profile texts shaped like profile + current designation + interested role"""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(ROLES)} {rng.choice(PHRASES)} and {rng.choice(PHRASES)} {rng.choice(ROLES)} {rng.choice(ROLES)}"
+        for _ in range(count)
+    ]
+
+
+def synthetic_table(path: str, words: int, dimensions: int) -> None:
+    """A random table covering the benchmark's vocabulary, padded with filler words"""
+    vocabulary = sorted(set(TOKEN_PATTERN.findall(" ".join(ROLES + PHRASES + [JOB_DESCRIPTION]).lower())))
+    vocabulary += [f"word{i}" for i in range(max(words - len(vocabulary), 0))]
+    table = np.random.default_rng(0).normal(size=(len(vocabulary), dimensions)).astype(np.float32)
+    write_table(table, vocabulary, path, 'synthetic')
+
+
+def run_probe(lean: bool, vectors, profiles: int, batch_size: int, sample: int):
+    """Run one backend in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(lean=lean, vectors=vectors, profiles=profiles,
+                                             batch_size=batch_size, sample=sample)],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the spaCy and static word-vector profile backends")
+    parser.add_argument('--vectors', default=None, help="static table directory (default: a synthetic one)")
+    parser.add_argument('--words', type=int, default=100000, help="words in the synthetic table")
+    parser.add_argument('--dimensions', type=int, default=300, help="dimensions of the synthetic table")
+    parser.add_argument('--profiles', type=int, default=10000, help="profiles scored as one batch")
+    parser.add_argument('--batch-size', type=int, default=256, help="nlp.pipe batch size of the spaCy backend")
+    parser.add_argument('--sample', type=int, default=200, help="profiles scored one at a time")
+    args = parser.parse_args()
+
+    vectors = args.vectors
+    if vectors is None:
+        vectors = os.path.join(tempfile.mkdtemp(), 'vectors')
+        synthetic_table(vectors, args.words, args.dimensions)
+
+    backends = {
+        'spaCy doc vectors': (False, None),
+        'spaCy doc vectors, lean pipeline': (True, None),
+        'Static table (memory-mapped)': (True, vectors),
+    }
+    print(f"{'backend':<34} {'load s':>7} {'batch s':>8} {'profiles/s':>11} {'single ms':>10} {'peak RSS MB':>12}")
+    for name, (lean, path) in backends.items():
+        try:
+            result = run_probe(lean, path, args.profiles, args.batch_size, args.sample)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<34} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            continue
+        rate = args.profiles / result['batch_seconds'] if result['batch_seconds'] > 0 else 0
+        print(f"{name:<34} {result['load_seconds']:>7.2f} {result['batch_seconds']:>8.2f} {rate:>11,.0f} "
+              f"{result['per_candidate_ms']:>10.2f} {result['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Measure building and serializing analysis results: the old list of result
+dicts written with the standard json module against a ResultTable streamed
+through serialization.py (orjson, its standard library fallback and gzip)
+Every mode runs in a fresh interpreter on the same synthetic pool. Scores and
+reasoning are synthesized without spaCy, so only the result handling is
+measured. Streamed output is consumed chunk by chunk, as a WSGI server
+writes it to the socket; the old modes build the whole document first.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Each probe prints one JSON line: build and serialize seconds, output size and peak RSS growth
+_PROBE = """
+import json, random, resource, sys, time
+from result_table import ResultTable, result_record
+import serialization
+from serialization import gzip_chunks, iter_json
+from skill_matcher import SkillAliases
+from synthetic_resumes import generate_pool
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+pool = generate_pool({count}, {seed})
+candidates = pool['resumes']
+job_description = pool['job_description']
+matcher = SkillAliases().compile(job_description.lower().split(), job_description)
+rng = random.Random({seed})
+entries = []
+for i, candidate in enumerate(candidates):
+    score = rng.randint(20, 95)
+    matching = ', '.join(matcher.matching_skills(candidate.get('skills', ''), 3))
+    name = f"{{candidate.get('firstName', '')}} {{candidate.get('lastName', '')}}".strip()
+    entries.append((i, score, f"{{name}} scored {{score}}/100. Good skill match ({{score / 2:.1f}}/50). "
+                               f"Key matching skills: {{matching}}. Strong experience profile."))
+baseline_mb = peak_rss_mb()
+
+started = time.perf_counter()
+{build}
+built = time.perf_counter()
+{serialize}
+finished = time.perf_counter()
+print(json.dumps({{'build_seconds': built - started, 'serialize_seconds': finished - built,
+                  'output_mb': size / (1024 * 1024), 'peak_rss_growth_mb': peak_rss_mb() - baseline_mb}}))
+"""
+
+_BUILD_LIST = """
+results = [result_record(candidates[i], score, reasoning) for i, score, reasoning in entries]
+results.sort(key=lambda result: result['score'], reverse=True)
+"""
+_BUILD_TABLE = """
+results = ResultTable.from_entries(candidates, entries)
+results.sort()
+"""
+_STREAM = """
+size = 0
+for chunk in {chunks}:
+    size += len(chunk)
+"""
+
+MODES = {
+    'list + json indent=2 (old CLI)': (
+        _BUILD_LIST,
+        "size = len(json.dumps(results, indent=2, ensure_ascii=False).encode('utf-8'))"
+    ),
+    'list + jsonify-style json (old API)': (
+        _BUILD_LIST,
+        "size = len(json.dumps({'success': True, 'candidates_analyzed': len(results), 'results': results},\n"
+        "                      ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode('utf-8'))"
+    ),
+    'table + orjson stream': (
+        _BUILD_TABLE,
+        _STREAM.format(chunks="iter_json({'success': True, 'candidates_analyzed': len(results)}, 'results', results)")
+    ),
+    'table + orjson stream + gzip': (
+        _BUILD_TABLE,
+        _STREAM.format(chunks="gzip_chunks(iter_json({'success': True, 'candidates_analyzed': len(results)}, "
+                              "'results', results))")
+    ),
+    'table + stdlib json stream': (
+        "serialization.orjson = None\n" + _BUILD_TABLE,
+        _STREAM.format(chunks="iter_json({'success': True, 'candidates_analyzed': len(results)}, 'results', results)")
+    ),
+}
+
+
+def run_probe(build: str, serialize: str, count: int, seed: int, repeat: int):
+    """Best-of-repeat run of one mode in fresh interpreters"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(count=count, seed=seed, build=build, serialize=serialize)],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run['build_seconds'] + run['serialize_seconds'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare result building and serialization strategies")
+    parser.add_argument('--resumes', type=int, default=100000, help="results per run")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic resumes")
+    parser.add_argument('--repeat', type=int, default=3, help="fresh interpreters per mode")
+    args = parser.parse_args()
+
+    print(f"{'mode':<38} {'build s':>8} {'serialize s':>12} {'output MB':>10} {'peak RSS +MB':>13}")
+    for name, (build, serialize) in MODES.items():
+        try:
+            result = run_probe(build, serialize, args.resumes, args.seed, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<38} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            continue
+        print(f"{name:<38} {result['build_seconds']:>8.3f} {result['serialize_seconds']:>12.3f} "
+              f"{result['output_mb']:>10.1f} {result['peak_rss_growth_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start cost: module import time, spaCy model load time and peak memory
+Every measurement runs in a fresh interpreter so nothing is already imported.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Each probe prints one JSON line: elapsed seconds and peak RSS in MB
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+print(json.dumps({{'seconds': elapsed, 'peak_rss_mb': rss_mb}}))
+"""
+
+PROBES = {
+    'import resume_analyzer': "import resume_analyzer",
+    'import pandas (no longer loaded)': "import pandas",
+    'import sklearn TF-IDF (loaded on first score)': "from sklearn.feature_extraction.text import TfidfVectorizer",
+    'ResumeAnalyzer() full pipeline': "from resume_analyzer import ResumeAnalyzer\nResumeAnalyzer()",
+    'ResumeAnalyzer(lean=True)': "from resume_analyzer import ResumeAnalyzer\nResumeAnalyzer(lean=True)",
+}
+
+
+def run_probe(body: str, repeat: int):
+    """Best-of-repeat timing of one probe in fresh interpreters"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(body=body)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run['seconds'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time, model load time and peak memory")
+    parser.add_argument('--repeat', type=int, default=3, help="fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    print(f"{'measurement':<48} {'seconds':>8} {'peak RSS MB':>12}")
+    for name, body in PROBES.items():
+        try:
+            result = run_probe(body, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<48} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            continue
+        print(f"{name:<48} {result['seconds']:>8.3f} {result['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
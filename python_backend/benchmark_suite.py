@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite over deterministic synthetic resume pools
+Times ResumeAnalyzer.analyze_candidates, each per-candidate scoring function,
+analyze_candidates across worker process counts (throughput scaling) and the
+/analyze endpoint (through the Flask test client) end to end for every pool
+size. Each benchmark and size runs in a fresh interpreter so peak
+RSS belongs to that run alone. Results go to a JSON file; with --baseline
+they are compared against a stored run and regressions are flagged (exit
+status 1).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+
+BENCHMARKS = ('analyze_candidates', 'functions', 'scaling', 'api')
+# Per-candidate functions timed by the 'functions' benchmark
+FUNCTIONS = ('preprocess_text', 'calculate_skill_match_score', 'calculate_experience_score',
+             'calculate_profile_score', 'generate_reasoning')
+# Compared against the baseline: metric -> True when higher is worse
+COMPARED_METRICS = {'p50_ms': True, 'p95_ms': True, 'throughput_per_sec': False, 'peak_rss_mb': True}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def summarize(benchmark: str, size: int, durations: List[float], items_per_run: int) -> Dict:
+    """Throughput and latency percentiles of a list of run durations in seconds"""
+    durations = np.asarray(durations)
+    p50 = float(np.percentile(durations, 50))
+    return {
+        'benchmark': benchmark,
+        'size': size,
+        'runs': len(durations),
+        'throughput_per_sec': items_per_run / p50 if p50 > 0 else 0.0,
+        'p50_ms': p50 * 1000,
+        'p95_ms': float(np.percentile(durations, 95)) * 1000,
+        'p99_ms': float(np.percentile(durations, 99)) * 1000,
+    }
+
+
+def run_benchmark(benchmark: str, size: int, args) -> List[Dict]:
+    """Run one benchmark on one pool size in this process"""
+    from resume_analyzer import ResumeAnalyzer
+    from synthetic_resumes import generate_pool
+
+    pool = generate_pool(size, args.seed)
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    results = []
+
+    if benchmark == 'api':
+        # The server builds its analyzer from the environment
+        if args.lean:
+            os.environ['RESUME_LEAN_MODEL'] = '1'
+        if args.profile_vectors:
+            os.environ['RESUME_PROFILE_VECTORS'] = args.profile_vectors
+        # Every repeat posts the same body, which the result cache would answer without scoring
+        os.environ['RESUME_RESULT_CACHE_SIZE'] = '0'
+        import api_server
+
+        client = api_server.app.test_client()
+        body = {**pool, **({'batch_size': args.batch_size} if args.batch_size else {})}
+        with quiet:
+            # Warm-up: model load, JD compilation and the scikit-learn import
+            client.post('/analyze', json={**body, 'resumes': pool['resumes'][:10]})
+            durations = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.post('/analyze', json=body)
+                durations.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"/analyze answered {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        results.append(summarize('api', size, durations, size))
+
+    else:
+        analyzer = ResumeAnalyzer(lean=args.lean, profile_vectors_path=args.profile_vectors)
+        with quiet:
+            analyzer.analyze_candidates({**pool, 'resumes': pool['resumes'][:10]}, batch_size=args.batch_size)
+
+            if benchmark == 'scaling':
+                base_throughput = None
+                for workers in args.scaling_workers:
+                    # Warm-up starts the worker processes, which load their own model
+                    analyzer.analyze_candidates({**pool, 'resumes': pool['resumes'][:workers * 10]},
+                                                batch_size=args.batch_size, workers=workers)
+                    durations = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        analyzer.analyze_candidates(pool, batch_size=args.batch_size, workers=workers)
+                        durations.append(time.perf_counter() - started)
+                    result = summarize(f"scaling:workers={workers}", size, durations, size)
+                    # Throughput relative to the first (smallest) worker count
+                    base_throughput = base_throughput or result['throughput_per_sec']
+                    result['speedup'] = result['throughput_per_sec'] / base_throughput if base_throughput else None
+                    results.append(result)
+
+            elif benchmark == 'analyze_candidates':
+                durations = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    analyzer.analyze_candidates(pool, batch_size=args.batch_size, workers=args.workers)
+                    durations.append(time.perf_counter() - started)
+                results.append(summarize('analyze_candidates', size, durations, size))
+
+            else:
+                job_description = pool['job_description']
+                sample = pool['resumes'][:min(size, args.sample)]
+                calls = {
+                    'preprocess_text': lambda c: analyzer.preprocess_text(c.get('skills', '')),
+                    'calculate_skill_match_score': lambda c: analyzer.calculate_skill_match_score(c.get('skills', ''),
+                                                                                                  job_description),
+                    'calculate_experience_score': lambda c: analyzer.calculate_experience_score(c, job_description),
+                    'calculate_profile_score': lambda c: analyzer.calculate_profile_score(c, job_description),
+                    'generate_reasoning': lambda c: analyzer.generate_reasoning(
+                        c, analyzer._combine_scores(25.0, 20.0, 10.0), job_description),
+                }
+                for name in FUNCTIONS:
+                    durations = []
+                    for candidate in sample:
+                        started = time.perf_counter()
+                        calls[name](candidate)
+                        durations.append(time.perf_counter() - started)
+                    results.append(summarize(f"function:{name}", size, durations, 1))
+        analyzer.close()
+
+    rss = peak_rss_mb()
+    for result in results:
+        result['peak_rss_mb'] = rss
+    return results
+
+
+def run_isolated(benchmark: str, size: int, args) -> List[Dict]:
+    """Run one benchmark in a fresh interpreter and collect its results"""
+    command = [sys.executable, os.path.abspath(__file__), '--child', benchmark, '--sizes', str(size),
+               '--seed', str(args.seed), '--repeat', str(args.repeat), '--sample', str(args.sample),
+               '--batch-size', str(args.batch_size or 0),
+               '--scaling-workers', ','.join(map(str, args.scaling_workers))]
+    for flag, value in (('--workers', args.workers), ('--profile-vectors', args.profile_vectors)):
+        if value:
+            command += [flag, str(value)]
+    if args.lean:
+        command.append('--lean')
+    output = subprocess.run(command, capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions beyond the tolerance against a baseline run, as readable lines"""
+    previous = {(entry['benchmark'], entry['size']): entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry['benchmark'], entry['size']))
+        if before is None:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            old, new = before.get(metric), entry.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change > tolerance) if higher_is_worse else (change < -tolerance):
+                regressions.append(f"{entry['benchmark']} @ {entry['size']}: {metric} {old:.2f} -> {new:.2f} "
+                                   f"({change:+.0%})")
+    return regressions
+
+
+def run_metadata(args) -> Dict:
+    """Where and how the results were produced"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {name: getattr(args, name) for name in
+                     ('sizes', 'seed', 'repeat', 'sample', 'batch_size', 'workers', 'scaling_workers', 'lean',
+                      'profile_vectors')}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analyzer on synthetic resume pools")
+    parser.add_argument('--sizes', default='1000,10000', help="comma-separated pool sizes (1k-1M)")
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS), help="comma-separated subset of " +
+                        ', '.join(BENCHMARKS))
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic pools")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs of analyze_candidates and /analyze")
+    parser.add_argument('--sample', type=int, default=200, help="candidates timed one call at a time per function")
+    parser.add_argument('--batch-size', type=int, default=256, help="nlp.pipe batch size (0 for per-candidate)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for analyze_candidates")
+    parser.add_argument('--scaling-workers', default='1,2,4',
+                        help="comma-separated worker process counts of the 'scaling' benchmark")
+    parser.add_argument('--lean', action='store_true', help="load spaCy without the parser and NER")
+    parser.add_argument('--profile-vectors', default=None, help="static word-vector table for profile similarity")
+    parser.add_argument('--api-max-size', type=int, default=10000,
+                        help="largest pool sent to /analyze in one request body")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the results")
+    parser.add_argument('--baseline', default=None, help="results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="relative change flagged as a regression")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.batch_size = args.batch_size or None
+    args.scaling_workers = [int(workers) for workers in args.scaling_workers.split(',') if workers.strip()]
+    if any(workers < 1 for workers in args.scaling_workers):
+        parser.error("--scaling-workers must be positive integers")
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    if args.child:
+        print(json.dumps(run_benchmark(args.child, sizes[0], args)))
+        return
+
+    benchmarks = [name.strip() for name in args.benchmarks.split(',') if name.strip()]
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"{'benchmark':<40} {'size':>8} {'per sec':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'RSS MB':>8}")
+    for size in sizes:
+        for benchmark in benchmarks:
+            if benchmark == 'api' and size > args.api_max_size:
+                print(f"{'api':<40} {size:>8} skipped (above --api-max-size)")
+                continue
+            try:
+                entries = run_isolated(benchmark, size, args)
+            except subprocess.CalledProcessError as e:
+                print(f"{benchmark:<40} {size:>8} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+                continue
+            for entry in entries:
+                speedup = f"  x{entry['speedup']:.2f}" if entry.get('speedup') else ''
+                print(f"{entry['benchmark']:<40} {entry['size']:>8} {entry['throughput_per_sec']:>10,.1f} "
+                      f"{entry['p50_ms']:>10.2f} {entry['p95_ms']:>10.2f} {entry['p99_ms']:>10.2f} "
+                      f"{entry['peak_rss_mb']:>8.0f}{speedup}")
+            results.extend(entries)
+
+    report = {'meta': run_metadata(args), 'results': results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        report['baseline'] = {'path': args.baseline, 'commit': baseline.get('meta', {}).get('commit'),
+                              'tolerance': args.tolerance, 'regressions': regressions}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.baseline:
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
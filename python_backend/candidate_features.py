@@ -0,0 +1,55 @@
+import hashlib
+import json
+from typing import Dict, Optional
+
+import numpy as np
+
+# Bump when the way features are computed changes, so stored features are recomputed
+FEATURE_VERSION = 2
+
+
+class CandidateFeatures:
+    """Everything NLP-derived that scoring needs from one candidate"""
+
+    __slots__ = ('skill_lemmas', 'profile_vector', 'total_experience', 'relevant_experience')
+
+    def __init__(self, skill_lemmas: str, profile_vector: Optional[np.ndarray],
+                 total_experience: float, relevant_experience: float):
+        # Lemmatized skills used for TF-IDF matching
+        self.skill_lemmas = skill_lemmas
+        # spaCy document vector of the profile text, None when there is no profile text
+        self.profile_vector = profile_vector
+        self.total_experience = total_experience
+        self.relevant_experience = relevant_experience
+
+
+def profile_text(candidate: Dict) -> str:
+    """Build the free text used for profile/role matching"""
+    return f"{candidate.get('profile', '')} {candidate.get('currentDesignation', '')} {candidate.get('interestedRole', '')}"
+
+
+def feature_key(candidate: Dict, model_version: str) -> str:
+    """Hash of the candidate fields features are derived from and the model that derived them"""
+    payload = json.dumps([
+        FEATURE_VERSION,
+        model_version,
+        candidate.get('skills', ''),
+        profile_text(candidate),
+        candidate.get('totalExperience', ''),
+        candidate.get('relevantExperience', '')
+    ], default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def vector_norm(vector: np.ndarray) -> float:
+    """L2 norm accumulated in double precision, like spaCy's Doc.vector_norm"""
+    return float(np.sqrt(np.sum((vector * vector).astype(np.float64))))
+
+
+def vector_similarity(vector: np.ndarray, other: np.ndarray) -> float:
+    """Cosine similarity computed the same way as spaCy's Doc.similarity"""
+    norm = vector_norm(vector)
+    other_norm = vector_norm(other)
+    if norm == 0 or other_norm == 0:
+        return 0.0
+    return float(np.dot(vector, other) / (norm * other_norm))
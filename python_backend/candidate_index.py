@@ -0,0 +1,283 @@
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from candidate_features import CandidateFeatures, vector_norm
+from skill_scorer import MAX_SKILL_SCORE, SkillScorer
+from streaming import chunked
+
+INDEX_VERSION = 1
+
+# Points the profile similarity is worth, as in ResumeAnalyzer.profile_vector_score
+MAX_PROFILE_SCORE = 15
+
+
+class CandidateIndex:
+    """Persistent two-stage retrieval index over a standing candidate pool
+
+    The directory holds the skill TF-IDF matrix as postings (a CSC matrix:
+    one list of candidates per term), the raw profile vectors, the extracted
+    experience and one JSON line per candidate. Arrays are memory-mapped, so
+    opening an index is cheap and only the pages a query touches are read.
+
+    search() first ranks everyone by the cheap skill + profile similarity,
+    then reruns the full three-part scoring and reasoning on the best depth
+    candidates only. recall() measures how much of the exhaustive top K a
+    given depth keeps, to tune it.
+    """
+
+    def __init__(self, path: str):
+        from scipy import sparse
+
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as fp:
+            self.meta = json.load(fp)
+        if self.meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported candidate index version {self.meta.get('version')} in {path}")
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+
+        self.size = self.meta['size']
+        self.model_version = self.meta['model_version']
+        self.skill_scorer = SkillScorer.load(os.path.join(path, 'vocabulary.joblib'))
+        self.postings = sparse.csc_matrix(
+            (load('postings_data'), load('postings_indices'), load('postings_indptr')),
+            shape=(self.size, self.meta['vocabulary_size']), copy=False
+        )
+        self.profiles = load('profiles')
+        self.profile_norms = load('profile_norms')
+        self.experience = load('experience')
+        self.offsets = load('offsets')
+
+    @classmethod
+    def build(cls, analyzer, candidates: Iterable[Dict], path: str, batch_size: int = 1000,
+              workers: Optional[int] = None) -> 'CandidateIndex':
+        """Extract features for a candidate pool and write the index to path
+
+        The skill vocabulary loaded into the analyzer is used when there is
+        one; otherwise it is fitted over the pool. Candidates whose NLP fails
+        are left out of the index.
+        """
+        from scipy import sparse
+
+        os.makedirs(path, exist_ok=True)
+        started = time.perf_counter()
+
+        skill_lemmas = []
+        profiles = []
+        experience = []
+        offsets = []
+        skipped = 0
+        dimensions = None
+
+        with open(os.path.join(path, 'records.ndjson'), 'wb') as records:
+            for chunk in chunked(candidates, batch_size):
+                features, errors = analyzer.extract_candidate_features(chunk, batch_size, workers)
+                for i, candidate in enumerate(chunk):
+                    if i in errors or features[i] is None:
+                        skipped += 1
+                        continue
+                    item = features[i]
+                    if item.profile_vector is not None:
+                        dimensions = len(item.profile_vector)
+                    offsets.append(records.tell())
+                    records.write(json.dumps(
+                        {'candidate': candidate, 'skill_lemmas': item.skill_lemmas},
+                        ensure_ascii=False
+                    ).encode('utf-8') + b"\n")
+                    skill_lemmas.append(item.skill_lemmas)
+                    profiles.append(item.profile_vector)
+                    experience.append((item.total_experience, item.relevant_experience))
+
+        if not offsets:
+            raise ValueError("No candidates could be indexed")
+
+        if dimensions is None:
+            # No profile text anywhere: size the vectors like any other document's
+            dimensions = len(analyzer.nlp("profile").vector)
+        profile_matrix = np.zeros((len(profiles), dimensions), dtype=np.float32)
+        for i, vector in enumerate(profiles):
+            if vector is not None:
+                profile_matrix[i] = vector
+
+        scorer = analyzer.skill_scorer
+        if scorer.vectorizer is None:
+            scorer = SkillScorer().fit(skill_lemmas)
+        scorer.save(os.path.join(path, 'vocabulary.joblib'))
+        postings = sparse.csc_matrix(scorer.vectorizer.transform(skill_lemmas), dtype=np.float64)
+        postings.sort_indices()
+
+        np.save(os.path.join(path, 'postings_data.npy'), postings.data)
+        np.save(os.path.join(path, 'postings_indices.npy'), postings.indices)
+        np.save(os.path.join(path, 'postings_indptr.npy'), postings.indptr)
+        np.save(os.path.join(path, 'profiles.npy'), profile_matrix)
+        np.save(os.path.join(path, 'profile_norms.npy'),
+                np.array([vector_norm(vector) for vector in profile_matrix], dtype=np.float64))
+        np.save(os.path.join(path, 'experience.npy'), np.array(experience, dtype=np.float64))
+        np.save(os.path.join(path, 'offsets.npy'), np.array(offsets, dtype=np.int64))
+
+        with open(os.path.join(path, 'meta.json'), 'w') as fp:
+            json.dump({
+                'version': INDEX_VERSION,
+                'model_version': analyzer.model_version,
+                'size': len(offsets),
+                'skipped': skipped,
+                'vocabulary_size': postings.shape[1],
+                'built_at': time.time()
+            }, fp, indent=2)
+
+        elapsed = time.perf_counter() - started
+        print(f"Indexed {len(offsets)} candidates in {elapsed:.2f}s ({skipped} skipped)")
+        return cls(path)
+
+    def retrieval_scores(self, job, dense: bool = True) -> np.ndarray:
+        """Cheap first-stage score of every candidate: skill points plus, with dense, profile points"""
+        query = self.skill_scorer.vectorizer.transform([job.lemmas])
+        scores = np.zeros(self.size)
+        if query.nnz:
+            # Only the postings of the job description's terms are touched
+            similarities = self.postings[:, query.indices] @ query.data
+            scores += np.minimum(similarities * MAX_SKILL_SCORE, MAX_SKILL_SCORE)
+
+        if dense:
+            job_vector = job.vector
+            job_norm = vector_norm(job_vector)
+            if job_norm > 0:
+                norms = self.profile_norms * job_norm
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    similarities = np.where(norms > 0, (self.profiles @ job_vector) / norms, 0.0)
+                scores += np.minimum(similarities * MAX_PROFILE_SCORE, MAX_PROFILE_SCORE)
+
+        return scores
+
+    def retrieve(self, job, depth: int, dense: bool = True) -> List[int]:
+        """Positions of the depth best candidates by retrieval score, in index order"""
+        if depth >= self.size:
+            return list(range(self.size))
+        scores = self.retrieval_scores(job, dense)
+        shortlist = np.argpartition(-scores, depth - 1)[:depth]
+        # Index order keeps ties resolving like an exhaustive analysis of the pool
+        return sorted(shortlist.tolist())
+
+    def records(self, positions: Sequence[int]) -> List[Dict]:
+        """Read the stored records of the given candidates"""
+        records = []
+        with open(os.path.join(self.path, 'records.ndjson'), 'rb') as fp:
+            for position in positions:
+                fp.seek(int(self.offsets[position]))
+                records.append(json.loads(fp.readline()))
+        return records
+
+    def rerank(self, analyzer, job, positions: Sequence[int], top_k: int,
+               fields: Optional[List[str]] = None) -> List[Dict]:
+        """Full three-part scoring and reasoning for the given candidates"""
+        records = self.records(positions)
+        candidates = [record['candidate'] for record in records]
+        features = [
+            CandidateFeatures(
+                skill_lemmas=record['skill_lemmas'],
+                profile_vector=np.array(self.profiles[position]) if self.profile_norms[position] > 0 else None,
+                total_experience=float(self.experience[position, 0]),
+                relevant_experience=float(self.experience[position, 1])
+            )
+            for position, record in zip(positions, records)
+        ]
+        return analyzer.score_features(candidates, features, {}, job, skill_scorer=self.skill_scorer,
+                                       fields=fields, top_k=top_k)
+
+    def search(self, analyzer, job_description: str, top_k: int = 10, depth: int = 2000,
+               dense: bool = True, fields: Optional[List[str]] = None) -> List[Dict]:
+        """Retrieve the depth most similar candidates and return the top_k after full scoring"""
+        if not job_description:
+            raise ValueError("Job description is required for analysis")
+
+        if top_k < 1 or depth < 1:
+            raise ValueError("top_k and depth must be positive integers")
+
+        if analyzer.model_version != self.model_version:
+            raise ValueError(f"Index was built with {self.model_version}, analyzer runs {analyzer.model_version}")
+
+        job = analyzer.compile_job_description(job_description)
+        return self.rerank(analyzer, job, self.retrieve(job, max(depth, top_k), dense), top_k, fields)
+
+    def recall(self, analyzer, job_description: str, top_k: int = 10, depths: Iterable[int] = (500, 1000, 2000),
+               dense: bool = True) -> Dict[int, float]:
+        """Share of the exhaustive top_k that two-stage search finds at each retrieval depth"""
+        exhaustive = self.search(analyzer, job_description, top_k, self.size, dense, fields=[])
+        expected = {result['candidateId'] for result in exhaustive}
+        recall = {}
+        for depth in depths:
+            found = {result['candidateId'] for result in self.search(analyzer, job_description, top_k, depth, dense, fields=[])}
+            recall[depth] = len(found & expected) / len(expected)
+        return recall
+
+    def stats(self) -> Dict:
+        """Size of the index and what it was built with"""
+        return {
+            'candidates': self.size,
+            'skipped': self.meta.get('skipped', 0),
+            'vocabulary_size': self.meta['vocabulary_size'],
+            'model_version': self.model_version,
+            'built_at': self.meta.get('built_at')
+        }
+
+
+def main():
+    """Build, query and evaluate a candidate index from the command line"""
+    import argparse
+
+    from resume_analyzer import ResumeAnalyzer
+    from streaming import read_resume_stream, stream_format
+
+    parser = argparse.ArgumentParser(description="Two-stage candidate retrieval index")
+    parser.add_argument('path', help="index directory")
+    parser.add_argument('command', choices=['build', 'search', 'recall', 'stats'])
+    parser.add_argument('--resumes', default=None, help="JSON or NDJSON resume file to build the index from")
+    parser.add_argument('--job-description', default=None, help="job description to search for")
+    parser.add_argument('--top-k', type=int, default=10, help="number of candidates returned")
+    parser.add_argument('--depth', type=int, default=2000, help="candidates kept by the retrieval stage")
+    parser.add_argument('--depths', default='250,500,1000,2000', help="comma-separated depths for recall")
+    parser.add_argument('--no-dense', action='store_true', help="retrieve by skills only")
+    parser.add_argument('--batch-size', type=int, default=1000, help="candidates processed per batch when building")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes when building")
+    parser.add_argument('--skill-vocabulary', default=None, help="pre-fitted skill vocabulary to build with")
+    parser.add_argument('--profile-vectors', default=None, help="static word-vector table for profile similarity")
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        print(json.dumps(CandidateIndex(args.path).stats(), indent=2))
+        return
+
+    analyzer = ResumeAnalyzer(skill_vocabulary_path=args.skill_vocabulary, profile_vectors_path=args.profile_vectors)
+    try:
+        if args.command == 'build':
+            if not args.resumes:
+                parser.error("build needs --resumes")
+            with open(args.resumes, 'rb') as fp:
+                _, resumes = read_resume_stream(fp, stream_format(args.resumes))
+                CandidateIndex.build(analyzer, resumes, args.path, args.batch_size, args.workers)
+            return
+
+        if not args.job_description:
+            parser.error(f"{args.command} needs --job-description")
+        index = CandidateIndex(args.path)
+        if args.command == 'search':
+            started = time.perf_counter()
+            results = index.search(analyzer, args.job_description, args.top_k, args.depth, not args.no_dense, fields=[])
+            print(f"Searched {index.size} candidates in {time.perf_counter() - started:.3f}s")
+            for i, result in enumerate(results):
+                print(f"{i+1}. {result['name']} - Score: {result['score']}")
+        else:
+            depths = [int(depth) for depth in args.depths.split(',')]
+            for depth, recall in index.recall(analyzer, args.job_description, args.top_k, depths, not args.no_dense).items():
+                print(f"depth {depth}: recall@{args.top_k} = {recall:.3f}")
+    finally:
+        analyzer.close()
+
+
+if __name__ == "__main__":
+    main()
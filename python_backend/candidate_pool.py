@@ -0,0 +1,453 @@
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from candidate_features import CandidateFeatures
+from skill_scorer import SkillScorer
+
+# Candidates scored per matrix product when a new requisition ranks the whole pool
+RESCORE_CHUNK_SIZE = 10000
+# Seconds a write waits for another process's write (a whole-pool rescore) to finish
+LOCK_TIMEOUT = 600.0
+# The pool's own vocabulary is refitted each time the pool doubles, up to this many
+# candidates; past it the vocabulary covers the pool's skills and refit() is run by hand
+AUTO_REFIT_LIMIT = 10000
+
+
+class CandidatePool:
+    """Server-side candidate pool with standing requisitions ranked incrementally
+
+    Candidates are stored with their extracted features and every standing
+    requisition keeps one score row per candidate, indexed by score. Adding,
+    updating or deleting a candidate only scores that candidate against the
+    standing job descriptions and splices its rows into the rankings; a new
+    requisition scores the stored features of the pool without any NLP.
+
+    Skill scores need a vocabulary that stays fixed while the pool changes:
+    the analyzer's loaded vocabulary is used when there is one. Otherwise the
+    pool fits its own once it has both candidates and a requisition, over
+    every stored candidate and job description, and saves it next to the
+    database. It is refitted, and the pool rescored, whenever the pool has
+    doubled since the last fit until it reaches AUTO_REFIT_LIMIT candidates,
+    so a vocabulary bootstrapped from a handful of candidates does not leave
+    everyone added later out of it. refit() refits it over the whole pool and
+    rescores everything.
+
+    Several processes (server workers, the refit command) can share one
+    pool. Every write takes the database's write lock first (BEGIN
+    IMMEDIATE), and the vocabulary version recorded in the database decides
+    which vocabulary is used: a process picks up one fitted elsewhere before
+    it writes, only one process fits the first vocabulary, and rankings are
+    never scored with a vocabulary other than the recorded one.
+    """
+
+    def __init__(self, analyzer, path: str):
+        self.analyzer = analyzer
+        self.path = path
+        # Vocabulary of pools saved before its version was recorded in the database
+        self.legacy_vocabulary_path = f"{path}.vocabulary.joblib"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=LOCK_TIMEOUT, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS candidates (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                record TEXT NOT NULL,
+                skill_lemmas TEXT NOT NULL,
+                profile_vector BLOB,
+                total_experience REAL NOT NULL,
+                relevant_experience REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS requisitions (
+                id TEXT PRIMARY KEY,
+                job_description TEXT NOT NULL,
+                top_k INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                vocabulary_version TEXT
+            );
+            CREATE TABLE IF NOT EXISTS rankings (
+                requisition_id TEXT NOT NULL,
+                candidate_seq INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                skills REAL NOT NULL,
+                experience REAL NOT NULL,
+                profile REAL NOT NULL,
+                PRIMARY KEY (requisition_id, candidate_seq)
+            );
+            CREATE INDEX IF NOT EXISTS rankings_by_score
+                ON rankings (requisition_id, score DESC, candidate_seq);
+        """)
+        # Vocabulary each ranking was scored with, added after the first pools were created
+        if 'vocabulary_version' not in {row[1] for row in self._conn.execute("PRAGMA table_info(requisitions)")}:
+            self._conn.execute("ALTER TABLE requisitions ADD COLUMN vocabulary_version TEXT")
+        self._conn.commit()
+
+        # Stored profile vectors are only comparable with the model that produced them
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'model_version'").fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO meta VALUES ('model_version', ?)", (analyzer.model_version,))
+            self._conn.commit()
+        elif row[0] != analyzer.model_version:
+            raise ValueError(f"Candidate pool {path} was built with {row[0]}, analyzer runs {analyzer.model_version}")
+
+        # The analyzer's loaded vocabulary, or the pool's own one shared through the database
+        self.fixed_vocabulary = analyzer.skill_scorer.vectorizer is not None
+        self.skill_scorer = analyzer.skill_scorer if self.fixed_vocabulary else None
+        with self._write():
+            if (not self.fixed_vocabulary and self._vocabulary_version() is None
+                    and os.path.exists(self.legacy_vocabulary_path)):
+                self._record_vocabulary(SkillScorer.load(self.legacy_vocabulary_path))
+
+    def add(self, candidates: List[Dict], batch_size: Optional[int] = None,
+            workers: Optional[int] = None) -> Dict:
+        """Add or update candidates (matched by candidateId) and splice them into every ranking"""
+        for candidate in candidates:
+            if not isinstance(candidate, dict) or candidate.get('candidateId') is None:
+                raise ValueError("Every candidate needs a candidateId")
+
+        started = time.perf_counter()
+        features, errors = self.analyzer.extract_candidate_features(candidates, batch_size, workers)
+        for i, error in errors.items():
+            self.analyzer.report_failure(candidates[i], error)
+
+        accepted = [i for i in range(len(candidates)) if i not in errors and features[i] is not None]
+        self.add_features([candidates[i] for i in accepted], [features[i] for i in accepted])
+
+        return {
+            'added': len(accepted),
+            'failed': [candidates[i].get('candidateId') for i in range(len(candidates)) if i not in accepted],
+            'seconds': time.perf_counter() - started
+        }
+
+    def add_features(self, candidates: List[Dict], features: List[CandidateFeatures]) -> None:
+        """Store candidates with already extracted features and rescore them against every requisition"""
+        if not candidates:
+            return
+        now = time.time()
+        with self._write():
+            # Upserts keep a candidate's seq, so ranking ties stay in first-added order
+            self._conn.executemany(
+                "INSERT INTO candidates (id, record, skill_lemmas, profile_vector, total_experience, "
+                "relevant_experience, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET record = excluded.record, skill_lemmas = excluded.skill_lemmas, "
+                "profile_vector = excluded.profile_vector, total_experience = excluded.total_experience, "
+                "relevant_experience = excluded.relevant_experience, updated_at = excluded.updated_at",
+                [
+                    (str(candidate['candidateId']), json.dumps(candidate, ensure_ascii=False), item.skill_lemmas,
+                     np.asarray(item.profile_vector, dtype=np.float32).tobytes() if item.profile_vector is not None else None,
+                     item.total_experience, item.relevant_experience, now)
+                    for candidate, item in zip(candidates, features)
+                ]
+            )
+            seqs = [
+                self._conn.execute("SELECT seq FROM candidates WHERE id = ?", (str(candidate['candidateId']),)).fetchone()[0]
+                for candidate in candidates
+            ]
+
+            requisitions = self._requisitions()
+            fitted = self._fit_vocabulary_if_due(requisitions)
+            if fitted:
+                self._conn.execute("DELETE FROM rankings")
+                self._rescore_pool(requisitions)
+            elif requisitions:
+                self._store_scores(seqs, features, requisitions, candidates)
+        if fitted:
+            self._remove_stale_vocabularies()
+
+    def remove(self, candidate_id) -> bool:
+        """Delete a candidate and its rows in every ranking"""
+        with self._write():
+            row = self._conn.execute("SELECT seq FROM candidates WHERE id = ?", (str(candidate_id),)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM rankings WHERE candidate_seq = ?", row)
+            self._conn.execute("DELETE FROM candidates WHERE seq = ?", row)
+            return True
+
+    def add_requisition(self, job_description: str, requisition_id: Optional[str] = None,
+                        top_k: int = 10) -> Dict:
+        """Save a standing job description and rank the whole pool against it"""
+        if not job_description:
+            raise ValueError("Job description is required for analysis")
+
+        if top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+
+        requisition_id = str(requisition_id) if requisition_id is not None else uuid.uuid4().hex
+        started = time.perf_counter()
+        with self._write():
+            self._conn.execute("INSERT OR REPLACE INTO requisitions VALUES (?, ?, ?, ?, NULL)",
+                               (requisition_id, job_description, top_k, time.time()))
+            self._conn.execute("DELETE FROM rankings WHERE requisition_id = ?", (requisition_id,))
+            job = self.analyzer.compile_job_description(job_description)
+            requisitions = self._requisitions()
+            fitted = self._fit_vocabulary_if_due(requisitions)
+            if fitted:
+                self._conn.execute("DELETE FROM rankings")
+                self._rescore_pool(requisitions)
+            else:
+                self._rescore_pool([(requisition_id, job)])
+        if fitted:
+            self._remove_stale_vocabularies()
+
+        return {'requisition_id': requisition_id, 'top_k': top_k, 'candidates_ranked': self.size(),
+                'seconds': time.perf_counter() - started}
+
+    def remove_requisition(self, requisition_id: str) -> bool:
+        """Delete a standing requisition and its ranking"""
+        with self._write():
+            removed = self._conn.execute("DELETE FROM requisitions WHERE id = ?", (requisition_id,)).rowcount
+            self._conn.execute("DELETE FROM rankings WHERE requisition_id = ?", (requisition_id,))
+            return removed > 0
+
+    def requisitions(self) -> List[Dict]:
+        """Every standing requisition"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, job_description, top_k, created_at FROM requisitions ORDER BY created_at"
+            ).fetchall()
+        return [{'requisition_id': requisition_id, 'job_description': job_description, 'top_k': top_k,
+                 'created_at': created_at} for requisition_id, job_description, top_k, created_at in rows]
+
+    def shortlist(self, requisition_id: str, top_k: Optional[int] = None,
+                  fields: Optional[List[str]] = None) -> Optional[List[Dict]]:
+        """The current best candidates of a requisition with their reasoning, or None if it is unknown
+
+        Raises ValueError when the ranking was scored with another vocabulary
+        than the pool's current one.
+        """
+        # One read transaction, so the ranking and the recorded vocabulary match
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            row = self._conn.execute("SELECT job_description, top_k, vocabulary_version FROM requisitions WHERE id = ?",
+                                     (requisition_id,)).fetchone()
+            if row is None:
+                return None
+            job_description, default_top_k, ranked_with = row
+            current = self._vocabulary_version()
+            if ranked_with is not None and ranked_with != current:
+                raise ValueError(f"Requisition {requisition_id} was ranked with skill vocabulary {ranked_with}, "
+                                 f"the pool uses {current}; run refit")
+            rows = self._conn.execute(
+                "SELECT c.record, r.score, r.skills, r.experience, r.profile FROM rankings r "
+                "JOIN candidates c ON c.seq = r.candidate_seq WHERE r.requisition_id = ? "
+                "ORDER BY r.score DESC, r.candidate_seq LIMIT ?",
+                (requisition_id, top_k or default_top_k)
+            ).fetchall()
+
+        job = self.analyzer.compile_job_description(job_description)
+        results = []
+        for record, score, skills, experience, profile in rows:
+            candidate = json.loads(record)
+            scores = self.analyzer._combine_scores(skills, experience, profile)
+            try:
+                reasoning = self.analyzer.build_reasoning(candidate, scores, job.skill_matcher)
+                results.append(self.analyzer.build_result(candidate, score, reasoning, fields))
+            except Exception as e:
+                self.analyzer.report_failure(candidate, e)
+                results.append(self.analyzer.fallback_result(candidate, fields))
+        return results
+
+    def refit(self) -> None:
+        """Refit the skill vocabulary over the whole pool and rescore every requisition
+
+        With a vocabulary loaded by the analyzer, that vocabulary is recorded
+        instead and the pool is rescored with it.
+        """
+        with self._write():
+            if self.fixed_vocabulary:
+                self._record_vocabulary(self.skill_scorer)
+            else:
+                lemmas = [row[0] for row in self._conn.execute("SELECT skill_lemmas FROM candidates")]
+                self._fit_vocabulary(lemmas)
+            self._conn.execute("DELETE FROM rankings")
+            self._rescore_pool(self._requisitions())
+        self._remove_stale_vocabularies()
+
+    def size(self) -> int:
+        """Number of candidates in the pool"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Pool size, standing requisitions and bytes on disk"""
+        with self._lock:
+            candidates = self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+            requisitions = self._conn.execute("SELECT COUNT(*) FROM requisitions").fetchone()[0]
+            vocabulary_version = self._vocabulary_version()
+        return {
+            'candidates': candidates,
+            'requisitions': requisitions,
+            'vocabulary_version': vocabulary_version,
+            'bytes_on_disk': os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _write(self):
+        """One write transaction holding the database's write lock, with the recorded vocabulary in use
+
+        The connection's context manager rolls a failed update back as a whole.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._sync_vocabulary()
+            yield
+
+    def _vocabulary_version(self) -> Optional[str]:
+        """Version of the vocabulary the database records, None before one is fitted"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'vocabulary_version'").fetchone()
+        return row[0] if row else None
+
+    def _vocabulary_file(self, version: str) -> str:
+        return f"{self.path}.vocabulary-{version}.joblib"
+
+    def _sync_vocabulary(self) -> None:
+        """Load the recorded vocabulary when another process (or a rolled back write) changed it"""
+        version = self._vocabulary_version()
+        if self.fixed_vocabulary:
+            if version is None:
+                self._record_vocabulary(self.skill_scorer)
+            return
+        if version == (self.skill_scorer.version() if self.skill_scorer is not None else None):
+            return
+        self.skill_scorer = SkillScorer.load(self._vocabulary_file(version)) if version is not None else None
+
+    def _record_vocabulary(self, scorer: SkillScorer) -> None:
+        """Make a vocabulary the pool's current one; call inside a write"""
+        version = scorer.version()
+        if not os.path.exists(self._vocabulary_file(version)):
+            scorer.save(self._vocabulary_file(version))
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('vocabulary_version', ?)", (version,))
+        self.skill_scorer = scorer
+
+    def _fit_vocabulary(self, skill_lemmas: List[str]) -> None:
+        """Fit the standing skill vocabulary on candidate and requisition texts and record it"""
+        corpus = skill_lemmas + [job.lemmas for _, job in self._requisitions()]
+        self._record_vocabulary(SkillScorer().fit(corpus))
+        # Pool size the vocabulary was fitted on, which decides when it is refitted
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('vocabulary_candidates', ?)", (str(len(skill_lemmas)),))
+
+    def _fit_vocabulary_if_due(self, requisitions) -> bool:
+        """Fit the pool's own vocabulary when it has none or the pool has doubled since; call inside a write
+
+        Returns True when it did, and every ranking then needs rescoring.
+        """
+        if self.fixed_vocabulary or not requisitions:
+            return False
+        size = self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        if size == 0:
+            return False
+        if self.skill_scorer is not None:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'vocabulary_candidates'").fetchone()
+            # Pools whose vocabulary predates the recorded size keep it until refit()
+            if row is None or size < 2 * int(row[0]) or size > AUTO_REFIT_LIMIT:
+                return False
+        self._fit_vocabulary([row[0] for row in self._conn.execute("SELECT skill_lemmas FROM candidates")])
+        return True
+
+    def _remove_stale_vocabularies(self) -> None:
+        """Delete saved vocabularies other than the recorded one"""
+        with self._lock:
+            current = self._vocabulary_file(self._vocabulary_version() or '')
+        for path in glob.glob(f"{glob.escape(self.path)}.vocabulary-*.joblib"):
+            if path != current:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _requisitions(self):
+        """(id, compiled job description) of every standing requisition"""
+        rows = self._conn.execute("SELECT id, job_description FROM requisitions ORDER BY created_at").fetchall()
+        return [(requisition_id, self.analyzer.compile_job_description(text)) for requisition_id, text in rows]
+
+    def _store_scores(self, seqs: List[int], features: List[CandidateFeatures], requisitions,
+                      candidates: Optional[List[Dict]]) -> None:
+        """Score candidates against requisitions and write their ranking rows"""
+        if self.skill_scorer is None:
+            # Nothing has been added yet, so there is nothing to rank
+            return
+        version = self.skill_scorer.version()
+        if version != self._vocabulary_version():
+            raise ValueError(f"Candidate pool {self.path} is ranked with skill vocabulary {self._vocabulary_version()}, "
+                             f"the analyzer loads {version}; run refit to rescore it")
+        components = self.analyzer.score_matrix(features, {}, [job for _, job in requisitions], self.skill_scorer,
+                                                candidates)
+        rows = []
+        for j, (requisition_id, _) in enumerate(requisitions):
+            for i, seq in enumerate(seqs):
+                rows.append((requisition_id, seq, int(components['total'][i, j]), float(components['skills'][i, j]),
+                             float(components['experience'][i, j]), float(components['profile'][i, j])))
+        self._conn.executemany("INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._conn.executemany("UPDATE requisitions SET vocabulary_version = ? WHERE id = ?",
+                               [(version, requisition_id) for requisition_id, _ in requisitions])
+
+    def _rescore_pool(self, requisitions) -> None:
+        """Rank every stored candidate against the given requisitions from their stored features"""
+        last_seq = 0
+        while True:
+            rows = self._conn.execute(
+                "SELECT seq, skill_lemmas, profile_vector, total_experience, relevant_experience, record "
+                "FROM candidates WHERE seq > ? ORDER BY seq LIMIT ?",
+                (last_seq, RESCORE_CHUNK_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            seqs = [row[0] for row in rows]
+            features = [
+                CandidateFeatures(skill_lemmas, np.frombuffer(vector, dtype=np.float32) if vector is not None else None,
+                                  total_exp, relevant_exp)
+                for _, skill_lemmas, vector, total_exp, relevant_exp, _ in rows
+            ]
+            # Records are only parsed when the skill overlap needs the listed skills
+            candidates = [json.loads(row[5]) for row in rows] if self.analyzer.skill_overlap_weight else None
+            self._store_scores(seqs, features, requisitions, candidates)
+            last_seq = seqs[-1]
+
+
+def main():
+    """Inspect or refit a candidate pool from the command line"""
+    import argparse
+
+    from resume_analyzer import ResumeAnalyzer
+
+    parser = argparse.ArgumentParser(description="Maintain the candidate pool")
+    parser.add_argument('path', help="path to the candidate pool database")
+    parser.add_argument('command', choices=['stats', 'refit'])
+    parser.add_argument('--profile-vectors', default=None,
+                        help="static word-vector table the pool was built with, if any")
+    args = parser.parse_args()
+
+    analyzer = ResumeAnalyzer(profile_vectors_path=args.profile_vectors)
+    pool = CandidatePool(analyzer, args.path)
+    try:
+        if args.command == 'refit':
+            started = time.perf_counter()
+            pool.refit()
+            print(f"Refitted the vocabulary and rescored the pool in {time.perf_counter() - started:.2f}s")
+        print(json.dumps(pool.stats(), indent=2))
+    finally:
+        pool.close()
+        analyzer.close()
+
+
+if __name__ == "__main__":
+    main()
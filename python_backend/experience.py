@@ -0,0 +1,132 @@
+import re
+from typing import Dict, List
+
+import numpy as np
+
+# "5 years", "3.5 yrs", "5 years 6 months", "2 yrs and 3 mos"; in "3-5 yrs" the
+# first match is "5 yrs", so ranges count as their upper bound
+YEARS_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)(?:[\s,]*(?:and\s+)?(\d+(?:\.\d+)?)\s*(?:months?|mos?)\b)?',
+    re.ASCII
+)
+# Values given in months only, e.g. "18 months"
+MONTHS_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:months?|mos?)\b', re.ASCII)
+
+
+def parse_years(experience_text: str) -> float:
+    """Years of experience in a free-text value such as "5 years 6 months" or "18 months"
+
+    Raises like any string method on values that are neither empty nor text.
+    """
+    if not experience_text:
+        return 0
+
+    text = experience_text.lower()
+    match = YEARS_PATTERN.search(text)
+    if match:
+        years = float(match.group(1))
+        if match.group(2):
+            years += float(match.group(2)) / 12
+        return years
+
+    match = MONTHS_PATTERN.search(text)
+    if match:
+        return float(match.group(1)) / 12
+    return 0
+
+
+def parse_years_column(values) -> np.ndarray:
+    """parse_years over a whole column at once with pandas factorization and string extraction
+
+    Values that are not text count as 0 here; callers that need the scalar
+    path's errors for them check the types themselves.
+    """
+    import pandas as pd
+
+    # Exports repeat a small set of values ("5 years", "3-5 yrs"), so the
+    # regexes only run on the distinct ones and the result is gathered back
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    try:
+        codes, distinct = pd.factorize(column, use_na_sentinel=False)
+    except TypeError:
+        # Unhashable values such as lists: they count as 0 like any other non-text value
+        column[:] = [value if isinstance(value, str) else '' for value in values]
+        codes, distinct = pd.factorize(column, use_na_sentinel=False)
+    text = pd.Series(distinct, dtype=object)
+    text = text.where(text.map(type) == str, '').str.lower()
+
+    matched = text.str.extract(YEARS_PATTERN)
+    years = pd.to_numeric(matched[0]).to_numpy(dtype=np.float64)
+    months = pd.to_numeric(matched[1]).fillna(0).to_numpy(dtype=np.float64)
+    months_only = pd.to_numeric(text.str.extract(MONTHS_PATTERN)[0]).fillna(0).to_numpy(dtype=np.float64)
+
+    parsed = np.where(np.isnan(years), months_only / 12, years + months / 12)
+    return parsed[codes]
+
+
+def experience_points(total_exp: float, relevant_exp: float, required_exp: float) -> float:
+    """Score already extracted years of experience against the requirement (0-35)"""
+    score = 0
+
+    # Score based on total experience
+    if total_exp >= required_exp:
+        score += 20
+        # Bonus for exceeding requirements
+        if total_exp > required_exp * 1.5:
+            score += 10
+    else:
+        # Partial score if close to requirement
+        score += (total_exp / required_exp) * 15
+
+    # Score based on relevant experience
+    if relevant_exp >= required_exp * 0.8:
+        score += 15
+    else:
+        score += (relevant_exp / (required_exp * 0.8)) * 10
+
+    return min(score, 35)  # Cap at 35 points
+
+
+def experience_points_array(total_exp: np.ndarray, relevant_exp: np.ndarray, required_exp: float) -> np.ndarray:
+    """The 0-35 experience score of experience_points for whole arrays"""
+    total_exp = np.asarray(total_exp, dtype=np.float64)
+    relevant_exp = np.asarray(relevant_exp, dtype=np.float64)
+
+    # Both branches are evaluated, so a requirement of 0 would divide by zero in the unused one
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Score based on total experience, with a bonus for exceeding requirements
+        score = np.where(
+            total_exp >= required_exp,
+            np.where(total_exp > required_exp * 1.5, 30.0, 20.0),
+            (total_exp / required_exp) * 15
+        )
+
+        # Score based on relevant experience
+        score = score + np.where(
+            relevant_exp >= required_exp * 0.8,
+            15.0,
+            (relevant_exp / (required_exp * 0.8)) * 10
+        )
+
+    return np.minimum(score, 35)  # Cap at 35 points
+
+
+def experience_frame(candidates: List[Dict], required_exp: float):
+    """Columnar experience scoring of a candidate batch
+
+    Returns a DataFrame indexed by input position with the parsed total and
+    relevant years and the experience score of every candidate.
+    """
+    import pandas as pd
+
+    # Both columns share their distinct values, so they are parsed in one pass
+    years = parse_years_column([candidate.get('totalExperience', '') for candidate in candidates] +
+                               [candidate.get('relevantExperience', '') for candidate in candidates])
+    frame = pd.DataFrame({
+        'total_years': years[:len(candidates)],
+        'relevant_years': years[len(candidates):]
+    })
+    frame['experience_score'] = experience_points_array(frame['total_years'].to_numpy(),
+                                                        frame['relevant_years'].to_numpy(), required_exp)
+    return frame
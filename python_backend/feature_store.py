@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from candidate_features import CandidateFeatures
+
+
+class FeatureStore:
+    """On-disk SQLite cache of candidate features keyed by content hash
+
+    Keys come from candidate_features.feature_key, which covers the candidate
+    fields the features are derived from and the spaCy model version, so an
+    edited resume or a new model simply misses the cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS features (
+                key TEXT PRIMARY KEY,
+                model_version TEXT NOT NULL,
+                skill_lemmas TEXT NOT NULL,
+                profile_vector BLOB,
+                total_experience REAL NOT NULL,
+                relevant_experience REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CandidateFeatures]:
+        """Fetch the stored features for the given keys, skipping unknown ones"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for offset in range(0, len(keys), 500):
+                chunk = keys[offset:offset + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, skill_lemmas, profile_vector, total_experience, relevant_experience "
+                    f"FROM features WHERE key IN ({placeholders})",
+                    chunk
+                )
+                for key, skill_lemmas, profile_vector, total_exp, relevant_exp in rows:
+                    vector = np.frombuffer(profile_vector, dtype=np.float32) if profile_vector is not None else None
+                    found[key] = CandidateFeatures(skill_lemmas, vector, total_exp, relevant_exp)
+
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE features SET last_used = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, features: Dict[str, CandidateFeatures], model_version: str) -> None:
+        """Store freshly computed features"""
+        if not features:
+            return
+        now = time.time()
+        rows = []
+        for key, item in features.items():
+            vector = None
+            if item.profile_vector is not None:
+                vector = np.asarray(item.profile_vector, dtype=np.float32).tobytes()
+            rows.append((key, model_version, item.skill_lemmas, vector,
+                         item.total_experience, item.relevant_experience, now))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def evict(self, max_entries: Optional[int] = None, older_than_days: Optional[float] = None,
+              keep_model_version: Optional[str] = None) -> int:
+        """Delete stale entries, returning how many were removed
+
+        Entries from other model versions, entries unused for older_than_days
+        and the least recently used entries beyond max_entries are dropped.
+        """
+        with self._lock:
+            before = self._conn.total_changes
+            if keep_model_version is not None:
+                self._conn.execute("DELETE FROM features WHERE model_version != ?", (keep_model_version,))
+            if older_than_days is not None:
+                cutoff = time.time() - older_than_days * 86400
+                self._conn.execute("DELETE FROM features WHERE last_used < ?", (cutoff,))
+            if max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM features WHERE key NOT IN "
+                    "(SELECT key FROM features ORDER BY last_used DESC LIMIT ?)",
+                    (max_entries,)
+                )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def compact(self) -> None:
+        """Reclaim the disk space left by deleted entries"""
+        with self._lock:
+            self._conn.execute("VACUUM")
+
+    def stats(self) -> Dict:
+        """Entry count, bytes on disk and the hit rate since the store was opened"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'bytes_on_disk': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def reopen(self) -> None:
+        """Open a fresh connection in a process forked after this store was opened
+
+        The inherited connection is abandoned rather than closed: SQLite
+        connections must not be used on both sides of a fork.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Inspect, evict and compact a feature store from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain the candidate feature store")
+    parser.add_argument('path', help="path to the feature store database")
+    parser.add_argument('command', choices=['stats', 'evict', 'compact'])
+    parser.add_argument('--max-entries', type=int, default=None, help="keep at most this many entries")
+    parser.add_argument('--older-than-days', type=float, default=None, help="drop entries unused for this many days")
+    parser.add_argument('--model-version', default=None, help="drop entries computed with any other model version")
+    args = parser.parse_args()
+
+    store = FeatureStore(args.path)
+    try:
+        if args.command == 'evict':
+            removed = store.evict(args.max_entries, args.older_than_days, args.model_version)
+            print(f"Evicted {removed} entries")
+        elif args.command == 'compact':
+            before = store.stats()['bytes_on_disk']
+            store.compact()
+            print(f"Compacted {before} -> {store.stats()['bytes_on_disk']} bytes")
+        stats = store.stats()
+        print(f"Entries: {stats['entries']}, bytes on disk: {stats['bytes_on_disk']}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Matches requirements like "4+ years" or "5 yrs" in a job description
+REQUIRED_EXPERIENCE_PATTERN = re.compile(r'(\d+)\+?\s*(?:years?|yrs?)')
+DEFAULT_REQUIRED_EXPERIENCE = 3
+
+
+def hash_job_description(job_description: str) -> str:
+    """Content hash used to key compiled job descriptions"""
+    return hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+
+
+def extract_required_experience(job_description: str) -> float:
+    """Extract the required years of experience from a job description"""
+    match = REQUIRED_EXPERIENCE_PATTERN.search(job_description.lower())
+    return float(match.group(1)) if match else DEFAULT_REQUIRED_EXPERIENCE
+
+
+class JobProfile:
+    """A job description compiled once and reused for every candidate scored against it"""
+    
+    def __init__(self, text: str, content_hash: str, lemmas: str, doc, required_experience: float,
+                 skill_matcher=None, vector=None):
+        self.text = text
+        self.content_hash = content_hash
+        # Lemmatized text used for TF-IDF skill matching
+        self.lemmas = lemmas
+        # Parsed spaCy doc used for profile similarity
+        self.doc = doc
+        self.required_experience = required_experience
+        # Compiled SkillMatcher of the job description's terms and known skills
+        self.skill_matcher = skill_matcher
+        # Vector of the profile similarity backend, when it is not the doc vector
+        self._vector = vector
+    
+    @property
+    def vector(self):
+        """The job description's vector for profile similarity, by default its spaCy doc vector"""
+        return self._vector if self._vector is not None else self.doc.vector
+
+
+class JobProfileCache:
+    """Thread-safe LRU cache of compiled job descriptions keyed by content hash"""
+    
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, content_hash: str) -> Optional[JobProfile]:
+        """Return the cached profile for a hash, marking it most recently used"""
+        with self._lock:
+            profile = self._profiles.get(content_hash)
+            if profile is None:
+                self.misses += 1
+                return None
+            self._profiles.move_to_end(content_hash)
+            self.hits += 1
+            return profile
+    
+    def put(self, profile: JobProfile) -> None:
+        """Store a compiled profile, evicting the least recently used one when full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._profiles[profile.content_hash] = profile
+            self._profiles.move_to_end(profile.content_hash)
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every cached profile"""
+        with self._lock:
+            self._profiles.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._profiles),
+                'maxsize': self.maxsize
+            }
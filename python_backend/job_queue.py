@@ -0,0 +1,497 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+# Progress is written to the job table at most this often
+PROGRESS_PERSIST_INTERVAL = 1.0
+
+# Finished jobs are dropped this many seconds after they finish (from the job table too)
+FINISHED_JOB_TTL = 24 * 3600.0
+# Finished jobs (and their results) kept in memory; with a job table older ones are read back from it
+MAX_FINISHED_JOBS = 1000
+# Expired rows are deleted from the job table at most this often
+PURGE_INTERVAL = 60.0
+
+# A running job in the job table belongs to the process that claimed it for this many
+# seconds; the owner renews the lease every tenth of that, and another process only
+# picks the job up again once the lease has run out (its owner died or hung)
+JOB_LEASE = 30.0
+# Seconds a worker thread waits for new jobs before looking at the job table again
+JOB_POLL_INTERVAL = 1.0
+# Seconds to wait for another process's write lock on the job table
+LOCK_TIMEOUT = 60.0
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback to stop a cancelled job"""
+
+
+class Job:
+    """One queued analysis request and its outcome"""
+
+    def __init__(self, job_id: str, data: Optional[Dict], options: Dict, status: str = QUEUED,
+                 created_at: Optional[float] = None):
+        self.id = job_id
+        self.data = data
+        self.options = options
+        self.status = status
+        self.done = 0
+        self.total = len(data.get('resumes', [])) if data else 0
+        self.results = None
+        self.error = None
+        self.created_at = created_at or time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.progress_saved_at = 0.0
+
+    def to_status(self) -> Dict:
+        """Status payload returned by the API"""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': {
+                'done': self.done,
+                'total': self.total,
+                'percent': round(100 * self.done / self.total, 1) if self.total else 0.0
+            },
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobTable:
+    """SQLite job table shared by every process that opens the same file
+
+    It is the queue and the record of every job: a process claims a queued
+    job atomically under the database's write lock, holds it with a lease it
+    keeps renewing, and only writes a job it owns. Jobs survive restarts.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=LOCK_TIMEOUT, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                data TEXT,
+                options TEXT NOT NULL,
+                done INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                results TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner TEXT,
+                lease_until REAL,
+                cancel_requested INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # Ownership columns, added after the first job tables were created
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in (('owner', 'TEXT'), ('lease_until', 'REAL'),
+                                   ('cancel_requested', 'INTEGER NOT NULL DEFAULT 0')):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._conn.commit()
+
+    def insert(self, job: Job) -> None:
+        """Store a new job with its payload, which is written only this once"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, data, options, done, total, results, error, created_at, started_at, "
+                "finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.status,
+                 json.dumps(job.data) if job.data is not None else None,
+                 json.dumps(job.options), job.done, job.total, None,
+                 job.error, job.created_at, job.started_at, job.finished_at)
+            )
+            self._conn.commit()
+
+    def claim(self, owner: str, now: float, lease: float) -> Optional[Job]:
+        """Take the oldest queued job, or a running one whose lease ran out, and mark it running for owner
+
+        A running job whose lease ran out after a cancel was requested is
+        cancelled instead of run again.
+        """
+        expired = "status = ? AND (lease_until IS NULL OR lease_until < ?)"
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                f"UPDATE jobs SET status = ?, finished_at = ?, data = NULL, lease_until = NULL "
+                f"WHERE cancel_requested = 1 AND {expired}",
+                (CANCELLED, now, RUNNING, now)
+            )
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE status = ? OR ({expired}) ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            # Interrupted runs start again from the beginning
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, done = 0, started_at = ? WHERE id = ?",
+                (RUNNING, owner, now + lease, now, row[0])
+            )
+        job = self._job(row)
+        job.status = RUNNING
+        job.done = 0
+        job.started_at = now
+        return job
+
+    def renew(self, owner: str, lease_until: float) -> List[str]:
+        """Extend the leases of owner's running jobs, returning the ids of those asked to cancel"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = ?",
+                               (lease_until, owner, RUNNING))
+            rows = self._conn.execute("SELECT id FROM jobs WHERE owner = ? AND status = ? AND cancel_requested = 1",
+                                      (owner, RUNNING)).fetchall()
+        return [row[0] for row in rows]
+
+    def save_progress(self, job: Job, owner: str) -> None:
+        """Update only the progress counter of a job owner is running"""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET done = ? WHERE id = ? AND owner = ?", (job.done, job.id, owner))
+            self._conn.commit()
+
+    def finish(self, job: Job, owner: str) -> bool:
+        """Record the outcome of a job owner ran, its results replacing the payload
+
+        Returns False, writing nothing, when the job is no longer owner's
+        because its lease ran out and another process took it over.
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, done = ?, total = ?, error = ?, finished_at = ?, results = ?, "
+                "data = NULL, lease_until = NULL WHERE id = ? AND owner = ? AND status = ?",
+                (job.status, job.done, job.total, job.error, job.finished_at,
+                 json.dumps(job.results) if job.results is not None else None, job.id, owner, RUNNING)
+            ).rowcount == 1
+
+    def cancel(self, job_id: str, now: float) -> bool:
+        """Cancel a queued job, or ask the owner of a running one to stop; False if the job is unknown
+
+        A running job whose lease ran out has no live owner, so it is cancelled
+        right away.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute("SELECT status, lease_until FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return False
+            status, lease_until = row
+            if status == QUEUED or (status == RUNNING and (lease_until is None or lease_until < now)):
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, data = NULL, lease_until = NULL WHERE id = ?",
+                    (CANCELLED, now, job_id)
+                )
+            elif status == RUNNING:
+                self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+        return True
+
+    _COLUMNS = "id, status, data, options, done, total, error, created_at, started_at, finished_at"
+    # Without the request payload, which a status read does not need
+    _STATUS_COLUMNS = _COLUMNS.replace('data', 'NULL')
+
+    def load(self, job_id: str) -> Optional[Job]:
+        """One stored job without its payload and results (those are loaded on demand), or None"""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    @staticmethod
+    def _job(row) -> Job:
+        job_id, status, data, options, done, total, error, created_at, started_at, finished_at = row
+        job = Job(job_id, json.loads(data) if data else None, json.loads(options), status, created_at)
+        job.done = done
+        job.total = total
+        job.error = error
+        job.started_at = started_at
+        job.finished_at = finished_at
+        return job
+
+    def load_results(self, job_id: str) -> Optional[List[Dict]]:
+        """Results of a finished job"""
+        with self._lock:
+            row = self._conn.execute("SELECT results FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def delete_finished(self, before: float) -> int:
+        """Delete jobs that finished before a time, returning how many"""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (before,)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class JobManager:
+    """Job queue served by a pool of analyzer worker threads
+
+    Jobs run analyze_candidates on the shared analyzer, which get_analyzer
+    returns (and may create on first use); progress comes from its
+    progress callback, which is also where cancellation takes effect.
+
+    Without a db_path jobs live in this process only. With one, the job
+    table is the queue and the source of truth: every process that opens it
+    (the workers of serve.py, or a restarted server) sees every job, claims
+    queued ones atomically and holds a running one with a lease it renews
+    every lease / 10 seconds, which is also when it picks up cancellations
+    requested through another process. A job whose lease runs out, because
+    its process died, is run again from the start by whichever process
+    claims it next; one with a live owner never is.
+
+    Finished jobs are forgotten finished_ttl seconds after they finish. At
+    most max_finished of them stay in memory; with a db_path older ones are
+    read back from the job table until they expire, without one they are
+    gone.
+    """
+
+    def __init__(self, get_analyzer: Callable, workers: int = 2, db_path: Optional[str] = None,
+                 finished_ttl: float = FINISHED_JOB_TTL, max_finished: int = MAX_FINISHED_JOBS,
+                 lease: float = JOB_LEASE):
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        if max_finished < 0:
+            raise ValueError("max_finished must not be negative")
+        if lease <= 0:
+            raise ValueError("lease must be positive")
+        self.get_analyzer = get_analyzer
+        self.table = JobTable(db_path) if db_path else None
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self.lease = lease
+        # Identifies this manager's leases in the job table
+        self.owner = uuid.uuid4().hex
+        # Jobs of this process: all of them without a job table, the ones it ran with one
+        self._jobs = {}
+        # Finished job ids in the order they finished -> finish time
+        self._finished = OrderedDict()
+        self._purged_at = 0.0
+        self._lock = threading.Lock()
+        # Job ids to run without a job table; with one only a wake-up call to claim from it
+        self._queue = queue.Queue()
+        self._stopping = threading.Event()
+
+        self._threads = [
+            threading.Thread(target=self._work, name=f"analysis-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        if self.table:
+            self._threads.append(threading.Thread(target=self._renew_leases, name="job-leases", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, data: Dict, options: Optional[Dict] = None) -> Dict:
+        """Queue an analysis request and return its status"""
+        job = Job(uuid.uuid4().hex, data, options or {})
+        if self.table:
+            self.table.insert(job)
+        else:
+            with self._lock:
+                self._jobs[job.id] = job
+        self._queue.put(job.id)
+        return job.to_status()
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Status and progress of a job, or None if it is unknown"""
+        job = self._get(job_id)
+        return job.to_status() if job else None
+
+    def results(self, job_id: str, page: int = 1, page_size: int = 50) -> Optional[Dict]:
+        """One page of a job's ranked results, or None if the job is unknown"""
+        job = self._get(job_id)
+        if job is None:
+            return None
+
+        results = job.results
+        if results is None and job.status == COMPLETED and self.table:
+            # Kept in memory when this process ran the job, read from the table otherwise
+            local = self._jobs.get(job_id)
+            results = local.results if local is not None else None
+            if results is None:
+                results = self.table.load_results(job_id)
+        results = results or []
+
+        start = (page - 1) * page_size
+        return {
+            'job_id': job.id,
+            'status': job.status,
+            'page': page,
+            'page_size': page_size,
+            'total_results': len(results),
+            'results': results[start:start + page_size]
+        }
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued or running job, returning its status or None if unknown"""
+        if self.table:
+            if self._get(job_id) is None or not self.table.cancel(job_id, time.time()):
+                return None
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == RUNNING:
+                    # Running here: stop at the next progress call instead of the next lease renewal
+                    job.cancel_requested = True
+            return self.status(job_id)
+
+        job = self._get(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+            elif job.status == RUNNING:
+                # Picked up by the progress callback of the running analysis
+                job.cancel_requested = True
+        return job.to_status()
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once their current job is done"""
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self.table:
+            self.table.close()
+
+    def _work(self) -> None:
+        """Worker thread loop"""
+        while True:
+            job = self._claim_from_table() if self.table else self._claim_from_queue()
+            if job is None:
+                return
+            self._run(job)
+
+    def _claim_from_queue(self) -> Optional[Job]:
+        """The next queued job of this process, marked running, or None on shutdown"""
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return None
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started_at = time.time()
+                return job
+
+    def _claim_from_table(self) -> Optional[Job]:
+        """The next job claimed from the job table, or None on shutdown
+
+        Besides the wake-up call of a submission here, the table is polled for
+        jobs submitted through other processes and ones whose lease ran out.
+        """
+        while not self._stopping.is_set():
+            job = self.table.claim(self.owner, time.time(), self.lease)
+            if job is not None:
+                with self._lock:
+                    self._jobs[job.id] = job
+                return job
+            try:
+                if self._queue.get(timeout=JOB_POLL_INTERVAL) is None:
+                    return None
+            except queue.Empty:
+                pass
+        return None
+
+    def _renew_leases(self) -> None:
+        """Lease thread loop: keep this process's running jobs and pass on cancellations"""
+        while not self._stopping.wait(self.lease / 10):
+            try:
+                cancelled = self.table.renew(self.owner, time.time() + self.lease)
+            except sqlite3.Error as e:
+                # Retried at the next renewal, well before the lease runs out
+                print(f"Could not renew job leases: {e}")
+                continue
+            with self._lock:
+                for job_id in cancelled:
+                    job = self._jobs.get(job_id)
+                    if job is not None:
+                        job.cancel_requested = True
+
+    def _run(self, job: Job) -> None:
+        """Run one job to completion, failure or cancellation"""
+        def progress(done: int, total: int) -> None:
+            job.done = done
+            job.total = total
+            if job.cancel_requested:
+                raise JobCancelled()
+            now = time.time()
+            if self.table and now - job.progress_saved_at >= PROGRESS_PERSIST_INTERVAL:
+                job.progress_saved_at = now
+                self.table.save_progress(job, self.owner)
+
+        try:
+            job.results = self.get_analyzer().analyze_candidates(job.data, progress=progress, **job.options)
+            status = COMPLETED
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+
+        with self._lock:
+            self._finish(job, status)
+
+    def _get(self, job_id: str) -> Optional[Job]:
+        """A job from the job table, which every process shares, or from memory without one"""
+        if not self.table:
+            return self._jobs.get(job_id)
+        job = self.table.load(job_id)
+        if job is not None and job.finished_at is not None and time.time() - job.finished_at > self.finished_ttl:
+            # Expired, only not purged yet
+            job = None
+        return job
+
+    def _finish(self, job: Job, status: str) -> None:
+        """Record the final status, drop the request payload and evict expired jobs"""
+        job.status = status
+        job.finished_at = time.time()
+        if status == COMPLETED:
+            job.done = job.total
+        job.data = None
+        if self.table and not self.table.finish(job, self.owner):
+            # Its lease ran out and another process runs it now; that outcome is the one recorded
+            self._jobs.pop(job.id, None)
+        if job.id in self._jobs:
+            self._finished[job.id] = job.finished_at
+        self._evict(job.finished_at)
+
+    def _evict(self, now: float) -> None:
+        """Forget finished jobs past their TTL or beyond max_finished; called with the lock held"""
+        cutoff = now - self.finished_ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and finished_at >= cutoff:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+        if self.table and now - self._purged_at >= PURGE_INTERVAL:
+            self._purged_at = now
+            self.table.delete_finished(cutoff)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Load test of the API server: requests/sec, latency and memory per process
+Starts each server under test (the dev server, `python api_server.py`, and the
+production one, `python serve.py`), warms it up, then keeps --concurrency
+clients posting /analyze requests of --resumes synthetic resumes for
+--duration seconds, with the result cache off unless --result-cache (which also
+needs RESUME_SKILL_VOCABULARY). Memory
+comes from /proc for the server and its child processes (Linux only). RSS
+counts shared pages in every process that maps them; PSS divides them between
+those processes, so PSS per worker shows what sharing the preloaded model
+copy-on-write saves.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from synthetic_resumes import generate_pool
+
+MODES = ('dev', 'serve')
+
+
+def server_command(mode: str, workers: int, threads: int) -> List[str]:
+    """Command line of a server mode"""
+    if mode == 'dev':
+        return [sys.executable, 'api_server.py']
+    return [sys.executable, 'serve.py', '--workers', str(workers), '--threads', str(threads)]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 120) -> None:
+    """Poll /health until the server answers"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"server did not answer within {timeout:.0f}s")
+
+
+def post(url: str, body: bytes) -> float:
+    """POST one analysis request, returning its latency in seconds"""
+    request = urllib.request.Request(f"{url}/analyze", data=body, headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=600) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run_load(url: str, body: bytes, concurrency: int, duration: float) -> Dict:
+    """Keep concurrency clients busy for duration seconds"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < stop_at:
+            try:
+                latency = post(url, body)
+                with lock:
+                    latencies.append(latency)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_sec': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000 if latencies else None,
+        'p95_ms': float(np.percentile(latencies, 95)) * 1000 if latencies else None,
+        'first_error': errors[0] if errors else None
+    }
+
+
+def process_tree(pid: int) -> List[int]:
+    """A process and all of its descendants"""
+    pids = [pid]
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children", 'r') as f:
+                for child in f.read().split():
+                    pids.extend(process_tree(int(child)))
+        except OSError:
+            continue
+    return pids
+
+
+def process_memory(pid: int) -> Optional[Dict[str, float]]:
+    """RSS and PSS of one process in MB"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return None
+    value = lambda name: int(fields.get(name, '0 kB').split()[0]) / 1024
+    return {'rss_mb': value('Rss'), 'pss_mb': value('Pss')}
+
+
+def server_memory(pid: int) -> Dict:
+    """Memory of a server's processes, the largest one counted as a worker"""
+    usage = [memory for memory in map(process_memory, process_tree(pid)) if memory]
+    if not usage:
+        return {}
+    return {
+        'processes': len(usage),
+        'rss_total_mb': sum(memory['rss_mb'] for memory in usage),
+        'pss_total_mb': sum(memory['pss_mb'] for memory in usage),
+        'rss_max_mb': max(memory['rss_mb'] for memory in usage),
+        'pss_max_mb': max(memory['pss_mb'] for memory in usage),
+    }
+
+
+def test_mode(mode: str, args, body: bytes, warm_up: bytes) -> Dict:
+    """Start one server, load it and stop it"""
+    port = args.port
+    url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, 'PORT': str(port)}
+    if not args.result_cache:
+        # Every client sends the same body, which the result cache would answer without scoring
+        env['RESUME_RESULT_CACHE_SIZE'] = '0'
+    process = subprocess.Popen(server_command(mode, args.workers, args.threads), env=env,
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        wait_until_ready(url, process)
+        # The dev server loads the model on its first analysis; every worker gets a few requests
+        for _ in range(max(args.workers, 1) * 2):
+            post(url, warm_up)
+        result = run_load(url, body, args.concurrency, args.duration)
+        result.update(server_memory(process.pid))
+        return result
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the dev server and serve.py under concurrent load")
+    parser.add_argument('--modes', default=','.join(MODES), help="comma-separated subset of " + ', '.join(MODES))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="serve.py worker processes")
+    parser.add_argument('--threads', type=int, default=4, help="serve.py threads per worker")
+    parser.add_argument('--concurrency', type=int, default=8, help="concurrent clients")
+    parser.add_argument('--duration', type=float, default=30, help="seconds of load per server")
+    parser.add_argument('--resumes', type=int, default=50, help="resumes per request")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic resumes")
+    parser.add_argument('--result-cache', action='store_true',
+                        help="keep the servers' result cache on (needs RESUME_SKILL_VOCABULARY)")
+    parser.add_argument('--port', type=int, default=5055, help="port the servers under test listen on")
+    parser.add_argument('--output', default=None, help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    pool = generate_pool(args.resumes, args.seed)
+    body = json.dumps({**pool, 'fields': []}).encode('utf-8')
+    warm_up = json.dumps({**pool, 'resumes': pool['resumes'][:5], 'fields': []}).encode('utf-8')
+
+    print(f"{'server':<28} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7} {'procs':>6} "
+          f"{'RSS MB':>8} {'PSS MB':>8} {'PSS/worker':>11}")
+    results = {}
+    for mode in modes:
+        name = 'dev (api_server.py)' if mode == 'dev' else f"serve.py {args.workers}x{args.threads}"
+        try:
+            result = results[mode] = test_mode(mode, args, body, warm_up)
+        except Exception as e:
+            print(f"{name:<28} failed: {e}")
+            continue
+        fmt = lambda value, spec: format(value, spec) if value is not None else '-'
+        print(f"{name:<28} {result['requests_per_sec']:>8.2f} {fmt(result['p50_ms'], '>9.0f')} "
+              f"{fmt(result['p95_ms'], '>9.0f')} {result['errors']:>7} {result.get('processes', '-'):>6} "
+              f"{fmt(result.get('rss_total_mb'), '>8.0f')} {fmt(result.get('pss_total_mb'), '>8.0f')} "
+              f"{fmt(result.get('pss_max_mb'), '>11.0f')}")
+        if result['first_error']:
+            print(f"  first error: {result['first_error']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
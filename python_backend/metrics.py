@@ -0,0 +1,289 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format
+Counters and histograms are kept per process and are thread-safe; the API
+server exposes them on /metrics. Analysis stages are timed per call, so a
+stage histogram shows how long that stage took for a whole batch. Forked
+server workers (serve.py) share a directory: each one writes a snapshot of
+its metrics there and /metrics renders the sum of every snapshot.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds between snapshots a worker writes to the shared directory
+PUBLISH_INTERVAL = 1.0
+
+# Per-call stage durations range from milliseconds to minutes for very large pools
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple = ()) -> str:
+    """{name="value",...} with Prometheus escaping, or nothing without labels"""
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _escape(value) -> str:
+    """Escape a label value: backslashes, double quotes and newlines"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    """Integers without a decimal point, infinity as Prometheus spells it"""
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value of one label combination"""
+        with self._lock:
+            return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def snapshot(self) -> Dict[Tuple, float]:
+        """Copy of the value of every label combination"""
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, total: Dict[Tuple, float], values: Dict[Tuple, float]) -> None:
+        """Add the snapshot of another process to total"""
+        for key, value in values.items():
+            total[key] = total.get(key, 0) + value
+
+    def samples(self, values: Optional[Dict[Tuple, float]] = None) -> List[str]:
+        values = sorted((self.snapshot() if values is None else values).items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum and count, optionally split by labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # Per label combination: [count per bucket..., sum, count]
+        self._values: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels) -> int:
+        """Number of observations of one label combination"""
+        with self._lock:
+            state = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+            return state[-1] if state else 0
+
+    def snapshot(self) -> Dict[Tuple, List[float]]:
+        """Copy of the bucket counts, sum and count of every label combination"""
+        with self._lock:
+            return {key: list(state) for key, state in self._values.items()}
+
+    def merge(self, total: Dict[Tuple, List[float]], values: Dict[Tuple, List[float]]) -> None:
+        """Add the snapshot of another process to total"""
+        for key, state in values.items():
+            if len(state) != len(self.buckets) + 2:
+                continue  # written with other buckets
+            current = total.get(key)
+            total[key] = list(state) if current is None else [a + b for a, b in zip(current, state)]
+
+    def samples(self, values: Optional[Dict[Tuple, List[float]]] = None) -> List[str]:
+        values = sorted((self.snapshot() if values is None else values).items())
+        lines = []
+        for key, state in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, (('le', _format_value(bound)),))} "
+                             f"{cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of this process, optionally shared with sibling processes through a directory"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._directory = None
+        self._snapshot_path = None
+        self._published = None
+        self._publish_lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = STAGE_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def share(self, directory: str, interval: float = PUBLISH_INTERVAL) -> None:
+        """Publish this process's metrics to directory every interval seconds and render the sum over it
+
+        Call it in each forked worker: the snapshot file is named after this
+        process, and the publishing thread does not survive a fork. Snapshots of
+        workers that have exited stay in the directory, so counters never go back.
+        """
+        self._directory = directory
+        # Unique per process start, so a reused pid never overwrites a dead worker's totals
+        self._snapshot_path = os.path.join(directory, f"metrics-{os.getpid()}-{uuid.uuid4().hex}.json")
+        self._published = None
+        self._publish_lock = threading.Lock()
+        self.publish()
+
+        def publish_periodically():
+            while True:
+                time.sleep(interval)
+                self.publish()
+
+        threading.Thread(target=publish_periodically, name='metrics-publisher', daemon=True).start()
+
+    def publish(self) -> None:
+        """Write this process's snapshot to the shared directory if it changed (no-op when not shared)"""
+        if self._directory is None:
+            return
+        with self._publish_lock:
+            with self._lock:
+                metrics = list(self._metrics.values())
+            snapshot = json.dumps({metric.name: [[list(key), value] for key, value in metric.snapshot().items()]
+                                   for metric in metrics}, sort_keys=True)
+            if snapshot == self._published:
+                return
+            # Written aside and renamed, so a reader never sees half a snapshot
+            temporary = self._snapshot_path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(temporary, self._snapshot_path)
+            self._published = snapshot
+
+    def _shared_values(self, metrics) -> Dict[str, Dict]:
+        """Sum of the snapshots of every process in the shared directory"""
+        self.publish()
+        totals = {metric.name: {} for metric in metrics}
+        for path in glob.glob(os.path.join(self._directory, 'metrics-*.json')):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for metric in metrics:
+                values = {tuple(key): value for key, value in snapshot.get(metric.name, ())}
+                metric.merge(totals[metric.name], values)
+        return totals
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text format (version 0.0.4), summed over processes when shared"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        shared = self._shared_values(metrics) if self._directory is not None else {}
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples(shared.get(metric.name)))
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+STAGE_SECONDS = METRICS.histogram(
+    'resume_stage_seconds', "Time spent in each analysis stage per call", ['stage'])
+CANDIDATES_SCORED = METRICS.counter(
+    'resume_candidates_scored_total', "Candidate x job description scores computed")
+FALLBACKS = METRICS.counter(
+    'resume_fallbacks_total', "Scores that fell back to a default instead of failing", ['kind'])
+RESULT_CACHE = METRICS.counter(
+    'resume_result_cache_total', "Result cache lookups by outcome", ['outcome'])
+DUPLICATE_CANDIDATES = METRICS.counter(
+    'resume_duplicate_candidates_total', "Candidates whose NLP work was shared with an identical one in the batch")
+PARTIAL_CANDIDATES = METRICS.counter(
+    'resume_partial_candidates_total', "Candidates scored without profile fit and reasoning to meet a deadline")
+REQUEST_CANDIDATES = METRICS.histogram(
+    'resume_request_candidates', "Candidates per API request", ['endpoint'], SIZE_BUCKETS)
+REQUEST_BYTES = METRICS.histogram(
+    'resume_request_bytes', "Body size of API requests", ['endpoint'], BYTES_BUCKETS)
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of a block in the stage histogram"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=stage)
+
+
+class ProgressLogger:
+    """Reports progress at most once per interval instead of once per candidate"""
+
+    def __init__(self, total: int, label: str = "Analyzed", interval: float = 5.0,
+                 write: Callable[[str], None] = print):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.write = write
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def update(self, done: int) -> None:
+        """Report done/total when the interval has passed or the work is complete"""
+        now = time.perf_counter()
+        if done < self.total and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = now - self.started
+        rate = done / elapsed if elapsed > 0 else 0
+        self.write(f"{self.label} {done}/{self.total} candidates ({rate:.1f} candidates/sec)")
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# Analyzer owned by each worker process, built once by _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(analyzer_options: Dict) -> None:
+    """Load the spaCy model once per worker process"""
+    global _worker_analyzer
+    from resume_analyzer import ResumeAnalyzer
+    _worker_analyzer = ResumeAnalyzer(**analyzer_options)
+
+
+def _extract_shard(shard: List[Dict], batch_size: Optional[int]):
+    """Worker task: run the NLP work for one shard"""
+    return _worker_analyzer._extract_uncached(shard, batch_size, None)
+
+
+def shard_bounds(total: int, workers: int, shards_per_worker: int = 4) -> List[range]:
+    """Split candidate indexes into contiguous shards, a few per worker for load balancing"""
+    shard_count = max(1, min(total, workers * shards_per_worker))
+    size, remainder = divmod(total, shard_count)
+    bounds = []
+    start = 0
+    for i in range(shard_count):
+        end = start + size + (1 if i < remainder else 0)
+        bounds.append(range(start, end))
+        start = end
+    return bounds
+
+
+class ParallelRunner:
+    """Process pool that shards candidates across workers with their own spaCy model
+    
+    Workers only run the NLP work (lemmas, profile vectors, parsed experience);
+    the parent scores the merged features so the TF-IDF vocabulary is still
+    fitted once over the whole batch and scores match the single-process path.
+    Features come back in input order.
+    """
+    
+    def __init__(self, workers: int, analyzer_options: Optional[Dict] = None):
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(analyzer_options or {},)
+        )
+    
+    def extract(self, candidates: List[Dict], batch_size: Optional[int] = None,
+                progress: Optional[Callable[[int, int], None]] = None):
+        """Extract features across the pool, returning them in input order with per-candidate errors"""
+        bounds = shard_bounds(len(candidates), self.workers)
+        shards = [candidates[shard.start:shard.stop] for shard in bounds]
+        
+        features = []
+        errors = {}
+        for shard, (shard_features, shard_errors) in zip(bounds, self.executor.map(_extract_shard, shards, [batch_size] * len(shards))):
+            features.extend(shard_features)
+            for i, error in shard_errors.items():
+                errors[shard.start + i] = error
+            if progress:
+                progress(shard.stop, len(candidates))
+        return features, errors
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        self.executor.shutdown(wait=True)
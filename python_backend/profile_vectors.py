@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Profile similarity backends
+A backend turns profile texts and job descriptions into vectors whose cosine
+similarity is the profile fit. The spaCy backend uses Doc.vector (the context
+tensor for models without word vectors); the static backend averages rows of
+a word-embedding table memory-mapped from a .npy file, so worker processes
+share one copy of it through the page cache.
+"""
+
+import abc
+import hashlib
+import json
+import os
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Lowercase word tokens, keeping names like "c++", "c#" and "node.js" whole
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.+#'-]+[a-z0-9]+)*[+#]*")
+# Alphanumeric parts tried when a whole token is not in the table
+PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class ProfileBackend(abc.ABC):
+    """Maps texts to the vectors compared for profile similarity"""
+
+    # Short identifier stored with features, indexes and pools computed by the backend
+    version = ''
+    # Whether vectors come from spaCy docs, which the batched path then parses in its own stream
+    uses_docs = False
+
+    @abc.abstractmethod
+    def vectors(self, texts: Sequence[str], batch_size: int = 256) -> np.ndarray:
+        """One vector per text, as a len(texts) x dimensions matrix"""
+
+    def vector(self, text: str, doc=None) -> np.ndarray:
+        """The vector of a single text; backends built on spaCy reuse an already parsed doc"""
+        return self.vectors([text])[0]
+
+
+class SpacyProfileBackend(ProfileBackend):
+    """spaCy Doc.vector of each text, the original profile similarity"""
+
+    uses_docs = True
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+
+    def vectors(self, texts: Sequence[str], batch_size: int = 256) -> np.ndarray:
+        return np.stack([doc.vector for doc in self.nlp.pipe(texts, batch_size=batch_size)])
+
+    def vector(self, text: str, doc=None) -> np.ndarray:
+        return (doc if doc is not None else self.nlp(text)).vector
+
+    def doc_vector(self, doc) -> np.ndarray:
+        """The vector of an already parsed doc"""
+        return doc.vector
+
+
+class StaticVectorBackend(ProfileBackend):
+    """Average of static word vectors from a memory-mapped embedding table
+
+    The table directory holds vectors.npy (words x dimensions, float32),
+    vocab.txt (one word per line, in row order) and meta.json. Words missing
+    from the table are skipped; a text with no known word gets a zero vector
+    and so a similarity of 0.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        # Read-only mapping: pages are loaded on demand and shared by every process using the table
+        self.table = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        with open(os.path.join(path, 'vocab.txt'), 'r', encoding='utf-8') as f:
+            self.rows = {word: row for row, word in enumerate(f.read().split('\n')) if word}
+        self.version = f"static-{self.meta['checksum'][:12]}"
+
+    @property
+    def dimensions(self) -> int:
+        return self.table.shape[1]
+
+    def token_rows(self, text: str) -> List[int]:
+        """Table rows of the known words of a text"""
+        rows = []
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            row = self.rows.get(token)
+            if row is not None:
+                rows.append(row)
+            elif not token.isalnum():
+                rows.extend(self.rows[part] for part in PART_PATTERN.findall(token) if part in self.rows)
+        return rows
+
+    def vectors(self, texts: Sequence[str], batch_size: int = 256) -> np.ndarray:
+        token_rows = [self.token_rows(text) for text in texts]
+        counts = np.array([len(rows) for rows in token_rows])
+        result = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        known = np.flatnonzero(counts)
+        if len(known):
+            # One gather from the table and one segmented sum for the whole batch
+            gathered = self.table[np.fromiter((row for rows in token_rows for row in rows), dtype=np.int64)]
+            starts = np.concatenate(([0], np.cumsum(counts[known])[:-1]))
+            result[known] = np.add.reduceat(gathered, starts, axis=0) / counts[known, None]
+        return result
+
+
+def load_profile_backend(nlp, vectors_path: Optional[str] = None) -> ProfileBackend:
+    """The static backend for an embedding table directory, else spaCy's doc vectors"""
+    return StaticVectorBackend(vectors_path) if vectors_path else SpacyProfileBackend(nlp)
+
+
+def build_table(source: str, path: str, max_words: Optional[int] = None) -> dict:
+    """Convert a word2vec/GloVe text file ("word v1 v2 ...") into a memory-mappable table
+
+    Keeps the first occurrence of each lowercased word and at most max_words
+    words; frequency-sorted files such as GloVe keep their most common words.
+    """
+    words = []
+    seen = set()
+    vectors = []
+    dimensions = None
+    with open(source, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            parts = line.rstrip().split(' ')
+            if dimensions is None and len(parts) == 2 and all(part.isdigit() for part in parts):
+                # word2vec header: "<words> <dimensions>"
+                continue
+            word = parts[0].lower()
+            if not word or word in seen:
+                continue
+            if dimensions is None:
+                dimensions = len(parts) - 1
+            if len(parts) - 1 != dimensions:
+                continue
+            seen.add(word)
+            words.append(word)
+            vectors.append(np.asarray(parts[1:], dtype=np.float32))
+            if max_words and len(words) >= max_words:
+                break
+    if not words:
+        raise ValueError(f"No word vectors found in {source}")
+    return write_table(np.stack(vectors), words, path, os.path.basename(source))
+
+
+def write_table(table: np.ndarray, words: List[str], path: str, source: str = '') -> dict:
+    """Save a words x dimensions float32 table and its vocabulary as a table directory"""
+    os.makedirs(path, exist_ok=True)
+    table = np.ascontiguousarray(table, dtype=np.float32)
+    np.save(os.path.join(path, 'vectors.npy'), table)
+    with open(os.path.join(path, 'vocab.txt'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(words))
+    checksum = hashlib.sha256(table)
+    checksum.update('\n'.join(words).encode('utf-8'))
+    meta = {
+        'words': len(words),
+        'dimensions': int(table.shape[1]),
+        'source': source,
+        'checksum': checksum.hexdigest()
+    }
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def main():
+    """Build or inspect a static word-vector table"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or inspect a memory-mapped word-vector table")
+    parser.add_argument('path', help="table directory")
+    parser.add_argument('command', choices=['build', 'stats'])
+    parser.add_argument('--source', default=None, help="word2vec/GloVe text file to convert (build)")
+    parser.add_argument('--max-words', type=int, default=None, help="keep at most this many words (build)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        if not args.source:
+            parser.error("build needs --source")
+        meta = build_table(args.source, args.path, args.max_words)
+    else:
+        meta = StaticVectorBackend(args.path).meta
+    print(json.dumps(meta, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Bounded LRU + TTL cache of finished candidate scores and reasoning
+Entries are keyed by a hash of everything a result depends on: the
+candidate fields behind its features and reasoning, the job description and
+a scoring version (model, skill vocabulary, alias table, overlap weight), so
+a hit is exactly what scoring the candidate again would produce. That needs
+a standing skill vocabulary: one fitted per batch changes every candidate's
+skill score whenever any resume in the batch changes.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Bump when scores or reasoning change for the same inputs, so cached results are not reused
+RESULT_VERSION = 1
+
+# (component and total scores, reasoning); reasoning is None until a result needs it
+CachedResult = Tuple[Dict, Optional[str]]
+
+
+def result_key(feature_key: str, candidate: Dict, job_hash: str, scoring_version: str) -> str:
+    """Hash of a candidate's feature inputs, the name in its reasoning, the job description and the scoring version"""
+    payload = json.dumps([
+        RESULT_VERSION,
+        scoring_version,
+        job_hash,
+        feature_key,
+        candidate.get('firstName', ''),
+        candidate.get('lastName', '')
+    ], default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries also expire ttl seconds after they were stored"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        # key -> (stored at, result)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, CachedResult]:
+        """Results of the keys that are cached and fresh, marking them most recently used"""
+        found = {}
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl and now - entry[0] > self.ttl:
+                    del self._entries[key]
+                    self.expired += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found[key] = entry[1]
+        return found
+
+    def put_many(self, results: Dict[str, CachedResult]) -> None:
+        """Store results, evicting the least recently used ones when full"""
+        if self.maxsize <= 0 or not results:
+            return
+        now = self.clock()
+        with self._lock:
+            for key, result in results.items():
+                self._entries[key] = (now, result)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, hit rate and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl
+            }
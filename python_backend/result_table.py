@@ -0,0 +1,112 @@
+"""
+Ranked analysis results stored as columns
+A ResultTable keeps scores and candidate positions as NumPy arrays and the
+reasoning as one list of strings, and references the caller's candidate
+records instead of copying them. Result dicts in the usual layout are built
+one at a time when the table is iterated or serialized, so a large batch
+never holds one dict per candidate unless a list is asked for.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+FALLBACK_SCORE = 50
+FALLBACK_REASONING = "Analysis completed with basic scoring due to processing constraints."
+
+
+def result_record(candidate: Dict, score: int, reasoning: str, fields: Optional[List[str]] = None) -> Dict:
+    """Assemble the result record returned for one candidate
+
+    fields selects the candidate attributes echoed back under 'candidate':
+    None echoes the whole record and an empty list leaves it out.
+    """
+    result = {
+        'candidateId': candidate.get('candidateId'),
+        'name': f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}".strip(),
+        'score': score,
+        'skills': candidate.get('skills', ''),
+        'experience': candidate.get('totalExperience', ''),
+        'reasoning': reasoning
+    }
+    if fields is None:
+        result['candidate'] = candidate
+    elif fields:
+        result['candidate'] = {field: candidate[field] for field in fields if field in candidate}
+    return result
+
+
+class ResultTable:
+    """Scores, reasoning and candidate references of an analysis, one row per kept candidate"""
+
+    __slots__ = ('candidates', 'index', 'scores', 'reasoning', 'partial', 'partial_total', 'fields')
+
+    def __init__(self, candidates: Sequence[Dict], index: np.ndarray, scores: np.ndarray,
+                 reasoning: List[Optional[str]], fields: Optional[List[str]] = None,
+                 partial: Optional[np.ndarray] = None):
+        # The analyzed candidate records, referenced rather than copied
+        self.candidates = candidates
+        # Position in candidates of each row
+        self.index = np.asarray(index, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.int32)
+        # Reasoning of each row; None marks a fallback result
+        self.reasoning = reasoning
+        # Per-row flag of results scored without profile fit and reasoning (deadline analyses only)
+        self.partial = partial
+        # Partial candidates of the whole analysis, kept as rows or not (set by deadline analyses)
+        self.partial_total = None
+        self.fields = fields
+
+    @classmethod
+    def from_entries(cls, candidates: Sequence[Dict], entries: List[tuple], fields: Optional[List[str]] = None,
+                     partial: bool = False) -> 'ResultTable':
+        """Build a table from (candidate index, score, reasoning[, partial]) entries"""
+        return cls(
+            candidates,
+            np.fromiter((entry[0] for entry in entries), dtype=np.int64, count=len(entries)),
+            np.fromiter((entry[1] for entry in entries), dtype=np.int32, count=len(entries)),
+            [entry[2] for entry in entries],
+            fields,
+            np.fromiter((entry[3] for entry in entries), dtype=bool, count=len(entries)) if partial else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, row: int) -> Dict:
+        return self.record(row)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for row in range(len(self.index)):
+            yield self.record(row)
+
+    def record(self, row: int) -> Dict:
+        """The result dict of one row"""
+        candidate = self.candidates[self.index[row]]
+        reasoning = self.reasoning[row]
+        if reasoning is None:
+            result = result_record(candidate, FALLBACK_SCORE, FALLBACK_REASONING, self.fields)
+        else:
+            result = result_record(candidate, int(self.scores[row]), reasoning, self.fields)
+        if self.partial is not None:
+            result['partial'] = bool(self.partial[row])
+        return result
+
+    def sort(self) -> None:
+        """Order rows by descending score; ties keep their order"""
+        order = np.argsort(-self.scores, kind='stable')
+        self.index = self.index[order]
+        self.scores = self.scores[order]
+        self.reasoning = [self.reasoning[row] for row in order]
+        if self.partial is not None:
+            self.partial = self.partial[order]
+
+    def partial_count(self) -> int:
+        """Candidates of the analysis scored without profile fit and reasoning, including dropped rows"""
+        if self.partial_total is not None:
+            return self.partial_total
+        return int(self.partial.sum()) if self.partial is not None else 0
+
+    def to_list(self) -> List[Dict]:
+        """Every row as a result dict"""
+        return list(self)
@@ -1,48 +1,129 @@
 
-import spacy
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import heapq
 import json
-import re
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Tuple
+
+import numpy as np
+
+from job_profile import JobProfile, JobProfileCache, hash_job_description, extract_required_experience
+from skill_scorer import MAX_SKILL_SCORE, SkillScorer
+from skill_matcher import SkillAliases, SkillMatcher
+from parallel_analysis import ParallelRunner
+from candidate_features import CandidateFeatures, feature_key, vector_norm, vector_similarity
+from candidate_features import profile_text as candidate_profile_text
+from experience import parse_years, parse_years_column, experience_points, experience_points_array
+from feature_store import FeatureStore
+from profile_vectors import load_profile_backend
+from result_cache import ResultCache, result_key
+from result_table import FALLBACK_REASONING, FALLBACK_SCORE, ResultTable, result_record
+from serialization import iter_json_array
+from metrics import (CANDIDATES_SCORED, DUPLICATE_CANDIDATES, FALLBACKS, PARTIAL_CANDIDATES, RESULT_CACHE,
+                     ProgressLogger, timed)
+from streaming import chunked, read_resume_stream, stream_format, to_ndjson, TopScores
+
+# Pipeline components scoring never uses: only lemmas (tagger, attribute_ruler,
+# lemmatizer), lexical flags and the tok2vec tensor behind Doc.similarity are needed
+LEAN_EXCLUDED_COMPONENTS = ["parser", "ner", "senter"]
+
+# Candidates given profile similarity and reasoning per deadline check when no batch size is set
+DEADLINE_CHUNK_SIZE = 64
 
 class ResumeAnalyzer:
-    def __init__(self):
-        # Load spaCy model for NLP processing
+    def __init__(self, job_cache_size: int = 128, skill_vocabulary_path: Optional[str] = None,
+                 feature_store_path: Optional[str] = None, lean: bool = False,
+                 skill_aliases_path: Optional[str] = None, skill_overlap_weight: float = 0.0,
+                 profile_vectors_path: Optional[str] = None, result_cache_size: int = 0,
+                 result_cache_ttl: float = 3600.0):
+        # spaCy is imported here so importing this module stays cheap
+        import spacy
+        
+        if not 0 <= skill_overlap_weight <= 1:
+            raise ValueError("skill_overlap_weight must be between 0 and 1")
+        
+        # Load spaCy model for NLP processing; lean mode skips unused components
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", exclude=LEAN_EXCLUDED_COMPONENTS if lean else [])
         except OSError:
             print("Please install spaCy English model: python -m spacy download en_core_web_sm")
             raise
         
-        self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2)
-        )
+        # Profile similarity from spaCy doc vectors, or from a memory-mapped static word-vector table
+        self.profile_backend = load_profile_backend(self.nlp, profile_vectors_path)
+        
+        # Stored features are only valid for the model (and vector table) that computed them
+        self.model_version = f"{self.nlp.meta.get('lang')}_{self.nlp.meta.get('name')}-{self.nlp.meta.get('version')}"
+        if self.profile_backend.version:
+            self.model_version += f"+{self.profile_backend.version}"
+        
+        # TF-IDF skill matching, fitted once per batch unless a standing vocabulary is loaded
+        self.skill_scorer = SkillScorer.load(skill_vocabulary_path) if skill_vocabulary_path else SkillScorer()
+        
+        # Skill alias table behind the compiled skill matchers, and how much of the
+        # skill score comes from the exact overlap with the JD's known skills
+        self.skill_aliases = SkillAliases.load(skill_aliases_path) if skill_aliases_path else SkillAliases()
+        self.skill_overlap_weight = skill_overlap_weight
+        
+        # Compiled job descriptions, so repeated postings skip JD processing
+        self.job_cache = JobProfileCache(maxsize=job_cache_size)
+        
+        # Process pools for parallel analysis by worker count, created on first use, with the
+        # number of calls using each and the most recently requested count
+        self._worker_options = {'job_cache_size': job_cache_size, 'lean': lean,
+                                'profile_vectors_path': profile_vectors_path}
+        self._runners = {}
+        self._runner_users = {}
+        self._runner_workers = None
+        self._runner_lock = threading.Lock()
+        
+        # Persistent per-candidate features, so unchanged resumes skip NLP
+        self.feature_store = FeatureStore(feature_store_path) if feature_store_path else None
+        
+        # Finished scores and reasoning of recent candidate/job description pairs. A vocabulary
+        # fitted per batch makes every score depend on the whole batch, so there is nothing
+        # stable to key results on and the cache needs a standing vocabulary
+        self.result_cache = None
+        if result_cache_size > 0 and self.skill_scorer.vectorizer is not None:
+            self.result_cache = ResultCache(result_cache_size, result_cache_ttl)
+    
+    def compile_job_description(self, job_description: str) -> JobProfile:
+        """Lemmatize, parse and extract requirements from a job description once"""
+        content_hash = hash_job_description(job_description)
+        job = self.job_cache.get(content_hash)
+        if job is None:
+            with timed('job_description'):
+                lemmas = self.preprocess_text(job_description)
+                doc = self.nlp(job_description)
+                job = JobProfile(
+                    text=job_description,
+                    content_hash=content_hash,
+                    lemmas=lemmas,
+                    doc=doc,
+                    required_experience=extract_required_experience(job_description),
+                    skill_matcher=self.skill_aliases.compile(lemmas.split(), job_description),
+                    vector=self.profile_backend.vector(job_description, doc)
+                )
+            self.job_cache.put(job)
+        return job
     
     def extract_years_experience(self, experience_text: str) -> float:
         """Extract years of experience from text"""
-        if not experience_text:
-            return 0
-        
-        # Look for patterns like "5 years", "3.5 yrs", etc.
-        pattern = r'(\d+(?:\.\d+)?)\s*(?:years?|yrs?)'
-        match = re.search(pattern, experience_text.lower())
-        
-        if match:
-            return float(match.group(1))
-        return 0
+        # Handles "5 years", "3.5 yrs", "5 years 6 months", "3-5 yrs" and "18 months"
+        return parse_years(experience_text)
     
     def preprocess_text(self, text: str) -> str:
         """Clean and preprocess text using spaCy"""
         if not text:
             return ""
         
-        doc = self.nlp(text.lower())
+        return self.lemmatize_doc(self.nlp(text.lower()))
+    
+    def lemmatize_doc(self, doc) -> str:
+        """Join the meaningful lemmas of an already parsed spaCy doc"""
         # Keep only meaningful tokens (not punctuation, spaces, etc.)
         tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct and token.is_alpha]
         return " ".join(tokens)
@@ -54,81 +135,97 @@ class ResumeAnalyzer:
         
         # Preprocess texts
         processed_skills = self.preprocess_text(candidate_skills)
-        processed_job_desc = self.preprocess_text(job_description)
+        processed_job_desc = self.compile_job_description(job_description).lemmas
         
+        return self.skill_similarity_score(processed_skills, processed_job_desc)
+    
+    def skill_similarity_score(self, processed_skills: str, processed_job_desc: str) -> float:
+        """Score already lemmatized skills against the lemmatized job description"""
         if not processed_skills or not processed_job_desc:
             return 0
         
-        try:
-            # Create TF-IDF vectors
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform([processed_skills, processed_job_desc])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
-            # Convert to score out of 50
-            return min(similarity * 50, 50)
-        except:
-            return 0
+        return float(self.skill_scorer.score([processed_skills], processed_job_desc)[0])
     
     def calculate_experience_score(self, candidate: Dict, job_description: str) -> float:
         """Calculate experience relevance score"""
+        return self.experience_score(candidate, self.compile_job_description(job_description).required_experience)
+    
+    def experience_score(self, candidate: Dict, required_exp: float) -> float:
+        """Score experience against an already extracted requirement"""
         total_exp = self.extract_years_experience(candidate.get('totalExperience', ''))
         relevant_exp = self.extract_years_experience(candidate.get('relevantExperience', ''))
         
-        # Extract required experience from job description
-        required_exp_match = re.search(r'(\d+)\+?\s*(?:years?|yrs?)', job_description.lower())
-        required_exp = float(required_exp_match.group(1)) if required_exp_match else 3
-        
-        score = 0
-        
-        # Score based on total experience
-        if total_exp >= required_exp:
-            score += 20
-            # Bonus for exceeding requirements
-            if total_exp > required_exp * 1.5:
-                score += 10
-        else:
-            # Partial score if close to requirement
-            score += (total_exp / required_exp) * 15
-        
-        # Score based on relevant experience
-        if relevant_exp >= required_exp * 0.8:
-            score += 15
-        else:
-            score += (relevant_exp / (required_exp * 0.8)) * 10
-        
-        return min(score, 35)  # Cap at 35 points
+        return self.experience_points(total_exp, relevant_exp, required_exp)
+    
+    def experience_points(self, total_exp: float, relevant_exp: float, required_exp: float) -> float:
+        """Score already extracted years of experience against the requirement"""
+        return experience_points(total_exp, relevant_exp, required_exp)
     
     def calculate_profile_score(self, candidate: Dict, job_description: str) -> float:
         """Calculate profile/role relevance score using NLP"""
-        profile_text = f"{candidate.get('profile', '')} {candidate.get('currentDesignation', '')} {candidate.get('interestedRole', '')}"
+        return self.profile_score(candidate, self.compile_job_description(job_description))
+    
+    def profile_score(self, candidate: Dict, job: JobProfile) -> float:
+        """Calculate profile relevance against a compiled job description"""
+        profile_text = self.profile_text(candidate)
         
         if not profile_text.strip():
             return 0
         
+        if not self.profile_backend.uses_docs:
+            return self.profile_vector_score(self.profile_backend.vector(profile_text), job)
+        
         # Use spaCy for semantic similarity
         try:
             profile_doc = self.nlp(profile_text)
-            job_doc = self.nlp(job_description)
-            
+        except:
+            FALLBACKS.inc(kind='profile')
+            return 0
+        
+        return self.profile_similarity_score(profile_doc, job.doc)
+    
+    def profile_text(self, candidate: Dict) -> str:
+        """Build the free text used for profile/role matching"""
+        return candidate_profile_text(candidate)
+    
+    def profile_similarity_score(self, profile_doc, job_doc) -> float:
+        """Score an already parsed profile doc against the parsed job description"""
+        try:
             # Calculate semantic similarity
             similarity = profile_doc.similarity(job_doc)
             
             # Convert to score out of 15
             return min(similarity * 15, 15)
         except:
+            FALLBACKS.inc(kind='profile')
+            return 0
+    
+    def profile_vector_score(self, profile_vector, job: JobProfile) -> float:
+        """Score a stored profile vector against the compiled job description"""
+        if profile_vector is None:
+            return 0
+        
+        try:
+            # Same cosine similarity Doc.similarity computes from the doc vectors
+            similarity = vector_similarity(profile_vector, job.vector)
+            
+            # Convert to score out of 15
+            return min(similarity * 15, 15)
+        except:
+            FALLBACKS.inc(kind='profile')
             return 0
     
     def generate_reasoning(self, candidate: Dict, scores: Dict, job_description: str) -> str:
         """Generate human-readable reasoning for the score"""
+        return self.build_reasoning(candidate, scores, self.compile_job_description(job_description).skill_matcher)
+    
+    def build_reasoning(self, candidate: Dict, scores: Dict, job_matcher: SkillMatcher) -> str:
+        """Generate reasoning with the job description's compiled skill matcher"""
         total_exp = self.extract_years_experience(candidate.get('totalExperience', ''))
         name = f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}"
         
-        # Extract some matching skills
-        candidate_skills_list = [skill.strip().lower() for skill in candidate.get('skills', '').split(',')]
-        job_skills = self.preprocess_text(job_description).split()
-        matching_skills = [skill for skill in candidate_skills_list if any(job_skill in skill for job_skill in job_skills)][:3]
+        # Extract some matching skills in one pass over the candidate's skills
+        matching_skills = job_matcher.matching_skills(candidate.get('skills', ''), limit=3)
         
         reasoning = f"{name} scored {scores['total']}/100. "
         
@@ -161,8 +258,49 @@ class ResumeAnalyzer:
         
         return reasoning
     
-    def analyze_candidates(self, data: Dict) -> List[Dict]:
-        """Main method to analyze all candidates"""
+    def build_result(self, candidate: Dict, score: int, reasoning: str, fields: Optional[List[str]] = None) -> Dict:
+        """Assemble the result record returned for one candidate
+        
+        fields selects the candidate attributes echoed back under 'candidate':
+        None echoes the whole record and an empty list leaves it out.
+        """
+        return result_record(candidate, score, reasoning, fields)
+    
+    def fallback_result(self, candidate: Dict, fields: Optional[List[str]] = None) -> Dict:
+        """Basic result used when a candidate cannot be scored"""
+        return self.build_result(candidate, FALLBACK_SCORE, FALLBACK_REASONING, fields)
+    
+    def report_failure(self, candidate: Dict, error: Exception) -> None:
+        """Log and count a candidate that falls back to basic scoring"""
+        FALLBACKS.inc(kind='candidate')
+        print(f"Error analyzing candidate {candidate.get('firstName', 'Unknown')}: {str(error)}")
+    
+    def analyze_candidates(self, data: Dict, batch_size: Optional[int] = None,
+                           workers: Optional[int] = None, top_k: Optional[int] = None,
+                           fields: Optional[List[str]] = None,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           deadline_ms: Optional[int] = None, compact: bool = False):
+        """Main method to analyze all candidates
+        
+        When batch_size is given every spaCy call is batched through nlp.pipe,
+        which gives the same scores as the per-candidate path with far less
+        per-document overhead. With workers > 1 candidates are sharded across
+        a process pool where each worker loads its own spaCy model. top_k
+        returns only the best candidates, and fields selects which candidate
+        attributes are echoed back (None echoes the whole record). progress is
+        called with (candidates processed, total) as the NLP work advances and
+        may raise to abort the analysis. With a result cache, candidates scored
+        recently against the same job description reuse their score and reasoning.
+        
+        deadline_ms bounds the analysis: every candidate gets the cheap skill and
+        experience scores, and profile similarity and reasoning are added in
+        ranked order while the budget lasts (see score_within_deadline).
+        
+        With compact the ranked results come back as a ResultTable, which keeps
+        scores and reasoning as columns and only builds each result dict when
+        it is iterated or serialized; otherwise they are a list of dicts.
+        """
+        started = time.perf_counter()
         candidates = data.get('resumes', [])
         job_description = data.get('job_description', '')
         
@@ -172,99 +310,961 @@ class ResumeAnalyzer:
         if not job_description:
             raise ValueError("Job description is required for analysis")
         
-        results = []
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be a positive integer")
+        
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        
+        if deadline_ms is not None and deadline_ms < 1:
+            raise ValueError("deadline_ms must be a positive integer")
         
         print(f"Starting analysis of {len(candidates)} candidates...")
         
-        for i, candidate in enumerate(candidates):
-            try:
-                print(f"Analyzing candidate {i+1}/{len(candidates)}: {candidate.get('firstName', 'Unknown')}")
-                
-                # Calculate individual scores
-                skill_score = self.calculate_skill_match_score(candidate.get('skills', ''), job_description)
-                experience_score = self.calculate_experience_score(candidate, job_description)
-                profile_score = self.calculate_profile_score(candidate, job_description)
-                
-                # Total score
-                total_score = skill_score + experience_score + profile_score
-                
-                scores = {
-                    'skills': skill_score,
-                    'experience': experience_score,
-                    'profile': profile_score,
-                    'total': round(total_score)
-                }
-                
-                # Generate reasoning
-                reasoning = self.generate_reasoning(candidate, scores, job_description)
+        # The job description is processed once (or fetched from the cache) per analysis
+        job = self.compile_job_description(job_description)
+        
+        if deadline_ms is not None:
+            results = self.score_within_deadline(candidates, job, started + deadline_ms / 1000, batch_size, fields,
+                                                 top_k, progress)
+        elif self.result_cache is None:
+            features, errors = self.extract_candidate_features(candidates, batch_size, workers, progress)
+            results = ResultTable.from_entries(candidates, self.score_entries(candidates, features, errors, job,
+                                                                             top_k=top_k), fields)
+        else:
+            results = self.score_cached(candidates, job, batch_size, workers, fields, top_k, progress)
+        
+        # Sort by score in descending order
+        with timed('sort'):
+            results.sort()
+        
+        print(f"Analysis complete! Top candidates:")
+        for i in range(min(3, len(results))):
+            result = results.record(i)
+            print(f"{i+1}. {result['name']} - Score: {result['score']}")
+        
+        return results if compact else results.to_list()
+    
+    def analyze_stream(self, candidates: Iterable[Dict], job_description: str, batch_size: int = 256,
+                       workers: Optional[int] = None, fields: Optional[List[str]] = ()) -> Iterator[Dict]:
+        """Score candidates from any iterable, yielding results as each batch finishes
+        
+        Only one batch of candidates is held at a time and, unless fields asks
+        for some, results do not echo the candidate record. Without a loaded skill vocabulary, one is
+        fitted on the first batch and reused for the rest of the stream so
+        scores stay comparable across batches.
+        """
+        if not job_description:
+            raise ValueError("Job description is required for analysis")
+        
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        
+        job = self.compile_job_description(job_description)
+        skill_scorer = self.skill_scorer if self.skill_scorer.vectorizer is not None else None
+        
+        for chunk in chunked(candidates, batch_size):
+            features, errors = self.extract_candidate_features(chunk, batch_size, workers)
+            
+            if skill_scorer is None:
+                try:
+                    skill_scorer = SkillScorer().fit([item.skill_lemmas for item in features if item] + [job.lemmas])
+                except ValueError:
+                    # Nothing to build a vocabulary from yet
+                    pass
+            
+            yield from self.score_features(chunk, features, errors, job, skill_scorer or self.skill_scorer,
+                                           fields=fields)
+    
+    def analyze_matrix(self, data: Dict, batch_size: Optional[int] = None, workers: Optional[int] = None,
+                       top_k: int = 10, best_fit: Optional[int] = None, fields: Optional[List[str]] = (),
+                       progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """Score every candidate against every job description in data['job_descriptions']
+        
+        Each candidate goes through NLP once and each job description is
+        compiled once; the N x M scores then come from matrix products. Job
+        descriptions are strings or {"id": ..., "job_description": ...} objects.
+        Returns the score matrix, a top_k shortlist per job description and,
+        with best_fit, each candidate's best best_fit requisitions. Cells match
+        analyze_candidates when a skill vocabulary is loaded; otherwise one
+        vocabulary is fitted over the pool and all job descriptions. A cell
+        whose reasoning was generated and failed holds the fallback score.
+        """
+        candidates = data.get('resumes', [])
+        job_descriptions = data.get('job_descriptions', [])
+        
+        if not candidates:
+            raise ValueError("No candidates found in data")
+        
+        if not job_descriptions:
+            raise ValueError("At least one job description is required for analysis")
+        
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be a positive integer")
+        
+        if top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        
+        if best_fit is not None and best_fit < 1:
+            raise ValueError("best_fit must be a positive integer")
+        
+        job_ids = []
+        jobs = []
+        for j, entry in enumerate(job_descriptions):
+            if isinstance(entry, dict):
+                job_ids.append(entry.get('id', j))
+                entry = entry.get('job_description', '')
+            else:
+                job_ids.append(j)
+            if not entry or not isinstance(entry, str):
+                raise ValueError(f"Job description {j} is empty or not text")
+            jobs.append(self.compile_job_description(entry))
+        
+        print(f"Starting matrix analysis of {len(candidates)} candidates x {len(jobs)} job descriptions...")
+        
+        features, errors = self.extract_candidate_features(candidates, batch_size, workers, progress)
+        for i, error in errors.items():
+            self.report_failure(candidates[i], error)
+        components = self.score_matrix(features, errors, jobs, candidates=candidates)
+        totals = components['total']
+        
+        failed = {i for i in range(len(candidates)) if i in errors or features[i] is None}
+        
+        with timed('reasoning'):
+            shortlists = []
+            for j, job in enumerate(jobs):
+                def reason(i: int) -> Optional[str]:
+                    try:
+                        scores = self._combine_scores(float(components['skills'][i, j]),
+                                                      float(components['experience'][i, j]),
+                                                      float(components['profile'][i, j]))
+                        return self.build_reasoning(candidates[i], scores, job.skill_matcher)
+                    except Exception as e:
+                        self.report_failure(candidates[i], e)
+                        # The cell falls back, in the score matrix and best fits too
+                        totals[i, j] = FALLBACK_SCORE
+                        return None
                 
-                result = {
+                entries = self.shortlist_entries([(i, None if i in failed else int(totals[i, j]))
+                                                  for i in range(len(candidates))], top_k, reason)
+                shortlists.append({
+                    'job_id': job_ids[j],
+                    'results': [self.entry_result(candidates[i], score, reasoning, fields)
+                                for i, score, reasoning in entries]
+                })
+        
+        matrix = {
+            'candidates': [
+                {
                     'candidateId': candidate.get('candidateId'),
-                    'name': f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}".strip(),
-                    'score': scores['total'],
-                    'skills': candidate.get('skills', ''),
-                    'experience': candidate.get('totalExperience', ''),
-                    'reasoning': reasoning,
-                    'candidate': candidate
+                    'name': f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}".strip()
                 }
-                
-                results.append(result)
-                
-            except Exception as e:
-                print(f"Error analyzing candidate {candidate.get('firstName', 'Unknown')}: {str(e)}")
-                # Add fallback result
-                fallback_result = {
+                for candidate in candidates
+            ],
+            'job_ids': job_ids,
+            'scores': totals.tolist(),
+            'shortlists': shortlists
+        }
+        
+        if best_fit:
+            matrix['best_fit'] = []
+            for i, candidate in enumerate(candidates):
+                top = TopScores(best_fit)
+                for j in range(len(jobs)):
+                    top.push(totals[i, j], j)
+                matrix['best_fit'].append({
                     'candidateId': candidate.get('candidateId'),
-                    'name': f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}".strip(),
-                    'score': 50,  # Default score
-                    'skills': candidate.get('skills', ''),
-                    'experience': candidate.get('totalExperience', ''),
-                    'reasoning': "Analysis completed with basic scoring due to processing constraints.",
-                    'candidate': candidate
-                }
-                results.append(fallback_result)
+                    'requisitions': [{'job_id': job_ids[j], 'score': int(totals[i, j])} for j in top.items()]
+                })
         
-        # Sort by score in descending order
-        results.sort(key=lambda x: x['score'], reverse=True)
+        print(f"Matrix analysis complete! {len(candidates) * len(jobs)} scores computed")
         
-        print(f"Analysis complete! Top candidates:")
-        for i, result in enumerate(results[:3]):
-            print(f"{i+1}. {result['name']} - Score: {result['score']}")
+        return matrix
+    
+    def extract_features(self, candidate: Dict) -> CandidateFeatures:
+        """Run the NLP work for a single candidate"""
+        profile_text = self.profile_text(candidate)
+        return CandidateFeatures(
+            skill_lemmas=self.preprocess_text(candidate.get('skills', '')),
+            profile_vector=self.profile_backend.vector(profile_text) if profile_text.strip() else None,
+            total_experience=self.extract_years_experience(candidate.get('totalExperience', '')),
+            relevant_experience=self.extract_years_experience(candidate.get('relevantExperience', ''))
+        )
+    
+    def extract_candidate_features(self, candidates: List[Dict], batch_size: Optional[int] = None,
+                                   workers: Optional[int] = None,
+                                   progress: Optional[Callable[[int, int], None]] = None):
+        """Features for every candidate, plus the errors of candidates that could not be processed
+        
+        Identical resumes in the batch (same skills, profile text and
+        experience) are processed once and share their features, and features
+        already in the feature store are reused, so NLP only runs on new or
+        edited resumes. errors maps candidate indexes to the exception that
+        stopped their processing.
+        """
+        keys = [feature_key(candidate, self.model_version) for candidate in candidates]
+        first = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+        if len(first) == len(candidates):
+            return self._extract_unique(candidates, keys, batch_size, workers, progress)
+        
+        # Duplicates count as already processed
+        duplicates = len(candidates) - len(first)
+        DUPLICATE_CANDIDATES.inc(duplicates)
+        print(f"Skipping NLP for {duplicates} duplicate candidates")
+        unique = list(first.values())
+        unique_progress = (lambda done, total: progress(duplicates + done, len(candidates))) if progress else None
+        features, errors = self._extract_unique([candidates[i] for i in unique], [keys[i] for i in unique],
+                                                batch_size, workers, unique_progress)
+        position = {key: j for j, key in enumerate(first)}
+        return ([features[position[key]] for key in keys],
+                {i: errors[position[key]] for i, key in enumerate(keys) if position[key] in errors})
+    
+    def _extract_unique(self, candidates: List[Dict], keys: List[str], batch_size: Optional[int],
+                        workers: Optional[int], progress: Optional[Callable[[int, int], None]] = None):
+        """Features of distinct candidates, from the feature store where possible"""
+        if self.feature_store is None:
+            with timed('preprocess'):
+                return self._extract_uncached(candidates, batch_size, workers, progress)
+        
+        with timed('feature_store'):
+            stored = self.feature_store.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in stored]
+        
+        features = [stored.get(key) for key in keys]
+        errors = {}
+        if missing:
+            # Stored candidates count as already processed
+            reused = len(candidates) - len(missing)
+            missing_progress = (lambda done, total: progress(reused + done, len(candidates))) if progress else None
+            with timed('preprocess'):
+                fresh, fresh_errors = self._extract_uncached([candidates[i] for i in missing], batch_size, workers,
+                                                             missing_progress)
+            new_entries = {}
+            for j, i in enumerate(missing):
+                if j in fresh_errors:
+                    errors[i] = fresh_errors[j]
+                else:
+                    features[i] = fresh[j]
+                    new_entries[keys[i]] = fresh[j]
+            with timed('feature_store'):
+                self.feature_store.put_many(new_entries, self.model_version)
+        
+        print(f"Feature store: {len(candidates) - len(missing)}/{len(candidates)} candidates reused")
+        if progress:
+            progress(len(candidates), len(candidates))
+        return features, errors
+    
+    def _extract_uncached(self, candidates: List[Dict], batch_size: Optional[int], workers: Optional[int],
+                          progress: Optional[Callable[[int, int], None]] = None):
+        """Run the NLP work for candidates, sequentially, batched or across the worker pool"""
+        if workers and workers > 1:
+            return self._extract_parallel(candidates, batch_size, workers, progress)
+        if batch_size:
+            return self._extract_batched(candidates, batch_size, progress)
+        return self._extract_sequential(candidates, progress)
+    
+    def _extract_sequential(self, candidates: List[Dict], progress: Optional[Callable[[int, int], None]] = None):
+        """Run the NLP work one candidate at a time"""
+        features = [None] * len(candidates)
+        errors = {}
+        logger = ProgressLogger(len(candidates))
+        for i, candidate in enumerate(candidates):
+            if progress:
+                progress(i, len(candidates))
+            try:
+                features[i] = self.extract_features(candidate)
+            except Exception as e:
+                errors[i] = e
+            logger.update(i + 1)
+        if progress:
+            progress(len(candidates), len(candidates))
+        return features, errors
+    
+    def _extract_batched(self, candidates: List[Dict], batch_size: int,
+                         progress: Optional[Callable[[int, int], None]] = None, profiles: bool = True):
+        """Run the NLP work in chunks, parsing each chunk's texts with one nlp.pipe call
+        
+        Without profiles only skills and experience are extracted and every
+        profile vector is left as None.
+        """
+        features = [None] * len(candidates)
+        errors = {}
+        docs_processed = 0
+        started = time.perf_counter()
+        logger = ProgressLogger(len(candidates))
+        
+        # Years of experience for the whole batch in one columnar pass
+        total_years = parse_years_column([candidate.get('totalExperience', '') for candidate in candidates])
+        relevant_years = parse_years_column([candidate.get('relevantExperience', '') for candidate in candidates])
+        
+        for offset in range(0, len(candidates), batch_size):
+            chunk = range(offset, min(offset + batch_size, len(candidates)))
+            
+            # Collect every text of the chunk so spaCy sees them as one stream
+            texts = []
+            slots = []
+            profile_texts = []
+            profile_slots = []
+            for i in chunk:
+                skills = candidates[i].get('skills', '')
+                if skills and isinstance(skills, str):
+                    texts.append(skills.lower())
+                    slots.append(('skills', i))
+                profile_text = self.profile_text(candidates[i]) if profiles else ''
+                if profile_text.strip():
+                    profile_texts.append(profile_text)
+                    profile_slots.append(i)
+                    if self.profile_backend.uses_docs:
+                        texts.append(profile_text)
+                        slots.append(('profile', i))
+            
+            skill_lemmas = {}
+            profile_vectors = {}
+            for (kind, i), doc in zip(slots, self.nlp.pipe(texts, batch_size=batch_size)):
+                if kind == 'skills':
+                    skill_lemmas[i] = self.lemmatize_doc(doc)
+                else:
+                    profile_vectors[i] = self.profile_backend.doc_vector(doc)
+            docs_processed += len(texts)
+            
+            # Other backends average the whole chunk's profile vectors in one go, without spaCy
+            if profile_texts and not self.profile_backend.uses_docs:
+                profile_vectors = dict(zip(profile_slots, self.profile_backend.vectors(profile_texts, batch_size)))
+            
+            for i in chunk:
+                candidate = candidates[i]
+                try:
+                    # Anything that was not piped or parsed as text goes through the
+                    # scalar helpers so odd values fail exactly like on the per-candidate path
+                    total_exp = candidate.get('totalExperience', '')
+                    relevant_exp = candidate.get('relevantExperience', '')
+                    features[i] = CandidateFeatures(
+                        skill_lemmas=skill_lemmas[i] if i in skill_lemmas else self.preprocess_text(candidate.get('skills', '')),
+                        profile_vector=profile_vectors.get(i),
+                        total_experience=float(total_years[i]) if isinstance(total_exp, str) else self.extract_years_experience(total_exp),
+                        relevant_experience=float(relevant_years[i]) if isinstance(relevant_exp, str) else self.extract_years_experience(relevant_exp)
+                    )
+                except Exception as e:
+                    errors[i] = e
+            
+            logger.update(chunk.stop)
+            if progress:
+                progress(chunk.stop, len(candidates))
+        
+        elapsed = time.perf_counter() - started
+        docs_per_sec = docs_processed / elapsed if elapsed > 0 else 0
+        print(f"Processed {docs_processed} docs in {elapsed:.2f}s ({docs_per_sec:.1f} docs/sec, batch size {batch_size})")
+        
+        return features, errors
+    
+    def _extract_parallel(self, candidates: List[Dict], batch_size: Optional[int], workers: int,
+                          progress: Optional[Callable[[int, int], None]] = None):
+        """Shard the NLP work across the worker pool, keeping input order"""
+        started = time.perf_counter()
+        
+        try:
+            features, errors = self._extract_with_runner(candidates, batch_size, workers, progress)
+        except BrokenProcessPool:
+            # A pool process died (OOM kill, crash); the replacement pool gets one more try
+            print(f"Worker pool of {workers} processes broke, restarting it")
+            features, errors = self._extract_with_runner(candidates, batch_size, workers, progress)
+        
+        elapsed = time.perf_counter() - started
+        rate = len(candidates) / elapsed if elapsed > 0 else 0
+        print(f"Processed {len(candidates)} candidates in {elapsed:.2f}s ({rate:.1f} candidates/sec, {workers} workers)")
+        
+        return features, errors
+    
+    def _extract_with_runner(self, candidates: List[Dict], batch_size: Optional[int], workers: int,
+                             progress: Optional[Callable[[int, int], None]] = None):
+        """Extract on the pool for this many workers, dropping the pool if it turns out to be broken"""
+        with self.parallel_runner(workers) as runner:
+            try:
+                return runner.extract(candidates, batch_size, progress)
+            except BrokenProcessPool:
+                self._drop_runner(runner)
+                raise
+    
+    def _drop_runner(self, runner: ParallelRunner) -> None:
+        """Forget a broken pool so the next call starts a new one, and stop what is left of it"""
+        with self._runner_lock:
+            if self._runners.get(runner.workers) is not runner:
+                # Another call using it already dropped it
+                return
+            del self._runners[runner.workers]
+            del self._runner_users[runner.workers]
+        runner.shutdown()
+    
+    @contextmanager
+    def parallel_runner(self, workers: int) -> Iterator[ParallelRunner]:
+        """Use the process pool for this many workers, starting it if needed
+        
+        Concurrent calls may ask for different worker counts, so a pool is
+        never stopped while a call is using it. Once idle, only the pool of
+        the most recently requested count is kept; the others are stopped
+        when their last call is done.
+        """
+        with self._runner_lock:
+            runner = self._runners.get(workers)
+            if runner is None:
+                runner = self._runners[workers] = ParallelRunner(workers, self._worker_options)
+            self._runner_users[workers] = self._runner_users.get(workers, 0) + 1
+            self._runner_workers = workers
+            idle = self._idle_runners()
+        for stale in idle:
+            stale.shutdown()
+        try:
+            yield runner
+        finally:
+            with self._runner_lock:
+                # close() may already have stopped it
+                if self._runners.get(workers) is runner:
+                    self._runner_users[workers] -= 1
+                idle = self._idle_runners()
+            for stale in idle:
+                stale.shutdown()
+    
+    def _idle_runners(self) -> List[ParallelRunner]:
+        """Remove and return the pools no call is using, except the most recently requested one"""
+        idle = [workers for workers, users in self._runner_users.items()
+                if users == 0 and workers != self._runner_workers]
+        for workers in idle:
+            del self._runner_users[workers]
+        return [self._runners.pop(workers) for workers in idle]
+    
+    def after_fork(self) -> None:
+        """Replace what a forked process must not share: the feature store connection and the worker pools"""
+        self._runners = {}
+        self._runner_users = {}
+        self._runner_workers = None
+        self._runner_lock = threading.Lock()
+        if self.feature_store is not None:
+            self.feature_store.reopen()
+    
+    def close(self) -> None:
+        """Stop the worker pools and close the feature store"""
+        with self._runner_lock:
+            runners = list(self._runners.values())
+            self._runners = {}
+            self._runner_users = {}
+            self._runner_workers = None
+        for runner in runners:
+            runner.shutdown()
+        if self.feature_store is not None:
+            self.feature_store.close()
+    
+    def score_features(self, candidates: List[Dict], features: List[Optional[CandidateFeatures]],
+                       errors: Dict, job: JobProfile, skill_scorer: Optional[SkillScorer] = None,
+                       fields: Optional[List[str]] = None, top_k: Optional[int] = None) -> List[Dict]:
+        """Score candidates from their extracted features; no NLP happens here
+        
+        With top_k only the best candidates are kept in a bounded heap while
+        scoring, and reasoning is only generated for those survivors.
+        """
+        return [self.entry_result(candidates[i], score, reasoning, fields)
+                for i, score, reasoning in self.score_entries(candidates, features, errors, job, skill_scorer, top_k)]
+    
+    def entry_result(self, candidate: Dict, score: int, reasoning: Optional[str],
+                     fields: Optional[List[str]] = None) -> Dict:
+        """Result record of a scored candidate, or the fallback one when reasoning is None"""
+        if reasoning is None:
+            return self.fallback_result(candidate, fields)
+        return self.build_result(candidate, score, reasoning, fields)
+    
+    def score_entries(self, candidates: List[Dict], features: List[Optional[CandidateFeatures]], errors: Dict,
+                      job: JobProfile, skill_scorer: Optional[SkillScorer] = None,
+                      top_k: Optional[int] = None) -> List[Tuple[int, int, Optional[str]]]:
+        """(candidate index, total score, reasoning) of the kept candidates, best first with top_k
+        
+        Candidates that fall back to basic scoring have the default score of
+        50 and no reasoning.
+        """
+        combined = self.combined_scores(candidates, features, errors, job, skill_scorer)
+        return self.ranked_entries(combined, lambda i: self.entry_reasoning(candidates[i], combined[i], job), top_k)
+    
+    def combined_scores(self, candidates: List[Dict], features: List[Optional[CandidateFeatures]], errors: Dict,
+                        job: JobProfile, skill_scorer: Optional[SkillScorer] = None) -> List[Optional[Dict]]:
+        """Component and total scores of every candidate, None for one that falls back"""
+        skill_scorer = skill_scorer or self.skill_scorer
+        
+        # One TF-IDF fit and one sparse product for the whole batch
+        with timed('skills'):
+            skill_scores = skill_scorer.score([item.skill_lemmas if item else '' for item in features], job.lemmas)
+            if self.skill_overlap_weight:
+                skill_scores = self.blend_skill_overlap(skill_scores[:, None], candidates, [job])[:, 0]
+        
+        # Experience points for the whole batch as array operations
+        with timed('experience'):
+            experience_scores = experience_points_array([item.total_experience if item else 0 for item in features],
+                                                        [item.relevant_experience if item else 0 for item in features],
+                                                        job.required_experience)
+        
+        # Profile similarities of the whole batch from one matrix-vector product
+        with timed('profile'):
+            profile_scores = self.profile_score_matrix(features, [job])[:, 0]
+        CANDIDATES_SCORED.inc(len(candidates))
+        
+        # Numeric scores for everyone; None marks a fallback
+        combined = []
+        for i, candidate in enumerate(candidates):
+            scores = None
+            if i in errors:
+                self.report_failure(candidate, errors[i])
+            else:
+                try:
+                    # Calculate individual scores
+                    skill_score = float(skill_scores[i])
+                    experience_score = float(experience_scores[i])
+                    profile_score = float(profile_scores[i])
+                    
+                    scores = self._combine_scores(skill_score, experience_score, profile_score)
+                except Exception as e:
+                    self.report_failure(candidate, e)
+            combined.append(scores)
+        return combined
+    
+    def entry_reasoning(self, candidate: Dict, scores: Dict, job: JobProfile) -> Optional[str]:
+        """Reasoning of a scored candidate, or None when it falls back"""
+        try:
+            # Generate reasoning
+            return self.build_reasoning(candidate, scores, job.skill_matcher)
+        except Exception as e:
+            # Fallback result
+            self.report_failure(candidate, e)
+            return None
+    
+    def ranked_entries(self, combined: List[Optional[Dict]], reason: Callable[[int], Optional[str]],
+                       top_k: Optional[int] = None) -> List[Tuple[int, int, Optional[str]]]:
+        """(candidate index, total score, reasoning) of every candidate, or of the top_k best first
+        
+        reason(i) is called for every scored candidate without top_k, and with
+        top_k only for those that can still make the shortlist.
+        """
+        with timed('reasoning'):
+            if top_k:
+                # Reasoning for the shortlist only
+                return self.shortlist_entries([(i, scores['total'] if scores else None)
+                                               for i, scores in enumerate(combined)], top_k, reason)
+            
+            entries = []
+            for i, scores in enumerate(combined):
+                reasoning = reason(i) if scores is not None else None
+                entries.append((i, scores['total'], reasoning) if reasoning is not None else (i, FALLBACK_SCORE, None))
         
+        return entries
+    
+    def shortlist_entries(self, totals: List[Tuple[int, Optional[int]]], top_k: int,
+                          reason: Callable[[int], Optional[str]]) -> List[Tuple[int, int, Optional[str]]]:
+        """The first top_k (candidate index, score, reasoning) entries of the full ranking
+        
+        totals holds each candidate's index and total score, None for one
+        that already fell back. reason(i) returns the reasoning, or None when
+        it fails and the candidate falls back to the default score, which can
+        move it up or down. Candidates are therefore reasoned in order of the
+        best score they can still end with, until none of the rest can
+        displace the k-th kept one. Ties rank the earlier candidate first, as
+        in the full ranking.
+        """
+        best_possible = lambda total: FALLBACK_SCORE if total is None else max(total, FALLBACK_SCORE)
+        # Min-heap of (score, -index, entry) whose root is the k-th best kept entry
+        kept = []
+        for i, total in sorted(totals, key=lambda item: (-best_possible(item[1]), item[0])):
+            if len(kept) == top_k and kept[0][:2] > (best_possible(total), -i):
+                break
+            reasoning = reason(i) if total is not None else None
+            score = total if reasoning is not None else FALLBACK_SCORE
+            entry = (score, -i, (i, score, reasoning))
+            if len(kept) < top_k:
+                heapq.heappush(kept, entry)
+            elif entry[:2] > kept[0][:2]:
+                heapq.heapreplace(kept, entry)
+        return [entry for _, _, entry in sorted(kept, reverse=True)]
+    
+    def score_cached(self, candidates: List[Dict], job: JobProfile, batch_size: Optional[int] = None,
+                     workers: Optional[int] = None, fields: Optional[List[str]] = None, top_k: Optional[int] = None,
+                     progress: Optional[Callable[[int, int], None]] = None) -> ResultTable:
+        """Results of analyze_candidates, reusing cached scores and reasoning where possible
+        
+        Only candidates missing from the result cache go through NLP and
+        scoring. The cache only exists with a standing skill vocabulary, so a
+        candidate's scores do not depend on the rest of the batch and every
+        result is the one uncached scoring gives. The scores of every newly
+        scored candidate are cached, but reasoning is only built (and cached)
+        for the candidates that are returned, so with top_k a cache miss costs
+        no reasoning outside the shortlist. Fallbacks are never cached.
+        """
+        version = self.scoring_version()
+        keys = [result_key(feature_key(candidate, self.model_version), candidate, job.content_hash, version)
+                for candidate in candidates]
+        with timed('result_cache'):
+            cached = self.result_cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        RESULT_CACHE.inc(len(candidates) - len(missing), outcome='hit')
+        RESULT_CACHE.inc(len(missing), outcome='miss')
+        
+        # Component scores of everyone and reasoning where it has been built; None marks a fallback
+        combined = [None] * len(candidates)
+        reasoning = {}
+        for i, key in enumerate(keys):
+            if key in cached:
+                combined[i], reasoning[i] = cached[key]
+        if missing:
+            subset = [candidates[i] for i in missing]
+            # Cached candidates count as already processed
+            reused = len(candidates) - len(missing)
+            missing_progress = (lambda done, total: progress(reused + done, len(candidates))) if progress else None
+            features, errors = self.extract_candidate_features(subset, batch_size, workers, missing_progress)
+            for j, scores in enumerate(self.combined_scores(subset, features, errors, job)):
+                combined[missing[j]] = scores
+        elif progress:
+            progress(len(candidates), len(candidates))
+        print(f"Result cache: {len(candidates) - len(missing)}/{len(candidates)} candidates reused")
+        
+        reasoned = []
+        
+        def reason(i: int) -> Optional[str]:
+            if reasoning.get(i) is None:
+                reasoning[i] = self.entry_reasoning(candidates[i], combined[i], job)
+                reasoned.append(i)
+            return reasoning[i]
+        
+        entries = self.ranked_entries(combined, reason, top_k)
+        
+        updates = {keys[i]: (combined[i], None) for i in missing if combined[i] is not None}
+        updates.update({keys[i]: (combined[i], reasoning[i]) for i in reasoned if reasoning[i] is not None})
+        with timed('result_cache'):
+            self.result_cache.put_many(updates)
+        return ResultTable.from_entries(candidates, entries, fields)
+    
+    def score_within_deadline(self, candidates: List[Dict], job: JobProfile, deadline: float,
+                              batch_size: Optional[int] = None, fields: Optional[List[str]] = None,
+                              top_k: Optional[int] = None,
+                              progress: Optional[Callable[[int, int], None]] = None) -> ResultTable:
+        """Results of analyze_candidates, spending the expensive work on the best candidates first
+        
+        deadline is a time.perf_counter() value. Skill lemmas, TF-IDF and
+        experience are computed for every candidate. Profile similarity and
+        reasoning then follow a chunk at a time in order of the partial
+        (skills + experience) score until the deadline passes. Candidates the
+        budget did not reach keep a profile score of 0 and a short reasoning.
+        Every row has a partial flag (a 'partial' key in its result). The NLP
+        runs in this process, and the result cache is not used.
+        """
+        n = len(candidates)
+        chunk_size = batch_size or DEADLINE_CHUNK_SIZE
+        
+        # Stored features are complete; the others start with skills and experience only
+        features = [None] * n
+        keys = None
+        if self.feature_store is not None:
+            keys = [feature_key(candidate, self.model_version) for candidate in candidates]
+            with timed('feature_store'):
+                stored = self.feature_store.get_many(keys)
+            features = [stored.get(key) for key in keys]
+        missing = [i for i in range(n) if features[i] is None]
+        complete = set(range(n)) - set(missing)
+        
+        errors = {}
+        if missing:
+            reused = n - len(missing)
+            missing_progress = (lambda done, total: progress(reused + done, n)) if progress else None
+            with timed('preprocess'):
+                cheap, cheap_errors = self._extract_batched([candidates[i] for i in missing], chunk_size,
+                                                            missing_progress, profiles=False)
+            for j, i in enumerate(missing):
+                if j in cheap_errors:
+                    errors[i] = cheap_errors[j]
+                    self.report_failure(candidates[i], errors[i])
+                else:
+                    features[i] = cheap[j]
+        elif progress:
+            progress(n, n)
+        
+        with timed('skills'):
+            skill_scores = self.skill_scorer.score([item.skill_lemmas if item else '' for item in features], job.lemmas)
+            if self.skill_overlap_weight:
+                skill_scores = self.blend_skill_overlap(skill_scores[:, None], candidates, [job])[:, 0]
+        with timed('experience'):
+            experience_scores = experience_points_array([item.total_experience if item else 0 for item in features],
+                                                        [item.relevant_experience if item else 0 for item in features],
+                                                        job.required_experience)
+        CANDIDATES_SCORED.inc(n)
+        
+        # Profile similarity and reasoning in ranked order while the budget lasts
+        profile_scores = np.zeros(n)
+        reasoning = {}
+        ranked = sorted((i for i in range(n) if i not in errors), key=lambda i: -(skill_scores[i] + experience_scores[i]))
+        for offset in range(0, len(ranked), chunk_size):
+            if time.perf_counter() >= deadline:
+                break
+            chunk = ranked[offset:offset + chunk_size]
+            
+            with timed('profile'):
+                pending = [i for i in chunk if i not in complete and self.profile_text(candidates[i]).strip()]
+                if pending:
+                    vectors = self.profile_backend.vectors([self.profile_text(candidates[i]) for i in pending],
+                                                           chunk_size)
+                    for i, vector in zip(pending, vectors):
+                        features[i].profile_vector = vector
+                complete.update(chunk)
+                profile_scores[chunk] = self.profile_score_matrix([features[i] for i in chunk], [job])[:, 0]
+            
+            with timed('reasoning'):
+                for i in chunk:
+                    scores = self._combine_scores(float(skill_scores[i]), float(experience_scores[i]),
+                                                  float(profile_scores[i]))
+                    try:
+                        reasoning[i] = (scores['total'], self.build_reasoning(candidates[i], scores, job.skill_matcher))
+                    except Exception as e:
+                        self.report_failure(candidates[i], e)
+                        errors[i] = e
+        
+        # Only features with a profile vector are worth keeping
+        if self.feature_store is not None:
+            new_entries = {keys[i]: features[i] for i in missing if i in complete and i not in errors}
+            with timed('feature_store'):
+                self.feature_store.put_many(new_entries, self.model_version)
+        
+        partial = [i for i in ranked if i not in reasoning and i not in errors]
+        if partial:
+            PARTIAL_CANDIDATES.inc(len(partial))
+            print(f"Deadline reached: {len(partial)}/{n} candidates scored without profile fit and reasoning")
+        
+        entries = {}
+        for i in range(n):
+            if i in errors:
+                entries[i] = (FALLBACK_SCORE, None, False)
+            elif i in reasoning:
+                entries[i] = reasoning[i] + (False,)
+            else:
+                scores = self._combine_scores(float(skill_scores[i]), float(experience_scores[i]), 0.0)
+                entries[i] = (scores['total'], self.partial_reasoning(candidates[i], scores), True)
+        
+        kept = range(n)
+        if top_k:
+            shortlist = TopScores(top_k)
+            for i in kept:
+                shortlist.push(entries[i][0], i)
+            kept = shortlist.items()
+        
+        results = ResultTable.from_entries(candidates, [(i, *entries[i]) for i in kept], fields, partial=True)
+        # Counted over every candidate, not only the shortlist
+        results.partial_total = len(partial)
         return results
+    
+    def partial_reasoning(self, candidate: Dict, scores: Dict) -> str:
+        """Reasoning of a candidate scored on skills and experience only"""
+        name = f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}"
+        return (f"{name} scored {scores['total']}/100 on skills ({scores['skills']:.1f}/50) and experience "
+                f"({scores['experience']:.1f}/35) only; profile fit was not assessed within the time budget.")
+    
+    def scoring_version(self) -> str:
+        """Everything besides the candidate and job description that a result depends on"""
+        return (f"{self.model_version}|{self.skill_scorer.version()}|{self.skill_aliases.version}|"
+                f"{self.skill_overlap_weight!r}")
+    
+    def score_matrix(self, features: List[Optional[CandidateFeatures]], errors: Dict,
+                     jobs: List[JobProfile], skill_scorer: Optional[SkillScorer] = None,
+                     candidates: Optional[List[Dict]] = None) -> Dict[str, np.ndarray]:
+        """Component and total scores of every candidate against every job, as N x M matrices
+        
+        Candidates that could not be processed get the fallback score of 50.
+        The candidate records are needed for the exact skill overlap when
+        skill_overlap_weight is set.
+        """
+        n, m = len(features), len(jobs)
+        skill_scorer = skill_scorer or self.skill_scorer
+        
+        # One TF-IDF fit and one sparse matrix product for every pair
+        with timed('skills'):
+            skills = skill_scorer.score_matrix([item.skill_lemmas if item else '' for item in features],
+                                               [job.lemmas for job in jobs])
+            if self.skill_overlap_weight:
+                if candidates is None:
+                    raise ValueError("candidates are required to score the skill overlap")
+                skills = self.blend_skill_overlap(skills, candidates, jobs)
+        
+        # Experience points only depend on the requirement, so each distinct one is scored once
+        with timed('experience'):
+            total_years = [item.total_experience if item else 0 for item in features]
+            relevant_years = [item.relevant_experience if item else 0 for item in features]
+            experience = np.zeros((n, m))
+            for required in set(job.required_experience for job in jobs):
+                column = experience_points_array(total_years, relevant_years, required)
+                experience[:, [job.required_experience == required for job in jobs]] = column[:, None]
+        
+        with timed('profile'):
+            profile = self.profile_score_matrix(features, jobs)
+        CANDIDATES_SCORED.inc(n * m)
+        
+        total = np.round(skills + experience + profile).astype(int)
+        failed = [i for i in range(n) if i in errors or features[i] is None]
+        total[failed, :] = 50
+        
+        return {'skills': skills, 'experience': experience, 'profile': profile, 'total': total}
+    
+    def profile_score_matrix(self, features: List[Optional[CandidateFeatures]], jobs: List[JobProfile]) -> np.ndarray:
+        """0-15 profile scores of every candidate against every job from one matrix product
+        
+        Cosine similarities are computed the way Doc.similarity computes them;
+        candidates without a profile vector score 0.
+        """
+        job_vectors = np.stack([job.vector for job in jobs])
+        profile_vectors = np.zeros((len(features), job_vectors.shape[1]), dtype=job_vectors.dtype)
+        for i, item in enumerate(features):
+            if item is not None and item.profile_vector is not None:
+                profile_vectors[i] = item.profile_vector
+        norms = np.outer([vector_norm(vector) for vector in profile_vectors],
+                         [vector_norm(vector) for vector in job_vectors])
+        dots = profile_vectors @ job_vectors.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarities = np.where(norms > 0, dots / norms, 0.0)
+        return np.minimum(similarities * 15, 15)
+    
+    def blend_skill_overlap(self, skill_scores: np.ndarray, candidates: List[Dict],
+                            jobs: List[JobProfile]) -> np.ndarray:
+        """Mix the exact overlap with each job's known skills into N x M TF-IDF skill scores
+        
+        The overlap is the share of a job's known skills (after aliases) that
+        a candidate lists, scaled to the same 0-50 range.
+        """
+        weight = self.skill_overlap_weight
+        overlap = np.zeros(skill_scores.shape)
+        for i, candidate in enumerate(candidates):
+            skills = candidate.get('skills', '')
+            if isinstance(skills, str):
+                overlap[i] = [job.skill_matcher.overlap(skills) for job in jobs]
+        return (1 - weight) * skill_scores + weight * MAX_SKILL_SCORE * overlap
+    
+    def _combine_scores(self, skill_score: float, experience_score: float, profile_score: float) -> Dict:
+        """Collect the component scores and their rounded total"""
+        # Total score
+        total_score = skill_score + experience_score + profile_score
+        
+        return {
+            'skills': skill_score,
+            'experience': experience_score,
+            'profile': profile_score,
+            'total': round(total_score)
+        }
+
+def run_stream(analyzer: ResumeAnalyzer, input_path: str, output_path: str, batch_size: int,
+               workers: Optional[int] = None, job_description: Optional[str] = None, top_k: int = 5,
+               fields: Optional[List[str]] = ()) -> List[Dict]:
+    """Score a JSON/NDJSON resume file incrementally, writing NDJSON results as they are produced"""
+    top = TopScores(top_k)
+    
+    with open(input_path, 'rb') as source, open(output_path, 'w', encoding='utf-8') as output:
+        file_job_description, resumes = read_resume_stream(source, stream_format(input_path))
+        
+        for result in analyzer.analyze_stream(resumes, job_description or file_job_description, batch_size, workers, fields):
+            output.write(to_ndjson(result))
+            top.push(result['score'], result)
+    
+    if top.count == 0:
+        raise ValueError("No candidates found in data")
+    
+    return top.items()
 
 def main():
     """Main function to run the analyzer from command line"""
+    import argparse
     import sys
     
-    if len(sys.argv) != 2:
-        print("Usage: python resume_analyzer.py <path_to_resume_json>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Rank candidates in a resume JSON file against its job description")
+    parser.add_argument('json_file', help="path to the resume JSON (or NDJSON with --stream) file")
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help="batch spaCy processing through nlp.pipe with this many candidates per batch")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="shard candidates across this many worker processes")
+    parser.add_argument('--feature-store', default=None,
+                        help="SQLite file caching per-candidate NLP features between runs")
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="only keep (and write) the best K candidates")
+    parser.add_argument('--fields', default=None,
+                        help="comma-separated candidate attributes to echo in each result (default: all)")
+    parser.add_argument('--stream', action='store_true',
+                        help="read resumes incrementally (JSON or NDJSON) and write NDJSON results as they are produced")
+    parser.add_argument('--job-description', default=None,
+                        help="job description to use instead of the one in the input file")
+    parser.add_argument('--lean', action='store_true',
+                        help="load spaCy without the parser and NER, which scoring does not use")
+    parser.add_argument('--skill-vocabulary', default=None,
+                        help="load a pre-fitted TF-IDF skill vocabulary instead of fitting one per batch")
+    parser.add_argument('--skill-aliases', default=None,
+                        help="JSON file of {\"canonical skill\": [\"alias\", ...]} replacing the built-in alias table")
+    parser.add_argument('--profile-vectors', default=None,
+                        help="directory of a static word-vector table (see profile_vectors.py) for profile similarity")
+    parser.add_argument('--skill-overlap-weight', type=float, default=0.0,
+                        help="share (0-1) of the skill score taken from the exact overlap with the JD's known skills")
+    parser.add_argument('--pretty', action='store_true',
+                        help="indent the JSON results file (slower and larger than the default compact JSON)")
+    args = parser.parse_args()
     
-    json_file_path = sys.argv[1]
+    json_file_path = args.json_file
+    fields = [field.strip() for field in args.fields.split(',') if field.strip()] if args.fields is not None else None
     
     try:
-        # Load the JSON data
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        
-        # Initialize analyzer
-        analyzer = ResumeAnalyzer()
-        
-        # Analyze candidates
-        results = analyzer.analyze_candidates(data)
-        
-        # Save results
-        output_file = 'shortlisted_candidates.json'
-        with open(output_file, 'w', encoding='utf-8') as file:
-            json.dump(results, file, indent=2, ensure_ascii=False)
+        if args.stream:
+            # Stream candidates through the analyzer without loading the file
+            analyzer = ResumeAnalyzer(skill_vocabulary_path=args.skill_vocabulary, feature_store_path=args.feature_store,
+                                      lean=args.lean, skill_aliases_path=args.skill_aliases,
+                                      skill_overlap_weight=args.skill_overlap_weight,
+                                      profile_vectors_path=args.profile_vectors)
+            
+            output_file = 'shortlisted_candidates.ndjson'
+            try:
+                top_results = run_stream(analyzer, json_file_path, output_file, args.batch_size or 256,
+                                         args.workers, args.job_description, args.top_k or 5, fields or ())
+            finally:
+                analyzer.close()
+        else:
+            # Load the JSON data
+            with open(json_file_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            
+            if args.job_description:
+                data['job_description'] = args.job_description
+            
+            # Initialize analyzer
+            analyzer = ResumeAnalyzer(skill_vocabulary_path=args.skill_vocabulary, feature_store_path=args.feature_store,
+                                      lean=args.lean, skill_aliases_path=args.skill_aliases,
+                                      skill_overlap_weight=args.skill_overlap_weight,
+                                      profile_vectors_path=args.profile_vectors)
+            
+            # Analyze candidates
+            try:
+                results = analyzer.analyze_candidates(data, batch_size=args.batch_size, workers=args.workers,
+                                                      top_k=args.top_k, fields=fields, compact=True)
+            finally:
+                analyzer.close()
+            
+            # Save results
+            output_file = 'shortlisted_candidates.json'
+            if args.pretty:
+                with open(output_file, 'w', encoding='utf-8') as file:
+                    json.dump(results.to_list(), file, indent=2, ensure_ascii=False)
+            else:
+                # Records are encoded a chunk at a time straight from the result table
+                with open(output_file, 'wb') as file:
+                    for chunk in iter_json_array(results):
+                        file.write(chunk)
+            top_results = [results.record(row) for row in range(min(5, len(results)))]
         
         print(f"\nResults saved to {output_file}")
         
         # Display top 5 candidates
         print("\n🏆 TOP 5 CANDIDATES:")
         print("=" * 50)
-        for i, candidate in enumerate(results[:5]):
+        for i, candidate in enumerate(top_results[:5]):
             print(f"{i+1}. {candidate['name']} - Score: {candidate['score']}/100")
             print(f"   Skills: {candidate['skills'][:100]}...")
             print(f"   Experience: {candidate['experience']}")
@@ -0,0 +1,74 @@
+"""
+Fast JSON encoding of analysis responses
+orjson is used when it is installed: it is several times faster than the
+standard library encoder and returns bytes directly. Without it, or for
+values orjson cannot encode (integers beyond 64 bits), the standard library
+writes the same compact JSON. Result lists are encoded a chunk of records at
+a time, so no second full copy of the results is built, and the output can be
+gzip-compressed as it is produced.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Records encoded per chunk of a result list
+CHUNK_RECORDS = 1000
+# Fastest level: JSON results still shrink several times over
+GZIP_LEVEL = 1
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON of a value"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits and other values only the standard library handles
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def iter_json(payload: Dict, records_key: Optional[str] = None,
+              records: Optional[Iterable[Dict]] = None) -> Iterator[bytes]:
+    """JSON of payload with records (any iterable) as its last member, in chunks"""
+    if records_key is None:
+        yield dumps(payload)
+        return
+
+    head = dumps({**payload, records_key: []})
+    # Everything up to the empty list, which is the last member
+    yield head[:-3]
+    yield from iter_json_array(records)
+    yield b'}'
+
+
+def iter_json_array(records: Iterable[Dict]) -> Iterator[bytes]:
+    """JSON array of records (any iterable), in chunks"""
+    yield b'['
+    chunk = []
+    first = True
+    for record in records:
+        chunk.append(dumps(record))
+        if len(chunk) == CHUNK_RECORDS:
+            yield (b'' if first else b',') + b','.join(chunk)
+            chunk = []
+            first = False
+    if chunk:
+        yield (b'' if first else b',') + b','.join(chunk)
+    yield b']'
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """gzip-compress a stream of byte chunks"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
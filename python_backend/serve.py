@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Production server: gunicorn workers forked from a master that has already
+loaded the spaCy model
+The master builds the shared analyzer (model, alias table, profile vectors)
+and imports scikit-learn before forking, then freezes the garbage collector
+so those objects are never written to again. Workers therefore share the
+model's memory copy-on-write instead of loading one copy each. Every worker
+serves requests on several threads; scoring keeps no per-request state on
+the analyzer. SQLite connections, the candidate pool and background jobs are
+opened per worker after the fork. Workers publish their metrics to a shared
+directory (RESUME_METRICS_DIR, a temporary one by default), so /metrics
+reports the whole server whichever worker answers it. Background jobs are
+shared through a SQLite job table (RESUME_JOB_DB; with several workers and
+none configured, a temporary one that lasts as long as the server), so any
+worker answers for any job.
+"""
+
+import argparse
+import gc
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+# Loaded before forking so every worker shares the model and skips the slow imports
+WARM_UP_JOB_DESCRIPTION = "Senior Full Stack Developer with React, Node.js and AWS. 4+ years of experience."
+
+
+def preload():
+    """Import the API and build the shared analyzer in this (the master) process"""
+    import api_server
+
+    analyzer = api_server.get_analyzer()
+    # scikit-learn is otherwise imported by the first request of every worker
+    from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: F401
+    analyzer.nlp(WARM_UP_JOB_DESCRIPTION)
+
+    # Objects that exist now are shared with the workers; keep the collector off their pages
+    gc.collect()
+    gc.freeze()
+    return api_server.app
+
+
+def shared_state(workers: int) -> str:
+    """Point the workers at the metrics directory and job table they share, returning a temporary directory
+
+    What is not configured in the environment goes into the temporary
+    directory, which the caller removes when the server stops.
+    """
+    directory = tempfile.mkdtemp(prefix='resume-serve-')
+    metrics_directory = os.environ.get('RESUME_METRICS_DIR')
+    if metrics_directory:
+        os.makedirs(metrics_directory, exist_ok=True)
+        # Snapshots of a previous server would be added to this one's counters
+        for path in glob.glob(os.path.join(metrics_directory, 'metrics-*.json')):
+            os.remove(path)
+    else:
+        os.environ['RESUME_METRICS_DIR'] = os.path.join(directory, 'metrics')
+        os.mkdir(os.environ['RESUME_METRICS_DIR'])
+    if workers > 1 and not os.environ.get('RESUME_JOB_DB'):
+        # In-memory jobs would only be known to the worker that accepted them
+        os.environ['RESUME_JOB_DB'] = os.path.join(directory, 'jobs.db')
+    return directory
+
+
+def post_fork(server, worker):
+    """gunicorn hook: reset what a worker must not share with the master"""
+    import api_server
+    api_server.after_fork()
+
+
+def run(app, options):
+    """Serve the app with gunicorn, forking workers from this process"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("serve.py needs gunicorn (pip install gunicorn); it runs on Linux and macOS")
+
+    class ServerApplication(BaseApplication):
+        def load_config(self):
+            for name, value in options.items():
+                self.cfg.set(name, value)
+
+        def load(self):
+            return app
+
+    ServerApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with preloaded, fork-shared model workers")
+    parser.add_argument('--host', default='0.0.0.0', help="interface to bind")
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)), help="port to bind")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--threads', type=int, default=4, help="request threads per worker")
+    parser.add_argument('--timeout', type=int, default=600,
+                        help="seconds a request may run before its worker is restarted")
+    parser.add_argument('--max-requests', type=int, default=0,
+                        help="restart a worker after this many requests (0 never)")
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.threads < 1:
+        parser.error("--workers and --threads must be positive integers")
+
+    print(f"Loading the model before starting {args.workers} workers x {args.threads} threads...")
+    directory = shared_state(args.workers)
+    master = os.getpid()
+    app = preload()
+    try:
+        run(app, {
+            'bind': f"{args.host}:{args.port}",
+            'workers': args.workers,
+            'threads': args.threads,
+            'worker_class': 'gthread',
+            'preload_app': True,
+            'timeout': args.timeout,
+            'max_requests': args.max_requests,
+            'post_fork': post_fork,
+        })
+    finally:
+        # Workers leave run() too, by SystemExit; only the master removes the directory
+        if os.getpid() == master:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
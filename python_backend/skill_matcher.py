@@ -0,0 +1,161 @@
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Canonical skill names and the spellings that mean the same thing; spellings
+# that are also everyday words ("go", "rest", "next") are left out on purpose
+DEFAULT_SKILL_ALIASES = {
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': [],
+    'node.js': ['node', 'nodejs', 'node js'],
+    'react': ['reactjs', 'react.js', 'react js'],
+    'react native': ['react-native'],
+    'angular': ['angularjs', 'angular.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'next.js': ['nextjs'],
+    'express.js': ['expressjs'],
+    'python': ['python3'],
+    'django': [],
+    'flask': [],
+    'java': [],
+    'spring boot': ['springboot'],
+    'c++': ['cpp'],
+    'c#': ['csharp', 'c sharp'],
+    '.net': ['dotnet', 'asp.net'],
+    'golang': [],
+    'ruby on rails': ['ror'],
+    'php': [],
+    'kotlin': [],
+    'swift': [],
+    'flutter': [],
+    'sql': [],
+    'postgresql': ['postgres', 'psql'],
+    'mysql': [],
+    'mongodb': ['mongo'],
+    'redis': [],
+    'graphql': ['gql'],
+    'rest api': ['restful', 'rest apis', 'restful apis'],
+    'aws': ['amazon web services'],
+    'azure': ['microsoft azure'],
+    'gcp': ['google cloud', 'google cloud platform'],
+    'docker': [],
+    'kubernetes': ['k8s'],
+    'terraform': [],
+    'ci/cd': ['cicd', 'ci cd'],
+    'git': ['github', 'gitlab'],
+    'html': ['html5'],
+    'css': ['css3'],
+    'tailwind css': ['tailwind', 'tailwindcss'],
+    'machine learning': ['ml'],
+    'deep learning': [],
+    'natural language processing': ['nlp'],
+    'data science': [],
+    'pandas': [],
+    'numpy': [],
+    'tensorflow': [],
+    'pytorch': [],
+}
+
+# Characters that belong to a skill name, so "js" is not found inside "node.js"
+_SKILL_CHARS = r'a-z0-9+#.'
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase a skill and collapse its whitespace"""
+    return ' '.join(skill.lower().split())
+
+
+class SkillAliases:
+    """Table mapping every known spelling of a skill to its canonical name
+
+    Loaded from a JSON object of {"canonical": ["alias", ...]}; the built-in
+    table covers common web, data and cloud skills.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, Iterable[str]]] = None):
+        self.canonical_names = {}
+        for canonical, spellings in (DEFAULT_SKILL_ALIASES if aliases is None else aliases).items():
+            canonical = normalize_skill(canonical)
+            self.canonical_names[canonical] = canonical
+            for spelling in spellings:
+                self.canonical_names[normalize_skill(spelling)] = canonical
+
+        # Short hash of the table, part of the version of cached results
+        self.version = hashlib.sha256(json.dumps(sorted(self.canonical_names.items())).encode('utf-8')).hexdigest()[:16]
+
+        # Every known spelling as one alternation, longest first so "react native" wins over "react"
+        spellings = sorted(self.canonical_names, key=len, reverse=True)
+        self._pattern = re.compile(
+            rf"(?<![{_SKILL_CHARS}])(?:{'|'.join(re.escape(spelling) for spelling in spellings)})(?![a-z0-9+#])"
+        ) if spellings else None
+
+    @classmethod
+    def load(cls, path: str) -> 'SkillAliases':
+        """Load an alias table from a JSON file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def canonical(self, skill: str) -> str:
+        """The canonical name of a skill, or the normalized skill itself when it is unknown"""
+        skill = normalize_skill(skill)
+        return self.canonical_names.get(skill, skill)
+
+    def find(self, text: str) -> List[str]:
+        """Canonical names of the known skills mentioned anywhere in a free text, in order"""
+        if self._pattern is None:
+            return []
+        found = {}
+        for match in self._pattern.finditer(normalize_skill(text)):
+            found.setdefault(self.canonical_names[match.group(0)], None)
+        return list(found)
+
+    def compile(self, job_tokens: List[str], job_description: str) -> 'SkillMatcher':
+        """Compile the skill matcher of one job description"""
+        return SkillMatcher(job_tokens, self.find(job_description), self)
+
+
+class SkillMatcher:
+    """A job description's terms compiled once for matching candidate skills
+
+    The lemmatized job description tokens and their canonical names become a
+    single regular expression, so each candidate skill is checked in one
+    search instead of one substring test per job token. A candidate skill
+    matches when any job term occurs in it, as written or under its canonical
+    name ("JS" matches a posting that asks for "JavaScript").
+    """
+
+    def __init__(self, job_tokens: List[str], job_skills: List[str], aliases: SkillAliases):
+        self.aliases = aliases
+        # Known skills the job description asks for, by canonical name
+        self.job_skills = job_skills
+        self._job_skill_set = set(job_skills)
+
+        terms = set(job_tokens)
+        terms.update(aliases.canonical(token) for token in job_tokens)
+        terms.update(job_skills)
+        terms.discard('')
+        self._pattern = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))) if terms else None
+
+    def split_skills(self, skills: str) -> List[str]:
+        """Split a comma-separated skills field the way the reasoning always has"""
+        return [skill.strip().lower() for skill in skills.split(',')]
+
+    def matching_skills(self, skills: str, limit: Optional[int] = None) -> List[str]:
+        """Candidate skills (as written, lowercased) that match the job description, in order"""
+        matches = []
+        if self._pattern is None:
+            return matches
+        for skill in self.split_skills(skills):
+            if self._pattern.search(skill) or self._pattern.search(self.aliases.canonical(skill)):
+                matches.append(skill)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def overlap(self, skills: str) -> float:
+        """Share of the job description's known skills that the candidate lists exactly (0-1)"""
+        if not self._job_skill_set:
+            return 0.0
+        listed = {self.aliases.canonical(skill) for skill in self.split_skills(skills)}
+        return len(listed & self._job_skill_set) / len(self._job_skill_set)
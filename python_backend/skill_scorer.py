@@ -0,0 +1,109 @@
+import hashlib
+import json
+
+import numpy as np
+from typing import List, Optional, TYPE_CHECKING
+
+from metrics import FALLBACKS
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+MAX_SKILL_SCORE = 50
+
+# Same settings the per-candidate vectorizer has always used
+TFIDF_PARAMS = {
+    'stop_words': 'english',
+    'max_features': 1000,
+    'ngram_range': (1, 2)
+}
+
+
+class SkillScorer:
+    """Vectorized TF-IDF skill matching over a whole batch of candidates
+    
+    A single vocabulary is fitted per batch (or loaded once from disk), every
+    candidate is transformed into one sparse matrix and all cosine similarities
+    against the job description come from a single sparse mat-vec. The scorer
+    never mutates shared state while scoring, so one instance can be used from
+    concurrent requests.
+    """
+    
+    def __init__(self, vectorizer: Optional['TfidfVectorizer'] = None):
+        # A pre-fitted vectorizer is reused as is; otherwise one is fitted per batch
+        self.vectorizer = vectorizer
+        # (vectorizer, hash of its vocabulary), computed on first use
+        self._version = None
+    
+    @classmethod
+    def load(cls, path: str) -> 'SkillScorer':
+        """Load a vocabulary fitted with fit() and saved with save()"""
+        import joblib
+        return cls(joblib.load(path))
+    
+    def save(self, path: str) -> None:
+        """Persist the fitted vocabulary so later runs skip fitting"""
+        import joblib
+        if self.vectorizer is None:
+            raise ValueError("SkillScorer has no fitted vocabulary to save")
+        joblib.dump(self.vectorizer, path)
+    
+    def fit(self, corpus: List[str]) -> 'SkillScorer':
+        """Fit a standing vocabulary on a corpus of lemmatized texts"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        self.vectorizer = TfidfVectorizer(**TFIDF_PARAMS).fit([text for text in corpus if text])
+        return self
+    
+    def version(self) -> Optional[str]:
+        """Short hash of the fitted vocabulary and its IDF weights, None when fitted per batch"""
+        vectorizer = self.vectorizer
+        if vectorizer is None:
+            return None
+        if self._version is None or self._version[0] is not vectorizer:
+            digest = hashlib.sha256(json.dumps(sorted(vectorizer.vocabulary_.items()), default=int).encode('utf-8'))
+            digest.update(np.ascontiguousarray(vectorizer.idf_).tobytes())
+            self._version = (vectorizer, digest.hexdigest()[:16])
+        return self._version[1]
+
+    def score(self, processed_skills: List[str], processed_job_desc: str) -> np.ndarray:
+        """Score lemmatized skills against the lemmatized job description (0-50 each)"""
+        if not processed_job_desc:
+            return np.zeros(len(processed_skills))
+        return self.score_matrix(processed_skills, [processed_job_desc])[:, 0]
+    
+    def score_matrix(self, processed_skills: List[str], processed_job_descs: List[str]) -> np.ndarray:
+        """Score lemmatized skills against several lemmatized job descriptions at once
+        
+        Returns an N x M matrix (candidates x job descriptions) from one sparse
+        matrix product. Without a loaded vocabulary a single one is fitted over
+        the candidates and every job description.
+        """
+        scores = np.zeros((len(processed_skills), len(processed_job_descs)))
+        if not processed_skills or not any(processed_job_descs):
+            return scores
+        
+        try:
+            vectorizer = self.vectorizer
+            if vectorizer is None:
+                # scikit-learn is slow to import, so it is only loaded on first use
+                from sklearn.feature_extraction.text import TfidfVectorizer
+                
+                # One fit over the batch and the job descriptions
+                corpus = [text for text in processed_skills if text]
+                corpus.extend(text for text in processed_job_descs if text)
+                vectorizer = TfidfVectorizer(**TFIDF_PARAMS).fit(corpus)
+            
+            # Rows are L2-normalised, so the dot products are the cosine similarities
+            skills_matrix = vectorizer.transform(processed_skills)
+            job_matrix = vectorizer.transform(processed_job_descs)
+            similarities = np.asarray((skills_matrix @ job_matrix.T).todense())
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words)
+            FALLBACKS.inc(kind='skills')
+            return scores
+        
+        # Convert to score out of 50
+        scores = np.minimum(similarities * MAX_SKILL_SCORE, MAX_SKILL_SCORE)
+        scores[np.array([not text for text in processed_skills]), :] = 0
+        scores[:, np.array([not text for text in processed_job_descs])] = 0
+        return scores
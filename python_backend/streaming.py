@@ -0,0 +1,208 @@
+import codecs
+import heapq
+import io
+import itertools
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _JSONStream:
+    """Incremental reader that decodes one JSON value at a time from a file object"""
+
+    def __init__(self, fp, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        # Uploaded files are binary, local files may be either
+        self._bytes_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was already consumed"""
+        if self.eof:
+            return False
+        while True:
+            raw = self.fp.read(self.chunk_size)
+            chunk = self._bytes_decoder.decode(raw, final=not raw) if isinstance(raw, bytes) else raw
+            # A chunk can end inside a multi-byte character
+            if chunk or not raw:
+                break
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at the end of the input"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume a structural character"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON format: expected '{char}' but found '{found or 'end of input'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: read more and try again
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_document(fp) -> Iterator[Tuple[str, Any]]:
+    """Walk a {"resumes": [...], ...} document without loading it
+
+    Yields ('resumes', resume) for every element of the resumes array and
+    (key, value) for every other top-level key, in document order.
+    """
+    stream = _JSONStream(fp)
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+
+    while True:
+        key = stream.value()
+        stream.expect(':')
+
+        if key == 'resumes':
+            if stream.peek() != '[':
+                raise ValueError("Invalid data structure. Expected 'resumes' array.")
+            stream.expect('[')
+            if stream.peek() == ']':
+                stream.expect(']')
+            else:
+                while True:
+                    yield key, stream.value()
+                    if stream.peek() == ',':
+                        stream.expect(',')
+                        continue
+                    stream.expect(']')
+                    break
+        else:
+            yield key, stream.value()
+
+        if stream.peek() == ',':
+            stream.expect(',')
+            continue
+        stream.expect('}')
+        return
+
+
+def read_json_stream(fp) -> Tuple[str, Iterator[Dict]]:
+    """Return the job description and a lazy iterator over the resumes of a JSON document
+
+    When the job description comes after the resumes the file is scanned once
+    for it and then re-read, so resumes are never held in memory.
+    """
+    items = iter_json_document(fp)
+    for key, value in items:
+        if key == 'job_description':
+            return value, (resume for key, resume in items if key == 'resumes')
+        if key == 'resumes':
+            break
+    else:
+        return '', iter(())
+
+    # Resumes came first: skip past them to find the job description
+    job_description = next((value for key, value in items if key == 'job_description'), '')
+
+    if not fp.seekable():
+        raise ValueError("job_description must come before resumes when the input cannot be re-read")
+    fp.seek(0)
+    return job_description, (resume for key, resume in iter_json_document(fp) if key == 'resumes')
+
+
+def read_ndjson_stream(fp) -> Tuple[str, Iterator[Dict]]:
+    """Return the job description and a lazy iterator over an NDJSON file of resumes
+
+    Every line holds one resume; a first line with a job_description key
+    carries the job description.
+    """
+    if not isinstance(fp, io.TextIOBase):
+        fp = io.TextIOWrapper(fp, encoding='utf-8-sig')
+    records = (json.loads(line) for line in fp if line.strip())
+
+    first = next(records, None)
+    if first is None:
+        return '', iter(())
+    if isinstance(first, dict) and 'job_description' in first:
+        return first['job_description'], records
+    return '', itertools.chain([first], records)
+
+
+def read_resume_stream(fp, fmt: str) -> Tuple[str, Iterator[Dict]]:
+    """Open a 'json' or 'ndjson' resume stream"""
+    if fmt == 'ndjson':
+        return read_ndjson_stream(fp)
+    return read_json_stream(fp)
+
+
+def stream_format(filename: str) -> str:
+    """Guess the stream format from a file name"""
+    return 'ndjson' if filename.lower().endswith(('.ndjson', '.jsonl')) else 'json'
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def to_ndjson(record: Dict) -> str:
+    """Serialize one record as an NDJSON line"""
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class TopScores:
+    """Bounded heap keeping the k best results seen so far
+
+    Ties keep the earlier result, matching the stable sort of analyze_candidates.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.count = 0
+        self._heap = []
+
+    def push(self, score: float, record: Any) -> None:
+        """Offer one result; only the k best are kept"""
+        entry = (score, -self.count, record)
+        self.count += 1
+        if self.k <= 0:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        """The kept results, best first"""
+        return [record for score, order, record in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
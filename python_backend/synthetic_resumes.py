@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic resume pools for benchmarking
+Resumes follow the schema of sample_resumes.json. Roles, skills, experience
+and profiles are drawn from fixed distributions with a seeded generator, so
+the same (count, seed) always gives the same pool, and pools of any size
+share their first resumes.
+"""
+
+import json
+import random
+from typing import Dict, Iterator, Optional
+
+# Role families: titles and their skills, most common first
+ROLE_FAMILIES = {
+    'frontend': {
+        'titles': ["Frontend Developer", "UI Engineer", "React Developer", "Web Developer"],
+        'skills': ["JavaScript", "React", "TypeScript", "HTML", "CSS", "Redux", "Next.js", "Vue.js", "Angular",
+                   "Tailwind CSS", "Webpack", "Jest", "GraphQL", "Figma"],
+    },
+    'backend': {
+        'titles': ["Backend Developer", "Software Engineer", "API Engineer", "Java Developer", "Python Developer"],
+        'skills': ["Java", "Python", "Spring Boot", "Node.js", "SQL", "PostgreSQL", "REST APIs", "Microservices",
+                   "Django", "Redis", "Kafka", "MongoDB", "Go", "gRPC"],
+    },
+    'fullstack': {
+        'titles': ["Full Stack Developer", "Software Engineer", "Full Stack Engineer"],
+        'skills': ["JavaScript", "React", "Node.js", "TypeScript", "MongoDB", "Express", "SQL", "AWS", "Docker",
+                   "GraphQL", "Python", "Next.js", "PostgreSQL", "Redis"],
+    },
+    'mobile': {
+        'titles': ["Mobile Developer", "Android Developer", "iOS Developer", "Flutter Developer"],
+        'skills': ["Flutter", "Dart", "React Native", "Kotlin", "Swift", "Android", "iOS", "Firebase", "Java",
+                   "Objective-C", "Redux", "REST APIs"],
+    },
+    'devops': {
+        'titles': ["DevOps Engineer", "Site Reliability Engineer", "Cloud Engineer", "Platform Engineer"],
+        'skills': ["AWS", "Docker", "Kubernetes", "Terraform", "Linux", "CI/CD", "Jenkins", "Python", "Ansible",
+                   "Prometheus", "Azure", "GCP", "Bash", "Helm"],
+    },
+    'data': {
+        'titles': ["Data Scientist", "Machine Learning Engineer", "Data Engineer", "Data Analyst"],
+        'skills': ["Python", "SQL", "Pandas", "NumPy", "Machine Learning", "Scikit-learn", "TensorFlow", "PyTorch",
+                   "Spark", "Airflow", "Deep Learning", "NLP", "Tableau", "AWS"],
+    },
+}
+# Share of the pool in each family
+FAMILY_WEIGHTS = {'frontend': 0.22, 'backend': 0.25, 'fullstack': 0.2, 'mobile': 0.1, 'devops': 0.11, 'data': 0.12}
+SENIORITY = [("Junior", 0, 2), ("", 2, 5), ("Senior", 5, 10), ("Lead", 8, 15), ("Principal", 12, 20)]
+SENIORITY_WEIGHTS = [0.2, 0.35, 0.3, 0.1, 0.05]
+# How exports spell experience of a year or more, most common first
+EXPERIENCE_FORMATS = ["{years} years", "{years} yrs", "{years} years {months} months", "{years}.5 years",
+                      "{years}+ years"]
+EXPERIENCE_FORMAT_WEIGHTS = [0.6, 0.15, 0.12, 0.08, 0.05]
+PROFILE_TEMPLATES = [
+    "{title} with {years} years of experience in {a} and {b}",
+    "Experienced {title} building production systems with {a}, {b} and {c}",
+    "{title} passionate about {a}; recently delivered projects using {b}",
+    "Results-driven {title} specializing in {a} and {b} at scale",
+    "{title} focused on {a}, {b} and clean, well-tested code",
+]
+FIRST_NAMES = ["Aarav", "Priya", "John", "Jane", "Mike", "Sara", "Wei", "Fatima", "Carlos", "Anna", "Rahul", "Emma",
+               "Kenji", "Olivia", "Ahmed", "Sofia", "Ivan", "Chloe", "Arjun", "Maya"]
+LAST_NAMES = ["Sharma", "Doe", "Smith", "Johnson", "Chen", "Khan", "Garcia", "Müller", "Patel", "Brown", "Kim",
+              "Singh", "Rossi", "Ivanova", "Nguyen", "Williams"]
+COMPANIES = ["TechCorp Inc", "Global Systems Ltd", "MobileFirst Solutions", "DataWorks", "CloudNine", "Finlytics",
+             "ShopStream", "HealthBridge", "Acme Software", "Quantum Labs"]
+LOCATIONS = ["San Francisco, CA", "Austin, TX", "New York, NY", "Seattle, WA", "Bangalore", "Pune", "London", "Berlin",
+             "Toronto", "Remote"]
+
+DEFAULT_JOB_DESCRIPTION = ("Senior Full Stack Developer with React, Node.js, TypeScript and AWS. "
+                           "4+ years of experience building web applications; Docker and PostgreSQL a plus.")
+
+
+def _pick_skills(rng: random.Random, skills, count: int):
+    """Draw distinct skills, favouring the common ones at the front of the list"""
+    weights = [1 / (rank + 1) for rank in range(len(skills))]
+    picked = []
+    while len(picked) < count:
+        skill = rng.choices(skills, weights)[0]
+        if skill not in picked:
+            picked.append(skill)
+    return picked
+
+
+def _experience_text(rng: random.Random, years: float) -> str:
+    """Free-text experience in one of the spellings seen in exports"""
+    if years < 1:
+        months = int(years * 12)
+        return f"{months} months" if months and rng.random() < 0.7 else "Fresher"
+    value_format = rng.choices(EXPERIENCE_FORMATS, EXPERIENCE_FORMAT_WEIGHTS)[0]
+    return value_format.format(years=int(years), months=rng.randint(1, 11))
+
+
+def synthetic_resume(i: int, rng: random.Random) -> Dict:
+    """One resume in the sample_resumes.json schema"""
+    family = rng.choices(list(FAMILY_WEIGHTS), list(FAMILY_WEIGHTS.values()))[0]
+    level, low, high = rng.choices(SENIORITY, SENIORITY_WEIGHTS)[0]
+    title = rng.choice(ROLE_FAMILIES[family]['titles'])
+    designation = f"{level} {title}".strip()
+
+    # Mostly the family's skills, sometimes one from a neighbouring family
+    skills = _pick_skills(rng, ROLE_FAMILIES[family]['skills'], rng.randint(3, 9))
+    if rng.random() < 0.3:
+        other = rng.choice([name for name in ROLE_FAMILIES if name != family])
+        extra = rng.choice(ROLE_FAMILIES[other]['skills'])
+        if extra not in skills:
+            skills.append(extra)
+
+    total_years = round(rng.uniform(low, high), 1)
+    relevant_years = round(total_years * rng.uniform(0.5, 1.0), 1)
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    a, b, c = (skills + skills)[:3]
+    current_ctc = int(40000 + total_years * rng.uniform(6000, 12000))
+    created = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z"
+
+    return {
+        "id": str(i),
+        "firstName": first_name,
+        "lastName": last_name,
+        "dateOfBirth": f"{rng.randint(1970, 2002)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "email": f"{first_name.lower()}.{last_name.lower()}{i}@example.com",
+        "phoneNumber": f"+1{rng.randint(2000000000, 9999999999)}",
+        "gender": rng.choice(["Male", "Female", "Other"]),
+        "skills": ", ".join(skills),
+        "currentCompany": rng.choice(COMPANIES),
+        "profile": rng.choice(PROFILE_TEMPLATES).format(title=title, years=int(total_years), a=a, b=b, c=c),
+        "currentDesignation": designation,
+        "totalExperience": _experience_text(rng, total_years),
+        "relevantExperience": _experience_text(rng, relevant_years),
+        "currentLocation": rng.choice(LOCATIONS),
+        "preferredLocation": rng.sample(LOCATIONS, rng.randint(1, 3)),
+        "currentCTC": str(current_ctc),
+        "expectedCTC": str(int(current_ctc * rng.uniform(1.05, 1.4))),
+        "noticePeriod": rng.choice(["Immediate", "15 days", "1 month", "2 months", "3 months"]),
+        "lastWorkingDay": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "holdingAnyOffer": rng.choice(["No", "No", "Yes"]),
+        "interestedRole": rng.choice(ROLE_FAMILIES[family]['titles']),
+        "createdAt": created,
+        "updatedAt": created,
+        "candidateId": i
+    }
+
+
+def generate_resumes(count: int, seed: int = 0) -> Iterator[Dict]:
+    """count resumes, the same ones for the same seed"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        yield synthetic_resume(i, rng)
+
+
+def generate_pool(count: int, seed: int = 0, job_description: str = DEFAULT_JOB_DESCRIPTION) -> Dict:
+    """An analysis request body: {"resumes": [...], "job_description": ...}"""
+    return {"resumes": list(generate_resumes(count, seed)), "job_description": job_description}
+
+
+def write_pool(path: str, count: int, seed: int = 0, job_description: Optional[str] = DEFAULT_JOB_DESCRIPTION) -> None:
+    """Write a pool as JSON, or as NDJSON (job description line first) for .ndjson/.jsonl paths"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            if job_description:
+                f.write(json.dumps({"job_description": job_description}, ensure_ascii=False) + '\n')
+            for resume in generate_resumes(count, seed):
+                f.write(json.dumps(resume, ensure_ascii=False) + '\n')
+        else:
+            json.dump(generate_pool(count, seed, job_description), f, indent=2, ensure_ascii=False)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic resume pool")
+    parser.add_argument('count', type=int, help="number of resumes")
+    parser.add_argument('--output', default='synthetic_resumes.json', help="JSON or .ndjson output file")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--job-description', default=DEFAULT_JOB_DESCRIPTION, help="job description to include")
+    args = parser.parse_args()
+
+    write_pool(args.output, args.count, args.seed, args.job_description)
+    print(f"Wrote {args.count} resumes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
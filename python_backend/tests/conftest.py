@@ -0,0 +1,41 @@
+"""
+Shared test setup
+Puts the backend modules on sys.path and, when en_core_web_sm is not
+installed, makes spacy.load return a small deterministic stand-in (a blank
+English pipeline with lower-case lemmas and hashed token tensors), so the
+tests run without downloading the model.
+"""
+
+import os
+import sys
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy  # noqa: E402
+from spacy.language import Language  # noqa: E402
+
+TENSOR_WIDTH = 96
+
+
+@Language.component("test_lemma_tensor")
+def test_lemma_tensor(doc):
+    """Lower-case lemmas and a stable per-token tensor for Doc.similarity"""
+    for token in doc:
+        token.lemma_ = token.lower_
+    doc.tensor = np.array([[zlib.crc32(f"{token.lower_}{k}".encode('utf-8')) % 1000 / 1000.0
+                            for k in range(TENSOR_WIDTH)] for token in doc],
+                          dtype='float32').reshape(len(doc), TENSOR_WIDTH)
+    return doc
+
+
+def _load_stand_in(name, **kwargs):
+    nlp = spacy.blank('en')
+    nlp.add_pipe('test_lemma_tensor')
+    return nlp
+
+
+if not spacy.util.is_package('en_core_web_sm'):
+    spacy.load = _load_stand_in
@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+import api_server
+from synthetic_resumes import generate_pool
+
+# Well past the 64 KB the stream reader consumes before the view returns
+RESUMES = 400
+
+
+@pytest.fixture(scope='module')
+def client():
+    return api_server.app.test_client()
+
+
+def ndjson_upload(pool):
+    lines = [json.dumps({'job_description': pool['job_description']})]
+    lines.extend(json.dumps(resume) for resume in pool['resumes'])
+    return '\n'.join(lines).encode('utf-8')
+
+
+@pytest.mark.parametrize('filename', ['resumes.ndjson', 'resumes.json'])
+def test_upload_larger_than_one_read_chunk(client, filename):
+    pool = generate_pool(RESUMES, 1)
+    body = ndjson_upload(pool) if filename.endswith('.ndjson') else json.dumps(pool).encode('utf-8')
+    assert len(body) > 1 << 16
+
+    response = client.post('/analyze-stream', data={'file': (io.BytesIO(body), filename)},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert not any('error' in line for line in lines)
+    assert len(lines) == RESUMES + 1
+    assert lines[-1]['summary']['candidates_analyzed'] == RESUMES
+
+
+def test_upload_without_job_description(client):
+    pool = generate_pool(5, 1)
+    body = '\n'.join(json.dumps(resume) for resume in pool['resumes']).encode('utf-8')
+
+    response = client.post('/analyze-stream', data={'file': (io.BytesIO(body), 'resumes.ndjson')},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Job description is required'}
+
+
+@pytest.mark.parametrize('top_k', ['0', '-3'])
+def test_top_k_below_one_is_rejected(client, top_k):
+    pool = generate_pool(5, 1)
+    response = client.post('/analyze-stream', data={'file': (io.BytesIO(ndjson_upload(pool)), 'resumes.ndjson'),
+                                                    'top_k': top_k},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'top_k must be a positive integer'}
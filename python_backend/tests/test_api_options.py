@@ -0,0 +1,48 @@
+import pytest
+
+import api_server
+from synthetic_resumes import generate_pool
+
+JOB_DESCRIPTION = "Senior Full Stack Developer with React, Node.js and AWS. 4+ years of experience."
+RESUME = {'firstName': 'Ada', 'lastName': 'Lovelace', 'skills': 'React, AWS', 'totalExperience': '5 years'}
+
+
+@pytest.fixture(scope='module')
+def client():
+    return api_server.app.test_client()
+
+
+@pytest.mark.parametrize('name', ['batch_size', 'workers', 'top_k', 'deadline_ms'])
+@pytest.mark.parametrize('value', [True, False, 0, 2.5, '3'])
+def test_analysis_options_must_be_positive_integers(client, name, value):
+    response = client.post('/analyze', json={'job_description': JOB_DESCRIPTION, 'resumes': [RESUME], name: value})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': f"{name} must be a positive integer"}
+
+
+def test_workers_are_capped(client):
+    workers = api_server.MAX_WORKERS + 1
+    response = client.post('/analyze', json={'job_description': JOB_DESCRIPTION, 'resumes': [RESUME],
+                                             'workers': workers})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': f"workers must be at most {api_server.MAX_WORKERS}"}
+
+
+@pytest.mark.parametrize('top_k', [True, 0, '10'])
+def test_requisition_top_k_must_be_a_positive_integer(client, top_k):
+    response = client.post('/requisitions', json={'job_description': JOB_DESCRIPTION, 'top_k': top_k})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': "top_k must be a positive integer"}
+
+
+def test_partial_candidates_count_the_whole_analysis(client):
+    pool = generate_pool(400, 1)
+    response = client.post('/analyze', json={**pool, 'deadline_ms': 1, 'top_k': 5})
+
+    payload = response.get_json()
+    assert len(payload['results']) == 5
+    # The budget runs out while the resumes are still being parsed
+    assert payload['partial_candidates'] == 400
@@ -0,0 +1,133 @@
+import contextlib
+import io
+import sqlite3
+
+import pytest
+
+from candidate_pool import CandidatePool
+from resume_analyzer import ResumeAnalyzer
+from skill_scorer import SkillScorer
+from synthetic_resumes import generate_pool
+
+JOB_DESCRIPTION = "Senior Full Stack Developer with React, Node.js and AWS. 4+ years of experience."
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    analyzer = ResumeAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+@pytest.fixture(scope='module')
+def resumes():
+    return generate_pool(60, 4)['resumes']
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'pool.db')
+
+
+def quietly(call, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call(*args, **kwargs)
+
+
+def test_processes_share_the_first_vocabulary(analyzer, resumes, path):
+    # Two pools on one database stand for two server workers
+    first, second = CandidatePool(analyzer, path), CandidatePool(analyzer, path)
+    quietly(first.add_requisition, JOB_DESCRIPTION, 'fs')
+    quietly(first.add, resumes[:20])
+    # Short of doubling the pool, which would refit the vocabulary
+    quietly(second.add, resumes[20:30])
+
+    assert second.skill_scorer.version() == first.skill_scorer.version() == first.stats()['vocabulary_version']
+
+
+def test_refit_elsewhere_is_picked_up_before_the_next_write(analyzer, resumes, path):
+    server = CandidatePool(analyzer, path)
+    quietly(server.add_requisition, JOB_DESCRIPTION, 'fs')
+    quietly(server.add, resumes[:10])
+    before = server.skill_scorer.version()
+
+    command = CandidatePool(analyzer, path)
+    quietly(command.add, resumes[10:])
+    quietly(command.refit)
+    assert command.skill_scorer.version() != before
+
+    updated = dict(resumes[0], skills="Python, Django")
+    quietly(server.add, [updated])
+    assert server.skill_scorer.version() == command.skill_scorer.version()
+
+    # The ranking is what scoring the whole pool with the refitted vocabulary gives
+    reference = ResumeAnalyzer()
+    reference.skill_scorer = command.skill_scorer
+    full = quietly(reference.analyze_candidates, {'resumes': [updated] + resumes[1:], 'job_description': JOB_DESCRIPTION},
+                   fields=[])
+    reference.close()
+    ranked = quietly(server.shortlist, 'fs', len(resumes), [])
+    assert [(r['candidateId'], r['score']) for r in ranked] == [(r['candidateId'], r['score']) for r in full]
+
+
+def test_rankings_of_another_vocabulary_are_rejected(analyzer, resumes, path):
+    pool = CandidatePool(analyzer, path)
+    quietly(pool.add_requisition, JOB_DESCRIPTION, 'fs')
+    quietly(pool.add, resumes[:10])
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE requisitions SET vocabulary_version = 'elsewhere'")
+    with pytest.raises(ValueError):
+        quietly(pool.shortlist, 'fs')
+
+
+def test_analyzer_vocabulary_must_match_the_pool(resumes, path):
+    analyzer = ResumeAnalyzer()
+    pool = CandidatePool(analyzer, path)
+    quietly(pool.add_requisition, JOB_DESCRIPTION, 'fs')
+    quietly(pool.add, resumes[:10])
+
+    analyzer.skill_scorer = SkillScorer().fit(["python django aws", "react node"])
+    fixed = CandidatePool(analyzer, path)
+    with pytest.raises(ValueError):
+        quietly(fixed.add, resumes[10:12])
+    quietly(fixed.refit)
+    quietly(fixed.add, resumes[10:12])
+    assert fixed.stats()['vocabulary_version'] == analyzer.skill_scorer.version()
+    analyzer.close()
+
+
+def bulk_pool_ranking(analyzer, resumes, path):
+    pool = CandidatePool(analyzer, path)
+    quietly(pool.add, resumes)
+    quietly(pool.add_requisition, JOB_DESCRIPTION, 'fs')
+    ranked = quietly(pool.shortlist, 'fs', len(resumes), [])
+    return pool.skill_scorer.version(), [(r['candidateId'], r['score']) for r in ranked]
+
+
+def test_vocabulary_bootstrapped_from_one_candidate_covers_the_pool(analyzer, resumes, tmp_path):
+    expected = bulk_pool_ranking(analyzer, resumes, str(tmp_path / 'bulk.db'))
+
+    pool = CandidatePool(analyzer, str(tmp_path / 'pool.db'))
+    quietly(pool.add, resumes[:1])
+    quietly(pool.add, resumes[1:])
+    assert pool.stats()['vocabulary_version'] is None
+    quietly(pool.add_requisition, JOB_DESCRIPTION, 'fs')
+
+    ranked = quietly(pool.shortlist, 'fs', len(resumes), [])
+    assert (pool.skill_scorer.version(), [(r['candidateId'], r['score']) for r in ranked]) == expected
+
+
+def test_vocabulary_is_refitted_as_the_pool_grows(analyzer, resumes, tmp_path):
+    expected = bulk_pool_ranking(analyzer, resumes, str(tmp_path / 'bulk.db'))
+
+    # The requisition comes first, so the first fit sees a single candidate
+    pool = CandidatePool(analyzer, str(tmp_path / 'pool.db'))
+    quietly(pool.add_requisition, JOB_DESCRIPTION, 'fs')
+    quietly(pool.add, resumes[:1])
+    first = pool.skill_scorer.version()
+    quietly(pool.add, resumes[1:])
+
+    assert pool.skill_scorer.version() != first
+    ranked = quietly(pool.shortlist, 'fs', len(resumes), [])
+    assert (pool.skill_scorer.version(), [(r['candidateId'], r['score']) for r in ranked]) == expected
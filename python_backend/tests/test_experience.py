@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+from experience import parse_years, parse_years_column
+
+EXPERIENCE_VALUES = [
+    ("5 years 6 months", 5.5),
+    ("2 yrs and 3 mos", 2.25),
+    ("3.5 Years", 3.5),
+    # Ranges count as their upper bound
+    ("3-5 yrs", 5),
+    ("18 months", 1.5),
+    ("1 year, 6 months", 1.5),
+    ("Fresher", 0),
+    ("", 0),
+]
+
+
+@pytest.mark.parametrize('text, years', EXPERIENCE_VALUES)
+def test_parse_years(text, years):
+    assert parse_years(text) == pytest.approx(years)
+
+
+@pytest.mark.parametrize('value', [None, '', 0, []])
+def test_empty_values_count_as_zero(value):
+    assert parse_years(value) == 0
+
+
+@pytest.mark.parametrize('value', [5, 2.5, ['5 years']])
+def test_scalar_parsing_rejects_non_text(value):
+    with pytest.raises(AttributeError):
+        parse_years(value)
+
+
+def test_column_matches_scalar_parsing():
+    texts = [text for text, _ in EXPERIENCE_VALUES]
+    # Repeated values share one regex pass, and must still land on every row
+    column = texts + texts[::-1]
+
+    parsed = parse_years_column(column)
+
+    assert parsed.tolist() == pytest.approx([parse_years(text) for text in column])
+
+
+@pytest.mark.parametrize('value', [None, 5, 2.5, math.nan, ['5 years'], {'years': 5}])
+def test_column_counts_non_text_as_zero(value):
+    parsed = parse_years_column(["5 years", value, "18 months"])
+
+    assert parsed.tolist() == pytest.approx([5, 0, 1.5])
@@ -0,0 +1,207 @@
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from job_queue import CANCELLED, COMPLETED, RUNNING, Job, JobManager, JobTable
+
+
+class FakeAnalyzer:
+    """Stands in for ResumeAnalyzer: one result per resume"""
+
+    def analyze_candidates(self, data, progress=None, **options):
+        if progress:
+            progress(len(data['resumes']), len(data['resumes']))
+        return [{'candidateId': resume['candidateId'], 'score': 50} for resume in data['resumes']]
+
+
+class BlockingAnalyzer:
+    """Counts the runs of each job and holds them until released, reporting progress meanwhile"""
+
+    def __init__(self):
+        self.runs = Counter()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def analyze_candidates(self, data, progress=None, **options):
+        with self._lock:
+            self.runs[data['resumes'][0]['candidateId']] += 1
+        self.started.set()
+        while not self.release.wait(0.01):
+            progress(0, 1)
+        return [{'candidateId': resume['candidateId'], 'score': 50} for resume in data['resumes']]
+
+
+def wait_for(manager, job_id, status):
+    deadline = time.time() + 10
+    while manager.status(job_id)['status'] != status:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def submit_and_wait(manager, count=1):
+    ids = [manager.submit({'resumes': [{'candidateId': i}], 'job_description': 'x'})['job_id'] for i in range(count)]
+    deadline = time.time() + 10
+    while any(manager.status(job_id)['status'] != COMPLETED for job_id in ids if manager.status(job_id)):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    return ids
+
+
+def test_finished_jobs_are_evicted_beyond_max_finished():
+    manager = JobManager(FakeAnalyzer, workers=1, max_finished=2)
+    try:
+        ids = submit_and_wait(manager, 5)
+        assert manager.status(ids[0]) is None
+        assert manager.status(ids[-1])['status'] == COMPLETED
+        assert len(manager._jobs) == 2
+    finally:
+        manager.shutdown()
+
+
+def test_evicted_jobs_are_read_back_from_the_table(tmp_path):
+    manager = JobManager(FakeAnalyzer, workers=1, db_path=str(tmp_path / 'jobs.db'), max_finished=1)
+    try:
+        ids = submit_and_wait(manager, 3)
+        assert ids[0] not in manager._jobs
+        assert manager.status(ids[0])['status'] == COMPLETED
+        assert manager.results(ids[0])['results'] == [{'candidateId': 0, 'score': 50}]
+    finally:
+        manager.shutdown()
+
+
+def test_expired_jobs_are_dropped(tmp_path):
+    manager = JobManager(FakeAnalyzer, workers=1, db_path=str(tmp_path / 'jobs.db'), finished_ttl=0.05)
+    try:
+        first, = submit_and_wait(manager)
+        time.sleep(0.1)
+        submit_and_wait(manager)
+        assert manager.status(first) is None
+    finally:
+        manager.shutdown()
+
+
+def test_payload_is_written_once(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    manager = JobManager(FakeAnalyzer, workers=1, db_path=path)
+    statements = []
+    manager.table._conn.set_trace_callback(statements.append)
+    try:
+        job_id, = submit_and_wait(manager)
+    finally:
+        manager.shutdown()
+
+    writes = [sql for sql in statements if sql.startswith(('INSERT', 'UPDATE'))]
+    assert sum('"resumes"' in sql for sql in writes) == 1
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone() == (None,)
+
+
+def test_max_finished_must_not_be_negative():
+    with pytest.raises(ValueError):
+        JobManager(FakeAnalyzer, workers=1, max_finished=-1)
+
+
+def test_every_process_sees_every_job(tmp_path):
+    # Two managers on one job table stand for two server workers
+    path = str(tmp_path / 'jobs.db')
+    first, second = JobManager(FakeAnalyzer, workers=1, db_path=path), JobManager(FakeAnalyzer, workers=1, db_path=path)
+    try:
+        job_id = first.submit({'resumes': [{'candidateId': 7}], 'job_description': 'x'})['job_id']
+        wait_for(second, job_id, COMPLETED)
+        assert second.results(job_id)['results'] == [{'candidateId': 7, 'score': 50}]
+        assert second.cancel('unknown') is None
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+
+def test_jobs_run_once_across_processes(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    analyzer = BlockingAnalyzer()
+    analyzer.release.set()
+    managers = [JobManager(lambda: analyzer, workers=2, db_path=path) for _ in range(2)]
+    try:
+        ids = [managers[i % 2].submit({'resumes': [{'candidateId': i}], 'job_description': 'x'})['job_id']
+               for i in range(8)]
+        for job_id in ids:
+            wait_for(managers[0], job_id, COMPLETED)
+        assert analyzer.runs == Counter(range(8))
+    finally:
+        for manager in managers:
+            manager.shutdown()
+
+
+def test_a_running_job_is_not_taken_over_while_its_lease_is_renewed(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    analyzer = BlockingAnalyzer()
+    owner = JobManager(lambda: analyzer, workers=1, db_path=path, lease=0.3)
+    try:
+        job_id = owner.submit({'resumes': [{'candidateId': 1}], 'job_description': 'x'})['job_id']
+        assert analyzer.started.wait(10)
+        # A restarted or second worker opens the same table while the job runs
+        other = JobManager(lambda: analyzer, workers=1, db_path=path, lease=0.3)
+        try:
+            time.sleep(1.0)
+            assert other.status(job_id)['status'] == RUNNING
+            analyzer.release.set()
+            wait_for(other, job_id, COMPLETED)
+        finally:
+            other.shutdown()
+        assert analyzer.runs == {1: 1}
+    finally:
+        analyzer.release.set()
+        owner.shutdown()
+
+
+def test_a_job_whose_lease_ran_out_is_run_again(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    table = JobTable(path)
+    job = Job('abandoned', {'resumes': [{'candidateId': 3}], 'job_description': 'x'}, {})
+    table.insert(job)
+    # Claimed by a process that died without renewing its lease
+    assert table.claim('dead', time.time(), 0.05).id == 'abandoned'
+    table.close()
+    time.sleep(0.1)
+
+    manager = JobManager(FakeAnalyzer, workers=1, db_path=path)
+    try:
+        wait_for(manager, 'abandoned', COMPLETED)
+        assert manager.results('abandoned')['results'] == [{'candidateId': 3, 'score': 50}]
+    finally:
+        manager.shutdown()
+
+
+def test_cancel_reaches_a_job_running_in_another_process(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    analyzer = BlockingAnalyzer()
+    owner = JobManager(lambda: analyzer, workers=1, db_path=path, lease=0.3)
+    other = JobManager(FakeAnalyzer, workers=1, db_path=path)
+    try:
+        job_id = owner.submit({'resumes': [{'candidateId': 1}], 'job_description': 'x'})['job_id']
+        assert analyzer.started.wait(10)
+        assert other.cancel(job_id)['status'] == RUNNING
+        wait_for(other, job_id, CANCELLED)
+    finally:
+        analyzer.release.set()
+        owner.shutdown()
+        other.shutdown()
+
+
+def test_jobs_of_an_older_table_are_picked_up(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, data TEXT, "
+                     "options TEXT NOT NULL, done INTEGER NOT NULL, total INTEGER NOT NULL, results TEXT, "
+                     "error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)")
+        conn.execute("INSERT INTO jobs VALUES ('old', 'running', ?, '{}', 0, 1, NULL, NULL, ?, ?, NULL)",
+                     ('{"resumes": [{"candidateId": 5}], "job_description": "x"}', time.time(), time.time()))
+
+    manager = JobManager(FakeAnalyzer, workers=1, db_path=path)
+    try:
+        wait_for(manager, 'old', COMPLETED)
+    finally:
+        manager.shutdown()
@@ -0,0 +1,48 @@
+import multiprocessing
+
+from metrics import MetricsRegistry
+
+
+def registry():
+    metrics = MetricsRegistry()
+    counter = metrics.counter('test_requests_total', "Requests", ['endpoint'])
+    histogram = metrics.histogram('test_seconds', "Durations", buckets=(1, 10))
+    return metrics, counter, histogram
+
+
+def worker(directory, amount):
+    metrics, counter, histogram = registry()
+    metrics.share(directory)
+    counter.inc(amount, endpoint='analyze')
+    histogram.observe(amount)
+    metrics.publish()
+
+
+def test_shared_metrics_sum_every_process(tmp_path):
+    directory = str(tmp_path)
+    context = multiprocessing.get_context('fork')
+    for amount in (2, 5):
+        process = context.Process(target=worker, args=(directory, amount))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+
+    metrics, counter, histogram = registry()
+    metrics.share(directory)
+    counter.inc(1, endpoint='analyze')
+    counter.inc(1, endpoint='stream')
+    rendered = metrics.render().splitlines()
+
+    assert 'test_requests_total{endpoint="analyze"} 8' in rendered
+    assert 'test_requests_total{endpoint="stream"} 1' in rendered
+    assert 'test_seconds_bucket{le="1"} 0' in rendered
+    assert 'test_seconds_bucket{le="10"} 2' in rendered
+    assert 'test_seconds_count 2' in rendered
+    assert 'test_seconds_sum 7' in rendered
+
+
+def test_unshared_metrics_are_per_process(tmp_path):
+    metrics, counter, _ = registry()
+    counter.inc(3, endpoint='analyze')
+    assert 'test_requests_total{endpoint="analyze"} 3' in metrics.render().splitlines()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import os
+import signal
+import time
+
+import pytest
+
+import resume_analyzer
+from resume_analyzer import ResumeAnalyzer
+from synthetic_resumes import generate_pool
+
+
+class FakeRunner:
+    def __init__(self, workers, options=None):
+        self.workers = workers
+        self.stopped = False
+
+    def shutdown(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(resume_analyzer, 'ParallelRunner', FakeRunner)
+    return ResumeAnalyzer()
+
+
+def test_a_pool_in_use_is_never_stopped(analyzer):
+    with analyzer.parallel_runner(2) as two:
+        # Another request asks for a different worker count meanwhile
+        with analyzer.parallel_runner(3) as three:
+            assert not two.stopped
+        assert not two.stopped and not three.stopped
+        with analyzer.parallel_runner(2) as again:
+            assert again is two
+    # The most recently requested pool stays for the next call
+    assert not two.stopped and three.stopped
+
+    analyzer.close()
+    assert two.stopped
+
+
+def test_an_idle_pool_of_another_count_is_replaced(analyzer):
+    with analyzer.parallel_runner(2) as two:
+        pass
+    with analyzer.parallel_runner(4) as four:
+        assert two.stopped
+    assert not four.stopped
+
+
+def test_close_while_in_use(analyzer):
+    with analyzer.parallel_runner(2) as two:
+        analyzer.close()
+        assert two.stopped
+        with analyzer.parallel_runner(2) as fresh:
+            assert fresh is not two
+    assert not fresh.stopped
+
+
+def test_a_pool_whose_worker_died_is_replaced():
+    analyzer = ResumeAnalyzer()
+    pool = generate_pool(40, 5)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = analyzer.analyze_candidates(pool)
+            assert analyzer.analyze_candidates(pool, workers=2) == expected
+            broken = analyzer._runners[2]
+            # Stands for an OOM kill of one pool process
+            os.kill(next(iter(broken.executor._processes)), signal.SIGKILL)
+            time.sleep(0.5)
+
+            for _ in range(2):
+                assert analyzer.analyze_candidates(pool, workers=2) == expected
+        assert analyzer._runners[2] is not broken
+    finally:
+        analyzer.close()
@@ -0,0 +1,77 @@
+import contextlib
+import copy
+import io
+
+import pytest
+
+from resume_analyzer import ResumeAnalyzer
+from skill_scorer import SkillScorer
+from synthetic_resumes import generate_pool
+
+JOB_DESCRIPTION = "Senior Full Stack Developer with React, Node.js and AWS. 4+ years of experience."
+
+
+def quietly(call, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call(*args, **kwargs)
+
+
+@pytest.fixture(scope='module')
+def pool():
+    return generate_pool(80, 6, JOB_DESCRIPTION)
+
+
+@pytest.fixture(scope='module')
+def vocabulary(pool, tmp_path_factory):
+    analyzer = ResumeAnalyzer()
+    corpus = [analyzer.preprocess_text(candidate['skills']) for candidate in pool['resumes']]
+    path = str(tmp_path_factory.mktemp('vocabulary') / 'vocabulary.joblib')
+    SkillScorer().fit(corpus + [analyzer.preprocess_text(JOB_DESCRIPTION)]).save(path)
+    return path
+
+
+@pytest.fixture
+def analyzers(vocabulary):
+    cached = ResumeAnalyzer(skill_vocabulary_path=vocabulary, result_cache_size=1000)
+    uncached = ResumeAnalyzer(skill_vocabulary_path=vocabulary)
+    yield cached, uncached
+    cached.close()
+    uncached.close()
+
+
+def cached_reasoning(analyzer):
+    # Entries are (stored at, (scores, reasoning))
+    return [reasoning for _, (_, reasoning) in analyzer.result_cache._entries.values()]
+
+
+def test_cache_needs_a_standing_vocabulary():
+    assert ResumeAnalyzer(result_cache_size=1000).result_cache is None
+
+
+def test_top_k_miss_reasons_only_the_shortlist(analyzers, pool):
+    cached, uncached = analyzers
+
+    shortlist = quietly(cached.analyze_candidates, pool, top_k=5)
+    assert shortlist == quietly(uncached.analyze_candidates, pool, top_k=5)
+    reasoning = cached_reasoning(cached)
+    assert len(reasoning) == len(pool['resumes'])
+    assert len([text for text in reasoning if text is not None]) == 5
+
+    # Cached scores build the rest of the reasoning on demand
+    full = quietly(cached.analyze_candidates, pool)
+    assert full == quietly(uncached.analyze_candidates, pool)
+    assert full[:5] == shortlist
+    assert None not in cached_reasoning(cached)
+
+
+def test_changing_one_resume_keeps_the_others_cached(analyzers, pool):
+    cached, uncached = analyzers
+    quietly(cached.analyze_candidates, pool)
+
+    changed = copy.deepcopy(pool)
+    changed['resumes'][0]['skills'] = 'Rust, Kubernetes, Go'
+    hits = cached.result_cache.hits
+    results = quietly(cached.analyze_candidates, changed)
+
+    assert cached.result_cache.hits - hits == len(pool['resumes']) - 1
+    assert results == quietly(uncached.analyze_candidates, changed)
@@ -0,0 +1,54 @@
+import contextlib
+import io
+
+import pytest
+
+from resume_analyzer import ResumeAnalyzer
+from synthetic_resumes import generate_pool
+
+JOB_DESCRIPTIONS = [
+    "Senior Full Stack Developer with React, Node.js and AWS. 4+ years of experience.",
+    "Data Engineer: Python, SQL, Spark and Airflow, 3+ years of experience.",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    analyzer = ResumeAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = generate_pool(120, 2, JOB_DESCRIPTIONS[0])
+    # Scored, but their reasoning fails and they fall back to the default score
+    for i in (3, 40, 77):
+        pool['resumes'][i]['skills'] = None
+    return pool
+
+
+def quietly(call, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call(*args, **kwargs)
+
+
+@pytest.mark.parametrize('top_k', [1, 5, 30, 100, 200])
+def test_top_k_is_the_head_of_the_full_ranking(analyzer, pool, top_k):
+    full = quietly(analyzer.analyze_candidates, pool)
+    shortlist = quietly(analyzer.analyze_candidates, pool, top_k=top_k)
+
+    assert shortlist == full[:top_k]
+
+
+@pytest.mark.parametrize('top_k', [1, 5, 30])
+def test_matrix_shortlists_follow_the_score_matrix(analyzer, pool, top_k):
+    data = {'resumes': pool['resumes'], 'job_descriptions': JOB_DESCRIPTIONS}
+    matrix = quietly(analyzer.analyze_matrix, data, top_k=top_k, best_fit=1)
+
+    for j, shortlist in enumerate(matrix['shortlists']):
+        column = [(-row[j], i) for i, row in enumerate(matrix['scores'])]
+        expected = [(pool['resumes'][i]['candidateId'], -score) for score, i in sorted(column)[:top_k]]
+        assert [(result['candidateId'], result['score']) for result in shortlist['results']] == expected
+    for i, best in enumerate(matrix['best_fit']):
+        assert best['requisitions'][0]['score'] == max(matrix['scores'][i])
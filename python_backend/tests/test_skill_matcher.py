@@ -0,0 +1,76 @@
+import pytest
+
+from skill_matcher import SkillAliases
+
+
+@pytest.fixture(scope='module')
+def aliases():
+    return SkillAliases()
+
+
+@pytest.mark.parametrize('skill, canonical', [
+    ('JS', 'javascript'),
+    ('JavaScript', 'javascript'),
+    (' K8s ', 'kubernetes'),
+    ('React-Native', 'react native'),
+    ('reactjs', 'react'),
+    # Unknown skills are only normalized
+    ('Elixir  Phoenix', 'elixir phoenix'),
+])
+def test_canonical_names(aliases, skill, canonical):
+    assert aliases.canonical(skill) == canonical
+
+
+def test_custom_table(aliases):
+    custom = SkillAliases({'Go': ['golang']})
+
+    assert custom.canonical('Golang') == 'go'
+    assert custom.find('Go and Python services') == ['go']
+    assert custom.version != aliases.version
+
+
+def test_find_prefers_the_longest_spelling(aliases):
+    found = aliases.find("Built React Native apps, a React dashboard and deployed them on K8s")
+
+    assert found == ['react native', 'react', 'kubernetes']
+    assert aliases.find("React Native developer") == ['react native']
+
+
+def test_find_keeps_names_whole(aliases):
+    # "js" inside "node.js" is not JavaScript
+    assert aliases.find("Node.js and C++") == ['node.js', 'c++']
+
+
+def test_alias_matches_canonical_job_term(aliases):
+    matcher = aliases.compile(['javascript', 'developer'], "JavaScript developer")
+
+    assert matcher.matching_skills("JS, Python") == ['js']
+
+
+def test_canonical_matches_alias_job_term(aliases):
+    matcher = aliases.compile(['js', 'developer'], "JS developer")
+
+    assert matcher.job_skills == ['javascript']
+    assert matcher.matching_skills("JavaScript, Go") == ['javascript']
+
+
+def test_matching_skills_limit(aliases):
+    matcher = aliases.compile(['react', 'kubernetes', 'aws'], "React, Kubernetes and AWS")
+
+    assert matcher.matching_skills("AWS, k8s, React, Java", limit=2) == ['aws', 'k8s']
+
+
+def test_overlap(aliases):
+    matcher = aliases.compile(['react', 'kubernetes', 'postgresql'], "React, Kubernetes and PostgreSQL")
+
+    assert matcher.overlap("ReactJS, k8s, MySQL") == pytest.approx(2 / 3)
+    assert matcher.overlap("Postgres, React, Kubernetes, Docker") == 1
+    # A different skill that merely contains the name does not count
+    assert matcher.overlap("React Native") == 0
+
+
+def test_overlap_without_known_job_skills(aliases):
+    matcher = aliases.compile(['communication'], "Strong communication")
+
+    assert matcher.job_skills == []
+    assert matcher.overlap("Communication, React") == 0